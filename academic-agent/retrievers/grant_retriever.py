@@ -1,7 +1,7 @@
 # grant_retriever.py
 
 from typing import List, Tuple
-from sentence_transformers import SentenceTransformer
+from academic_common.embedding_service import encode
 import faiss
 import numpy as np
 
@@ -12,8 +12,6 @@ class GrantRetriever:
     """
 
     def __init__(self):
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-
         # Example knowledge base of grant docs
         self.knowledge_base = [
             "Grant A: Funding for AI-driven healthcare diagnostic tools, with focus on imaging and predictive analytics.",
@@ -25,7 +23,7 @@ class GrantRetriever:
             "Grant G: European Research Council funding for AI-based climate risk models and data-driven policy."
         ]
 
-        self.embeddings = self.model.encode(self.knowledge_base, convert_to_numpy=True)
+        self.embeddings = encode(self.knowledge_base)
         self.dimension = self.embeddings.shape[1]
 
         # Create FAISS index
@@ -37,7 +35,7 @@ class GrantRetriever:
         """
         Retrieve top-k similar docs.
         """
-        query_emb = self.model.encode([query], convert_to_numpy=True)
+        query_emb = encode([query])
         D, I = self.index.search(query_emb, k=3)
 
         results = []
@@ -1,15 +1,10 @@
 
-from sentence_transformers import SentenceTransformer
+from academic_common import embedding_service
 
-_model = None
+MODEL_NAME = "all-MiniLM-L6-v2"
 
-def get_embedder(model_name="all-MiniLM-L6-v2"):
-    global _model
-    if _model is None:
-        _model = SentenceTransformer(model_name)
-    return _model
+def get_embedder(model_name=MODEL_NAME):
+    return embedding_service.get_model(model_name)
 
 def encode(texts):
-    model = get_embedder()
-    return model.encode(texts, normalize_embeddings=True)
-
+    return embedding_service.encode(texts, model_name=MODEL_NAME, normalize=True)
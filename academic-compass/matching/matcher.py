@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process
+from .normalize import normalize_name, normalize_names
+from .vector_index import OrgVectorIndex
+
+RERANK_CHUNK = 16  # queries per cdist call; cdist scores each chunk against its candidate union
+
+class OrgMatcher:
+    def __init__(self, csv_path="data/org_names.csv", cache_dir="data/index_cache"):
+        df = pd.read_csv(csv_path, usecols=["variant", "canonical"])
+        df["norm"] = normalize_names(df["variant"].astype(str).tolist())
+        # last variant wins, as with the old row-by-row dict assignment
+        df = df.drop_duplicates("norm", keep="last")
+        self.canon_map = dict(zip(df["norm"], df["canonical"]))
+        self.index = OrgVectorIndex(cache_dir=cache_dir)
+        self.index.build(df["norm"].tolist())
+
+    def match(self, user_input):
+        row = self.match_many([user_input]).iloc[0]
+        return {
+            "input": user_input,
+            "normalized": row["normalized"],
+            "match": row["match"],
+            "canonical": row["canonical"]
+        }
+
+    def match_many(self, names, top_k=10) -> pd.DataFrame:
+        """
+        Match a list of names in one go: one batched encode + FAISS search for top_k candidates,
+        then token_sort_ratio rerank via rapidfuzz.process.cdist. One row per input, in order.
+        """
+        norms = normalize_names([str(n) for n in names])
+        # encode and rerank each distinct normalized name once, then copy rows back
+        uniq, inv = np.unique(np.asarray(norms, dtype=object), return_inverse=True)
+        D, I = self.index.search_many(uniq.tolist(), top_k=top_k)
+        fuzzy = self._fuzzy_scores(uniq, I)
+        D, I, fuzzy = D[inv], I[inv], fuzzy[inv]
+        best = np.argmax(fuzzy, axis=1)  # first max = embedding order among ties, like the stable sort
+        rows = np.arange(len(norms))
+        best_i = I[rows, best]
+        found = best_i >= 0
+        names_arr = np.asarray(self.index.names, dtype=object)
+        match = np.where(found, names_arr[np.where(found, best_i, 0)], None)
+        return pd.DataFrame({
+            "input": list(names),
+            "normalized": norms,
+            "match": match,
+            "canonical": [self.canon_map.get(m, m) for m in match],
+            "fuzzy_score": np.where(found, fuzzy[rows, best], np.nan),
+            "embed_score": np.where(found, D[rows, best], np.nan),
+        })
+
+    def _fuzzy_scores(self, norms, I) -> np.ndarray:
+        """token_sort_ratio of each query against its own candidates; -1 where FAISS had none."""
+        names = np.asarray(self.index.names, dtype=object)
+        safe = np.where(I >= 0, I, 0)
+        if hasattr(process, "cpdist"):  # rapidfuzz >= 3.6 scores exactly the (query, candidate) pairs
+            queries = np.repeat(np.asarray(norms, dtype=object), I.shape[1])
+            scores = process.cpdist(queries, names[safe.ravel()], scorer=fuzz.token_sort_ratio,
+                                    dtype=np.float32, workers=-1).reshape(I.shape)
+        else:
+            scores = np.empty(I.shape, dtype=np.float32)
+            for start in range(0, len(norms), RERANK_CHUNK):
+                block = safe[start:start + RERANK_CHUNK]
+                cand, inv = np.unique(block, return_inverse=True)
+                S = process.cdist(norms[start:start + RERANK_CHUNK], names[cand], scorer=fuzz.token_sort_ratio,
+                                  dtype=np.float32, workers=-1)
+                scores[start:start + RERANK_CHUNK] = np.take_along_axis(S, inv.reshape(block.shape), axis=1)
+        return np.where(I >= 0, scores, -1.0)
@@ -1,44 +1,67 @@
-import re
+import unicodedata
 from typing import List, Optional
 
-class NameNormalizer:
-    def __init__(self, stopwords: Optional[List[str]] = None):
-        self.synonym_map = {
-            "univ": "university",
-            "inst": "institute",
-            "dept": "department",
-            "tech": "technology",
-            "sci": "science",
-            "natl": "national",
-            "ctr": "center",
-            "lab": "laboratory",
-        }
+from academic_common.text import TextNormalizer, nfkd_ascii  # re-exported
 
-        self.stopwords = set(stopwords or [])
+_MOJIBAKE_CODECS = ("mac_roman", "cp1252", "latin-1")
 
-        # Precompile regex
-        self.special_char_pattern = re.compile(r"[^a-z0-9\s]")  # keep alphanumeric and spaces
-        self.multiple_spaces_pattern = re.compile(r"\s+")
+def _suspect(text: str) -> int:
+    """Characters a correct repair should not introduce: combining marks and C1 / other controls."""
+    return sum(1 for c in text if unicodedata.combining(c) or (unicodedata.category(c) == "Cc" and c not in "\t\n\r"))
 
-    def normalize(self, text: str) -> str:
-        # 1. Lowercase
-        text = text.lower()
+def _non_latin1(text: str) -> int:
+    return sum(1 for c in text if ord(c) > 0xFF)
 
-        # 2. Remove special characters
-        text = self.special_char_pattern.sub(" ", text)
+def repair_mojibake(text: str, max_rounds: int = 3) -> str:
+    """
+    Undo UTF-8 text that was decoded with a single-byte codec, possibly more than once
+    ("AKG\u221a\u00faL" -> "AKG\u00dcL", "Fran\u00c3\u00a7ois" -> "Fran\u00e7ois"). Each round tries every codec;
+    a candidate must survive re-encoding plus strict UTF-8 decoding, shorten the string and not add
+    combining marks or control characters, so correctly decoded accents are left alone. Among the
+    survivors the one with the fewest non-Latin-1 characters wins (ties: codec order).
+    """
+    if text.isascii():
+        return text
+    for _ in range(max_rounds):
+        suspect = _suspect(text)
+        best, best_score = None, None
+        for codec in _MOJIBAKE_CODECS:
+            try:
+                fixed = text.encode(codec).decode("utf-8")
+            except UnicodeError:
+                continue
+            if len(fixed) >= len(text) or _suspect(fixed) > suspect:
+                continue
+            score = (_non_latin1(fixed), len(fixed))
+            if best_score is None or score < best_score:
+                best, best_score = fixed, score
+        if best is None:
+            break
+        text = best
+    return text
 
-        # 3. Replace multiple spaces with one
-        text = self.multiple_spaces_pattern.sub(" ", text).strip()
+SYNONYMS = {
+    "univ": "university",
+    "inst": "institute",
+    "dept": "department",
+    "tech": "technology",
+    "sci": "science",
+    "natl": "national",
+    "ctr": "center",
+    "lab": "laboratory",
+}
 
-        # 4. Tokenize
-        tokens = text.split()
+class NameNormalizer(TextNormalizer):
+    """Organization-name preset: abbreviation synonyms plus optional stopword removal."""
+    def __init__(self, stopwords: Optional[List[str]] = None):
+        super().__init__(synonyms=SYNONYMS, noise=stopwords or ())
+        self.synonym_map = self.synonyms
+        self.stopwords = self.noise
 
-        # 5. Replace synonyms
-        tokens = [self.synonym_map.get(token, token) for token in tokens]
+_DEFAULT = NameNormalizer()
 
-        # 6. Remove stopwords if enabled
-        if self.stopwords:
-            tokens = [t for t in tokens if t not in self.stopwords]
+def normalize_name(text: str) -> str:
+    return _DEFAULT.normalize(text)
 
-        # 7. Return normalized string
-        return " ".join(tokens)
\ No newline at end of file
+def normalize_names(texts: List[str]) -> List[str]:
+    return _DEFAULT.normalize_batch(texts)
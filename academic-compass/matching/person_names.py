@@ -0,0 +1,220 @@
+import re
+from collections import defaultdict
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import process
+from rapidfuzz.distance import JaroWinkler
+
+from .normalize import TextNormalizer, repair_mojibake
+
+_FOLD = TextNormalizer(cache_size=1 << 18)  # lowercase + NFKD/ASCII fold + punctuation to spaces
+_GIVEN_SPLIT = re.compile(r"[\s.\-]+")
+_VOWELS = set("aeiouy")
+# spelling variants that should land in the same surname block (Müller / Mueller / Muller)
+_TRANSLIT = (("ae", "a"), ("oe", "o"), ("ue", "u"))
+MAX_INITIALS = 6
+SURNAME_WEIGHT = 0.4
+KEY_CUTOFF = 0.9  # Jaro-Winkler between surname keys when the exact block does not exist
+PARALLEL_CELLS = 200_000  # score matrices smaller than this run single-threaded (thread start-up dominates)
+
+class PersonName(NamedTuple):
+    raw: str         # input after mojibake repair
+    surname: str     # folded, e.g. "alvarez brito"
+    given: Tuple[str, ...]  # folded full given names, e.g. ("jose", "antonio")
+    initials: str    # one letter per given token, names and bare initials alike, in order
+    key: str         # surname block key
+
+def surname_key(surname: str) -> str:
+    key = surname.replace(" ", "")
+    for a, b in _TRANSLIT:
+        key = key.replace(a, b)
+    return key
+
+def _is_initials(token: str, folded: str) -> bool:
+    if len(folded) == 1:
+        return True
+    # "FV", "AG", "HJK" are initials; "BING", "ESRA" are names
+    return token.isupper() and (len(folded) == 2 or (len(folded) == 3 and not _VOWELS & set(folded)))
+
+def _is_bare_initials(token: str) -> bool:
+    """"F", "F.", "J.A.", "J.-P.": single letters only, unlike a short all-caps surname such as "LI"."""
+    parts = [p for p in _GIVEN_SPLIT.split(token) if p]
+    return bool(parts) and all(len(p) == 1 and p.isalpha() for p in parts)
+
+def parse_person_name(raw: str) -> PersonName:
+    """
+    Parse "Surname, Given Names", "Surname F" / "Surname J.A.", "SURNAME Given" or "Given Surname"
+    into surname / given names / initials.
+    """
+    text = repair_mojibake(str(raw)).strip()
+    if "," in text:
+        surname, _, given = text.partition(",")
+    else:
+        toks = text.split()
+        caps = [t for t in toks if t.isalpha() and t.isupper() and len(t) > 1]
+        n = len(toks)
+        while n > 1 and _is_bare_initials(toks[n - 1]):
+            n -= 1
+        if len(toks) <= 1:
+            surname, given = text, ""
+        elif n < len(toks):  # "Wang F", "Smith J. A."
+            surname, given = " ".join(toks[:n]), " ".join(toks[n:])
+        elif caps and len(caps) < len(toks):  # "WANG Futang"
+            surname, given = " ".join(caps), " ".join(t for t in toks if t not in caps)
+        else:
+            surname, given = toks[-1], " ".join(toks[:-1])
+    names, initials = [], []
+    for tok in _GIVEN_SPLIT.split(given.strip()):
+        folded = _FOLD(tok).replace(" ", "")
+        if not folded:
+            continue
+        if _is_initials(tok, folded):
+            initials.extend(folded)
+        else:
+            names.append(folded)
+            initials.append(folded[0])
+    folded_surname = _FOLD(surname)
+    return PersonName(text, folded_surname, tuple(names), "".join(initials)[:MAX_INITIALS],
+                      surname_key(folded_surname) or surname.strip().lower())  # non-Latin: block on the raw surname
+
+def _initials_matrix(initials: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    arr = np.zeros((len(initials), MAX_INITIALS), dtype=np.uint8)
+    for i, s in enumerate(initials):
+        arr[i, :len(s)] = np.frombuffer(s.encode("ascii", "ignore")[:MAX_INITIALS], dtype=np.uint8)
+    return arr, np.array([len(s) for s in initials])
+
+class PersonNameIndex:
+    """
+    Person-name matcher. Names are blocked by surname key and first initial; inside a block
+    candidates are scored with Jaro-Winkler on surname and given names plus initial
+    compatibility ("J. A." fits "Jose Antonio" and "J." but not "J. M."). `encode`, if given,
+    is only used to order candidates whose scores tie exactly.
+    """
+    def __init__(self, names: Sequence[str], encode: Optional[Callable[[List[str]], np.ndarray]] = None):
+        self.parsed = [parse_person_name(n) for n in names]
+        self.names = [p.raw for p in self.parsed]
+        self.encode = encode
+        self._surname = np.array([p.surname for p in self.parsed], dtype=object)
+        self._given = np.array([" ".join(p.given) for p in self.parsed], dtype=object)
+        self._initials, self._n_init = _initials_matrix([p.initials for p in self.parsed])
+        by_key: Dict[str, List[int]] = defaultdict(list)
+        by_initial: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        for i, p in enumerate(self.parsed):
+            by_key[p.key].append(i)
+            by_initial[(p.key, p.initials[:1])].append(i)
+        self._by_key = {k: np.array(v) for k, v in by_key.items()}
+        self._by_initial = {k: np.array(v) for k, v in by_initial.items()}
+        self._keys = list(self._by_key)
+
+    def blocks(self) -> pd.Series:
+        """Surname block sizes, largest first."""
+        return pd.Series({k: len(v) for k, v in self._by_key.items()}).sort_values(ascending=False)
+
+    def _surname_keys(self, key: str) -> Tuple[str, ...]:
+        if key in self._by_key:
+            return (key,)
+        near = process.extract(key, self._keys, scorer=JaroWinkler.normalized_similarity,
+                               limit=3, score_cutoff=KEY_CUTOFF)
+        return tuple(k for k, _, _ in near)
+
+    def _candidates(self, keys: Tuple[str, ...], first: str) -> np.ndarray:
+        if not first:
+            parts = [self._by_key[k] for k in keys]
+        else:  # same first initial, plus surname-only entries that fit any given name
+            parts = [self._by_initial.get((k, f), np.empty(0, dtype=int)) for k in keys for f in (first, "")]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=int)
+
+    def _score(self, qs: List[PersonName], cand: np.ndarray) -> np.ndarray:
+        workers = -1 if len(qs) * len(cand) >= PARALLEL_CELLS else 1
+        q_sur = [q.surname for q in qs]
+        s_sim = process.cdist(q_sur, self._surname[cand], scorer=JaroWinkler.normalized_similarity,
+                              dtype=np.float32, workers=workers)
+        q_given = [" ".join(q.given) for q in qs]
+        g_sim = process.cdist(q_given, self._given[cand], scorer=JaroWinkler.normalized_similarity,
+                              dtype=np.float32, workers=workers)
+        qi, qn = _initials_matrix([q.initials for q in qs])
+        ci, cn = self._initials[cand], self._n_init[cand]
+        overlap = np.minimum(qn[:, None], cn[None, :])
+        pos = np.arange(MAX_INITIALS)
+        agree = (qi[:, None, :] == ci[None, :, :]) | (pos[None, None, :] >= overlap[:, :, None])
+        compatible = agree.all(axis=2)  # one initials string is a prefix of the other
+        same = compatible & (qn[:, None] == cn[None, :])
+        both_full = (np.array([bool(g) for g in q_given])[:, None]) & (self._given[cand] != "")[None, :]
+        g = np.where(both_full, g_sim, np.where(same, 0.95, 0.85))
+        g = np.where(compatible, g, 0.5 * g_sim * both_full)
+        g = np.where((qn == 0)[:, None], 0.5, g)
+        return SURNAME_WEIGHT * s_sim + (1 - SURNAME_WEIGHT) * g
+
+    def score(self, query: str, ids: Sequence[int]) -> np.ndarray:
+        """Scores of one query against specific index entries (e.g. to check a known candidate)."""
+        return self._score([parse_person_name(query)], np.asarray(ids, dtype=int))[0]
+
+    def _break_ties(self, query: str, ids: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        tied = np.flatnonzero(scores == scores[0])
+        if self.encode is None or len(tied) < 2:
+            return ids
+        vecs = self.encode([query] + [self.names[i] for i in ids[tied]])
+        order = np.argsort(-(vecs[1:] @ vecs[0]), kind="stable")
+        ids = ids.copy()
+        ids[tied] = ids[tied][order]
+        return ids
+
+    def match_many(self, queries: Sequence[str], top_k: int = 5, chunk: int = 2048) -> pd.DataFrame:
+        """
+        Top-k candidates per query, one row each: query_idx, query, rank, match, index, score.
+        Repeated queries are scored once and their rows copied.
+        """
+        queries = [str(q) for q in queries]
+        uniq = list(dict.fromkeys(queries))
+        parsed = [parse_person_name(q) for q in uniq]
+        groups: Dict[Tuple[Tuple[str, ...], str], List[int]] = defaultdict(list)
+        for qi, p in enumerate(parsed):
+            groups[(self._surname_keys(p.key), p.initials[:1])].append(qi)
+        parts = []
+        for (keys, first), members in groups.items():
+            cand = self._candidates(keys, first)
+            if not len(cand):
+                continue
+            k = min(top_k, len(cand))
+            for start in range(0, len(members), chunk):
+                rows = np.array(members[start:start + chunk])
+                S = self._score([parsed[r] for r in rows], cand)
+                top = np.argsort(-S, axis=1, kind="stable")[:, :k]
+                scores = np.take_along_axis(S, top, axis=1)
+                ids = cand[top]
+                if self.encode is not None:
+                    for j, r in enumerate(rows):
+                        ids[j] = self._break_ties(parsed[r].raw, ids[j], scores[j])
+                parts.append((np.repeat(rows, k), np.tile(np.arange(1, k + 1), len(rows)), ids.ravel(), scores.ravel()))
+        if not parts:
+            parts = [(np.empty(0, dtype=int),) * 3 + (np.empty(0, dtype=np.float32),)]
+        u_idx, rank, ids, scores = (np.concatenate(c) for c in zip(*parts))
+        if len(uniq) < len(queries):
+            order = np.lexsort((rank, u_idx))
+            u_idx, rank, ids, scores = u_idx[order], rank[order], ids[order], scores[order]
+            uid = {q: i for i, q in enumerate(uniq)}
+            inv = np.array([uid[q] for q in queries], dtype=int)
+            counts = np.bincount(u_idx, minlength=len(uniq))
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            lengths = counts[inv]
+            offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            rows = np.repeat(starts[inv], lengths) + offsets
+            q_idx = np.repeat(np.arange(len(queries)), lengths)
+            rank, ids, scores = rank[rows], ids[rows], scores[rows]
+        else:
+            q_idx = u_idx
+        df = pd.DataFrame({
+            "query_idx": q_idx,
+            "query": np.asarray(queries, dtype=object)[q_idx],
+            "rank": rank,
+            "match": np.asarray(self.names, dtype=object)[ids],
+            "index": ids,
+            "score": scores,
+        })
+        return df.sort_values(["query_idx", "rank"], kind="stable").reset_index(drop=True)
+
+    def match(self, query: str, top_k: int = 5) -> List[Tuple[str, float]]:
+        df = self.match_many([query], top_k=top_k)
+        return list(zip(df["match"], df["score"].astype(float)))
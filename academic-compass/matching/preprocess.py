@@ -0,0 +1,104 @@
+"""
+Streaming cleanup of the one-name-per-line files in data/source_data.
+
+    python -m matching.preprocess data/source_data/authors.txt data/source_data/organizations.txt --out data/preprocessed
+
+Every line is repaired (mojibake, Unicode NFC, whitespace) and grouped by a normalization key;
+blank lines are dropped. For each input <stem>.txt this writes
+  <out>/<stem>.unique.tsv   uid, text (most frequent spelling), key, count (lines), variants (distinct spellings)
+  <out>/<stem>.map.npy      int32 uid for every original line, -1 for blank lines
+so index builds and matchers work on the unique set and results are broadcast back with expand().
+"""
+import argparse
+import csv
+import unicodedata
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .normalize import TextNormalizer, normalize_name, repair_mojibake
+
+_FOLD = TextNormalizer(cache_size=1 << 18)
+
+def clean_line(text: str) -> str:
+    """Mojibake repair, NFC, collapsed whitespace."""
+    return " ".join(unicodedata.normalize("NFC", repair_mojibake(text)).split())
+
+# how aggressively lines are considered duplicates
+KEYS: Dict[str, Callable[[str], str]] = {
+    "exact": lambda s: s,   # identical after clean_line
+    "fold": _FOLD,          # + case, accents and punctuation ("AKGÜL, ESRA" == "Akgul Esra")
+    "org": normalize_name,  # + organization abbreviations ("Univ" == "University")
+}
+
+def dedupe_lines(lines: Iterable[str], key: str = "fold") -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Group lines by KEYS[key] in one pass. Returns the unique table (in first-seen order) and
+    the int32 line -> uid mapping. Memory is O(unique spellings) plus 4 bytes per line.
+    """
+    key_fn = KEYS[key]
+    uid_of: Dict[str, int] = {}
+    variants: List[Counter] = []
+    mapping = array("i")
+    for line in lines:
+        text = clean_line(line)
+        k = key_fn(text) if text else ""
+        if not k:
+            mapping.append(-1)
+            continue
+        uid = uid_of.setdefault(k, len(uid_of))
+        if uid == len(variants):
+            variants.append(Counter())
+        variants[uid][text] += 1
+        mapping.append(uid)
+    unique = pd.DataFrame({
+        "uid": np.arange(len(variants)),
+        "text": [v.most_common(1)[0][0] for v in variants],  # ties keep the first spelling seen
+        "key": list(uid_of),
+        "count": [sum(v.values()) for v in variants],
+        "variants": [len(v) for v in variants],
+    })
+    return unique, np.frombuffer(mapping, dtype=np.int32).copy()
+
+def preprocess_file(path, out_dir="data/preprocessed", key: str = "fold") -> pd.DataFrame:
+    path, out_dir = Path(path), Path(out_dir)
+    with open(path, encoding="utf-8", errors="replace") as f:
+        unique, mapping = dedupe_lines(f, key=key)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    unique.to_csv(out_dir / f"{path.stem}.unique.tsv", sep="\t", index=False, quoting=csv.QUOTE_MINIMAL)
+    with open(out_dir / f"{path.stem}.map.npy", "wb") as f:
+        np.save(f, mapping)
+    return unique
+
+def load_unique(out_dir, stem: str) -> Tuple[List[str], np.ndarray]:
+    """Unique texts (index = uid) and the line -> uid mapping written by preprocess_file."""
+    out_dir = Path(out_dir)
+    unique = pd.read_csv(out_dir / f"{stem}.unique.tsv", sep="\t", keep_default_na=False,
+                         dtype={"text": str, "key": str})
+    return unique["text"].tolist(), np.load(out_dir / f"{stem}.map.npy")
+
+def expand(values, mapping: np.ndarray, fill=None) -> np.ndarray:
+    """Broadcast per-uid values back to the original lines; blank lines get `fill`."""
+    out = np.full(len(mapping), fill, dtype=object)
+    hit = mapping >= 0
+    out[hit] = np.asarray(values, dtype=object)[mapping[hit]]
+    return out
+
+def main():
+    ap = argparse.ArgumentParser(description="Repair, normalize and deduplicate source_data name files")
+    ap.add_argument("paths", nargs="+")
+    ap.add_argument("--out", default="data/preprocessed")
+    ap.add_argument("--key", choices=sorted(KEYS), default="fold")
+    args = ap.parse_args()
+    for p in args.paths:
+        unique = preprocess_file(p, args.out, key=args.key)
+        lines = int(unique["count"].sum())
+        print(f"{p}: {lines} names -> {len(unique)} unique "
+              f"({lines - len(unique)} duplicates, {int((unique['variants'] > 1).sum())} with spelling variants)")
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,95 @@
+import hashlib
+import json
+import os
+from pathlib import Path
 import faiss
 import numpy as np
 import pandas as pd
+from academic_common.embedding_service import VectorStore, text_key
+from . import embed
 from .embed import encode
 
+def _digest(*parts) -> str:
+    h = hashlib.sha1()
+    for p in parts:
+        h.update(p.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+def _atomic(path: Path, write):
+    tmp = path.with_name(path.name + ".tmp")
+    write(str(tmp))
+    os.replace(tmp, path)
+
 class OrgVectorIndex:
-    def __init__(self):
+    """
+    FAISS index over organization names. With a cache_dir, builds are content-addressed:
+      <cache_dir>/<model>/index-<hash(model, names)>.faiss + .json   the latest index and its name list
+      <cache_dir>/<model>/vectors/                                  append-only store of every name embedded so far
+    so an unchanged name list loads from disk and a changed one only encodes (and appends) the new names.
+    """
+    def __init__(self, cache_dir="data/index_cache"):
         self.names = []
         self.index = None
+        self.model_name = embed.MODEL_NAME
+        self.cache_dir = Path(cache_dir) / self.model_name.replace("/", "__") if cache_dir else None
+        self.encoded = 0  # names actually sent to the model by the last build
 
     def build(self, name_list):
-        self.names = name_list
-        embeddings = encode(name_list)
+        self.names = list(name_list)
+        self.encoded = 0
+        if self.cache_dir is None:
+            embeddings = self._encode(self.names)
+            self.index = faiss.IndexFlatIP(embeddings.shape[1])
+            self.index.add(embeddings)
+            return
+        key = _digest(self.model_name, *self.names)
+        path = self.cache_dir / f"index-{key}.faiss"
+        if path.exists():
+            self.load(path)
+            return
+        embeddings = self._cached_embeddings(self.names)
         self.index = faiss.IndexFlatIP(embeddings.shape[1])
-        self.index.add(embeddings.astype('float32'))
+        self.index.add(embeddings)
+        self.save(path)
+        for old in self.cache_dir.glob("index-*"):  # indexes of earlier name lists
+            if old.stem != path.stem:
+                old.unlink(missing_ok=True)
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic(path.with_suffix(".json"), lambda p: Path(p).write_text(json.dumps(self.names)))
+        _atomic(path, lambda p: faiss.write_index(self.index, p))
+
+    def load(self, path):
+        path = Path(path)
+        self.names = json.loads(path.with_suffix(".json").read_text())
+        self.index = faiss.read_index(str(path))
+        return self
+
+    def _encode(self, texts) -> np.ndarray:
+        self.encoded += len(texts)
+        return np.ascontiguousarray(encode(list(texts)), dtype="float32")
+
+    def _cached_embeddings(self, names) -> np.ndarray:
+        """Vectors for names, encoding only those not yet in the on-disk vector store; new rows are appended."""
+        store = VectorStore(self.cache_dir / "vectors")
+        keys = [text_key(n) for n in names]
+        rows = store.lookup(keys)
+        miss = np.flatnonzero(rows < 0)
+        if len(miss):
+            new = list(dict.fromkeys(names[i] for i in miss))
+            store.append([text_key(n) for n in new], self._encode(new))
+            rows = store.lookup(keys)
+        return np.ascontiguousarray(store.read(rows), dtype="float32")
 
     def search(self, query: str, top_k=5):
         query_vec = encode([query])
         D, I = self.index.search(query_vec.astype('float32'), top_k)
         return [(self.names[i], float(D[0][j])) for j, i in enumerate(I[0])]
 
+    def search_many(self, queries, top_k=5):
+        """One batched encode + one index.search; returns (scores, ids) arrays, ids -1 padded."""
+        query_vecs = encode(list(queries))
+        return self.index.search(np.ascontiguousarray(query_vecs, dtype='float32'), top_k)
@@ -0,0 +1,70 @@
+"""
+Person-name matcher benchmark over data/source_data/authors.txt, with wang.txt (one huge
+surname block) as the collision stress test.
+
+    python -m scripts.bench_person_names --authors data/source_data/authors.txt --wang data/source_data/wang.txt
+
+For every name we also build a degraded query ("Surname, G. A." with accents stripped) and report
+how often the original is ranked 1st / within top-k.
+"""
+import argparse
+import time
+import unicodedata
+
+import numpy as np
+
+from matching.person_names import PersonNameIndex, parse_person_name
+
+def read_names(path):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return [line.strip() for line in f if line.strip()]
+
+def degrade(name: str) -> str:
+    p = parse_person_name(name)
+    if not p.initials:
+        return p.raw
+    surname = p.raw.split(",")[0] if "," in p.raw else p.surname
+    ascii_surname = unicodedata.normalize("NFKD", surname).encode("ascii", "ignore").decode() or surname
+    return f"{ascii_surname}, " + " ".join(f"{c.upper()}." for c in p.initials)
+
+def top1_with_ties(index, queries, res) -> float:
+    """Share of queries whose original name scores as high as the winner (same-initial namesakes tie)."""
+    best = res[res["rank"] == 1].set_index("query_idx")["score"].reindex(range(len(queries))).to_numpy()
+    own = np.array([index.score(q, [i])[0] for i, q in enumerate(queries)])
+    return float(np.mean(own >= best - 1e-6))
+
+def run(label, names, top_k):
+    t0 = time.perf_counter()
+    index = PersonNameIndex(names)
+    build_s = time.perf_counter() - t0
+    blocks = index.blocks()
+
+    t0 = time.perf_counter()
+    exact = index.match_many(names, top_k=1)
+    exact_s = time.perf_counter() - t0
+    self_top1 = top1_with_ties(index, names, exact)
+
+    queries = [degrade(n) for n in names]
+    t0 = time.perf_counter()
+    res = index.match_many(queries, top_k=top_k)
+    degraded_s = time.perf_counter() - t0
+    hit = res[res["index"] == res["query_idx"]]
+    tie_top1 = top1_with_ties(index, queries, res)
+
+    print(f"[{label}] {len(names)} names, {len(blocks)} surname blocks, largest {blocks.index[0]!r}={blocks.iloc[0]}")
+    print(f"  build            {build_s:7.2f} s")
+    print(f"  exact self-match {exact_s:7.2f} s  ({len(names) / exact_s:,.0f} q/s)  top1(incl. ties)={self_top1:.3f}")
+    print(f"  degraded queries {degraded_s:7.2f} s  ({len(names) / degraded_s:,.0f} q/s)  "
+          f"top1(incl. ties)={tie_top1:.3f}  top{top_k}={hit['query_idx'].nunique() / len(names):.3f}")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--authors", default="data/source_data/authors.txt")
+    ap.add_argument("--wang", default="data/source_data/wang.txt")
+    ap.add_argument("--top_k", type=int, default=5)
+    args = ap.parse_args()
+    run("authors", read_names(args.authors), args.top_k)
+    run("wang", read_names(args.wang), args.top_k)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+# tests/conftest.py
+
+import zlib
+import numpy as np
+import pytest
+
+class FakeEncoder:
+    """Deterministic unit vectors from crc32 of the text; records every batch it is asked to encode."""
+    def __init__(self):
+        self.calls = []
+
+    @staticmethod
+    def vectors(texts):
+        vecs = np.array([[zlib.crc32(f"{t}{i}".encode()) % 97 + 1 for i in range(8)] for t in texts], dtype=np.float32)
+        return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return self.vectors(texts)
+
+@pytest.fixture
+def fake_encoder(monkeypatch):
+    """Replace the model behind OrgVectorIndex (and so OrgMatcher) with a FakeEncoder."""
+    from matching import vector_index
+    encoder = FakeEncoder()
+    monkeypatch.setattr(vector_index, "encode", encoder)
+    return encoder
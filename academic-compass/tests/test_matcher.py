@@ -0,0 +1,29 @@
+# tests/test_matcher.py
+
+import pandas as pd
+import pytest
+from matching.matcher import OrgMatcher
+
+@pytest.fixture
+def matcher(tmp_path, fake_encoder):
+    pd.DataFrame({
+        "variant": ["MIT", "Massachusetts Inst of Tech", "Univ of Tokyo", "ETH Zurich", "Stanford Univ"],
+        "canonical": ["Massachusetts Institute of Technology"] * 2 + ["University of Tokyo", "ETH Zurich", "Stanford University"],
+    }).to_csv(tmp_path / "orgs.csv", index=False)
+    m = OrgMatcher(csv_path=tmp_path / "orgs.csv", cache_dir=None)
+    fake_encoder.calls.clear()
+    return m, fake_encoder.calls
+
+def test_match_many_dedupes_queries_and_keeps_input_order(matcher):
+    m, encoded = matcher
+    names = ["Stanford Univ.", "MIT", "stanford univ", "Univ. of Tokyo", "M.I.T", "MIT"]
+    df = m.match_many(names)
+    assert df["input"].tolist() == names
+    assert encoded == [sorted(set(df["normalized"]))]  # one encode call, each normalized name once
+    assert df.loc[0].drop("input").equals(df.loc[2].drop("input"))
+    assert df.loc[1].drop("input").equals(df.loc[5].drop("input"))
+    for i, name in enumerate(names):  # rows were remapped to the right query
+        single = m.match(name)
+        assert (df.loc[i, "match"], df.loc[i, "canonical"]) == (single["match"], single["canonical"])
+    assert df.loc[3, "canonical"] == "University of Tokyo"
+    assert df.loc[0, "canonical"] == "Stanford University"
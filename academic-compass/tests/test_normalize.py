@@ -0,0 +1,17 @@
+# tests/test_normalize.py
+
+import pytest
+from matching.normalize import repair_mojibake
+
+@pytest.mark.parametrize("broken, fixed", [
+    ("AKG√úL", "AKGÜL"),          # UTF-8 read as mac_roman
+    ("Ã©cole", "école"),          # UTF-8 read as cp1252
+    ("FranÃ§ois", "François"),
+    ("ÃƒÂ©cole", "école"),  # decoded wrongly twice
+])
+def test_repair_mojibake(broken, fixed):
+    assert repair_mojibake(broken) == fixed
+
+@pytest.mark.parametrize("text", ["AKGÜL", "Müller", "Łódź", "naïve", "plain ascii"])
+def test_repair_mojibake_leaves_correct_text_alone(text):
+    assert repair_mojibake(text) == text
@@ -0,0 +1,41 @@
+# tests/test_person_names.py
+
+import pytest
+from matching.person_names import PersonNameIndex, parse_person_name
+
+@pytest.mark.parametrize("raw, surname, initials", [
+    ("Wang, Futang", "wang", "f"),
+    ("WANG Futang", "wang", "f"),
+    ("Futang Wang", "wang", "f"),
+    ("Wang F", "wang", "f"),
+    ("Smith J. A.", "smith", "ja"),
+    ("Wei LI", "li", "w"),
+    ("AKG√úL, ESRA", "akgul", "e"),
+])
+def test_parse_person_name(raw, surname, initials):
+    p = parse_person_name(raw)
+    assert (p.surname, p.initials) == (surname, initials)
+
+@pytest.fixture
+def index():
+    return PersonNameIndex(["Smith, John Adam", "Smith, J. M.", "Smith, Jane", "Smyth, John", "Jones, John A."])
+
+def test_initials_compatibility(index):
+    ja, jm, jane = index.score("Smith J. A.", [0, 1, 2])
+    assert ja > jm  # "J. A." fits "John Adam" but not "J. M."
+    assert ja > jane
+    assert index.match("Smith, J. A.", top_k=1)[0][0] == "Smith, John Adam"
+
+def test_surname_blocking(index):
+    df = index.match_many(["Smith, John"], top_k=10)
+    assert set(df["match"]) <= {"Smith, John Adam", "Smith, J. M.", "Smith, Jane"}
+    assert "Jones, John A." not in set(df["match"])
+    # no exact block: fall back to near surname keys
+    assert index.match("Smithe, John", top_k=1)[0][0].startswith("Smith")
+
+def test_match_many_copies_repeated_queries(index):
+    df = index.match_many(["Smith, J. A.", "Jones J", "Smith, J. A."], top_k=2)
+    first = df[df["query_idx"] == 0][["rank", "match", "score"]].reset_index(drop=True)
+    third = df[df["query_idx"] == 2][["rank", "match", "score"]].reset_index(drop=True)
+    assert first.equals(third)
+    assert df[df["query_idx"] == 1]["match"].tolist() == ["Jones, John A."]
@@ -0,0 +1,31 @@
+# tests/test_preprocess.py
+
+import numpy as np
+from matching.preprocess import dedupe_lines, expand, load_unique, preprocess_file
+
+LINES = ["AKGÜL, ESRA\n", "Akgul Esra\n", "  \n", "AKG√úL, ESRA\n", "Smith, John\n", "AKGÜL, ESRA\n"]
+
+def test_dedupe_lines_groups_and_counts():
+    unique, mapping = dedupe_lines(LINES, key="fold")
+    assert mapping.dtype == np.int32
+    assert mapping.tolist() == [0, 0, -1, 0, 1, 0]
+    assert unique["text"].tolist() == ["AKGÜL, ESRA", "Smith, John"]  # mojibake repaired, most frequent spelling
+    assert unique["count"].tolist() == [4, 1]
+    assert unique["variants"].tolist() == [2, 1]
+    assert int(unique["count"].sum()) == int((mapping >= 0).sum())
+
+def test_exact_key_keeps_case_variants_apart():
+    unique, mapping = dedupe_lines(LINES, key="exact")
+    assert unique["text"].tolist() == ["AKGÜL, ESRA", "Akgul Esra", "Smith, John"]
+    assert mapping.tolist() == [0, 1, -1, 0, 2, 0]
+
+def test_expand_round_trips_counts(tmp_path):
+    path = tmp_path / "authors.txt"
+    path.write_text("".join(LINES), encoding="utf-8")
+    unique = preprocess_file(path, tmp_path / "out")
+    texts, mapping = load_unique(tmp_path / "out", "authors")
+    per_line = expand(texts, mapping)
+    assert per_line.tolist() == ["AKGÜL, ESRA", "AKGÜL, ESRA", None, "AKGÜL, ESRA", "Smith, John", "AKGÜL, ESRA"]
+    assert expand([len(t) for t in texts], mapping, fill=0).tolist() == [11, 11, 0, 11, 11, 11]
+    counts = np.bincount(mapping[mapping >= 0], minlength=len(texts))
+    assert counts.tolist() == unique["count"].tolist() == [4, 1]  # saved counts agree with the line mapping
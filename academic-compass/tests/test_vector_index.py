@@ -0,0 +1,31 @@
+# tests/test_vector_index.py
+
+import numpy as np
+import pytest
+from matching.vector_index import OrgVectorIndex
+
+pytestmark = pytest.mark.usefixtures("fake_encoder")
+
+def test_unchanged_names_load_from_cache(tmp_path):
+    names = ["Univ of Tokyo", "MIT", "ETH Zurich"]
+    first = OrgVectorIndex(cache_dir=tmp_path)
+    first.build(names)
+    assert first.encoded == 3
+    second = OrgVectorIndex(cache_dir=tmp_path)
+    second.build(names)
+    assert second.encoded == 0 and second.names == names
+    assert second.search("MIT", top_k=1)[0][0] == "MIT"
+
+def test_changed_names_encode_only_new_and_drop_stale_index(tmp_path, fake_encoder):
+    idx = OrgVectorIndex(cache_dir=tmp_path)
+    idx.build(["Univ of Tokyo", "MIT"])
+    vec_file = idx.cache_dir / "vectors" / "vectors.f32"
+    before = vec_file.read_bytes()
+    idx.build(["MIT", "ETH Zurich", "Univ of Tokyo", "ETH Zurich"])
+    assert idx.encoded == 1
+    assert vec_file.read_bytes()[:len(before)] == before  # appended, not rewritten
+    assert len(vec_file.read_bytes()) == 3 * 8 * 4
+    indexes = sorted(p.name for p in idx.cache_dir.glob("index-*"))
+    assert len(indexes) == 2 and {p.rsplit(".", 1)[1] for p in indexes} == {"faiss", "json"}
+    assert idx.index.ntotal == 4
+    assert np.allclose(idx.index.reconstruct(1), fake_encoder.vectors(["ETH Zurich"])[0])
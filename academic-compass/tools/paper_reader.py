@@ -7,12 +7,9 @@
 # tools/paper_reader.py
 import fitz  # PyMuPDF
 from typing import List, Dict
-from sentence_transformers import SentenceTransformer
+from academic_common.embedding_service import encode
 
 class PaperReader:
-    def __init__(self):
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
-
     def parse_pdf(self, pdf_path: str) -> List[Dict]:
         """
         Splits a PDF into sections by page for simplicity.
@@ -52,9 +49,9 @@ class PaperReader:
         - Rank by cosine similarity
         - Return the most relevant section text as the answer
         """
-        question_embedding = self.model.encode([question], normalize_embeddings=True)
+        question_embedding = encode([question], normalize=True)
         section_texts = [s["content"] for s in sections]
-        section_embeddings = self.model.encode(section_texts, normalize_embeddings=True)
+        section_embeddings = encode(section_texts, normalize=True)
 
         import numpy as np
         scores = np.dot(section_embeddings, question_embedding.T).flatten()
@@ -3,7 +3,7 @@
 
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
+from academic_common.embedding_service import encode
 
 class SemanticSearch:
     def __init__(self):
@@ -15,8 +15,6 @@ class SemanticSearch:
             {"id": 3, "title": "Climate Modeling with AI", "abstract": "Applies ML models to climate predictions."}
         ]
 
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")  # small and fast
-
         self.embeddings = self._embed_papers()
         self.index = self._build_faiss_index()
 
@@ -30,7 +28,7 @@ class SemanticSearch:
 
     def _embed_papers(self):
         texts = [paper["title"] + " " + paper["abstract"] for paper in self.papers]
-        embeddings = self.model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+        embeddings = encode(texts, normalize=True)
         return embeddings
 
     def _build_faiss_index(self):
@@ -40,7 +38,7 @@ class SemanticSearch:
         return index
 
     def search(self, query, top_k=2):
-        query_embedding = self.model.encode([query], convert_to_numpy=True, normalize_embeddings=True)
+        query_embedding = encode([query], normalize=True)
         scores, indices = self.index.search(query_embedding, top_k)
 
         results = []
@@ -1,14 +1,11 @@
-from sentence_transformers import SentenceTransformer
 import numpy as np
+from academic_common.embedding_service import encode
 
-model = SentenceTransformer("allenai-specter")
+MODEL_NAME = "allenai-specter"
 
 def build_author_profile(papers):
     # Average embeddings of papers written by an author
-    vectors = []
-    for paper in papers:
-        vec = model.encode(paper["title"] + " " + paper.get("abstract", ""), convert_to_numpy=True)
-        vectors.append(vec)
+    vectors = encode([paper["title"] + " " + paper.get("abstract", "") for paper in papers], model_name=MODEL_NAME)
     return np.mean(vectors, axis=0)
 
 def compare_authors(author1_vec, author2_vec):
@@ -1,4 +1,4 @@
-from sentence_transformers import SentenceTransformer
+from academic_common.embedding_service import encode
 from sklearn.cluster import KMeans
 from pyvis.network import Network
 import streamlit as st
@@ -15,9 +15,8 @@ papers = [
 
 # Embed and cluster
 def cluster_papers(papers, n_clusters=3):
-    model = SentenceTransformer("all-MiniLM-L6-v2")
     texts = [p["title"] + ". " + p["abstract"] for p in papers]
-    embeddings = model.encode(texts)
+    embeddings = encode(texts)
     
     kmeans = KMeans(n_clusters=n_clusters, random_state=42)
     labels = kmeans.fit_predict(embeddings)
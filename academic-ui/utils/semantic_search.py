@@ -1,21 +1,21 @@
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import util
 import numpy as np
 import faiss
 import pickle
+from academic_common.embedding_service import encode, encode_one
 
 
 
-# model = SentenceTransformer('allenai-specter')  # Optimized for academic papers
-model = SentenceTransformer("all-MiniLM-L6-v2")  # fast and lightweight
+# MODEL_NAME = 'allenai-specter'  # Optimized for academic papers (pass model_name= to encode)
 
 def encode_text(text):
-    return model.encode(text, convert_to_tensor=True)
+    return encode_one(text)
 
 def semantic_rank(query, papers):
     query_vec = encode_text(query)
+    paper_vecs = encode([paper["title"] + " " + paper["abstract"] for paper in papers])
     results = []
-    for paper in papers:
-        paper_vec = encode_text(paper["title"] + " " + paper["abstract"])
+    for paper, paper_vec in zip(papers, paper_vecs):
         score = float(util.cos_sim(query_vec, paper_vec)[0])
         results.append((score, paper))
     return sorted(results, reverse=True, key=lambda x: x[0])
@@ -23,7 +23,7 @@ def semantic_rank(query, papers):
 
 def build_faiss_index(papers):
     texts = [p["title"] + ". " + p["abstract"] for p in papers]
-    embeddings = model.encode(texts, convert_to_tensor=False)
+    embeddings = encode(texts)
     index = faiss.IndexFlatL2(len(embeddings[0]))
     index.add(np.array(embeddings))
     with open("index.pkl", "wb") as f:
@@ -37,6 +37,6 @@ def load_index():
 
 def retrieve(query, k=5):
     index, papers = load_index()
-    query_embedding = model.encode([query])[0]
+    query_embedding = encode_one(query)
     distances, indices = index.search(np.array([query_embedding]), k)
     return [papers[i] for i in indices[0]]
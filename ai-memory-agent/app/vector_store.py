@@ -2,18 +2,17 @@ from qdrant_client import QdrantClient
 from qdrant_client.models import VectorParams, Distance
 from typing import List
 from config import settings
-from sentence_transformers import SentenceTransformer
+from academic_common.embedding_service import embedding_dim, encode
 
-model = SentenceTransformer(settings.EMBEDDING_MODEL)
 client = QdrantClient(url=settings.QDRANT_URL)
 COLLECTION = "memories"
 
 # ensure collection exists
 if COLLECTION not in [c.name for c in client.get_collections().collections]:
-    client.recreate_collection(collection_name=COLLECTION, vectors_config={"size": model.get_sentence_embedding_dimension(), "distance": "Cosine"})
+    client.recreate_collection(collection_name=COLLECTION, vectors_config={"size": embedding_dim(settings.EMBEDDING_MODEL), "distance": "Cosine"})
 
 def embed_text(texts: List[str]):
-    return model.encode(texts, convert_to_numpy=True)
+    return encode(texts, model_name=settings.EMBEDDING_MODEL)
 
 def upsert_memories(items: List[dict]):
     # items: [{"id": str, "text": str, "meta": {...}}]
@@ -0,0 +1 @@
+"""Modules shared by the apps in this repository; install with `pip install -e ./common`."""
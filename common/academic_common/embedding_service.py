@@ -0,0 +1,191 @@
+# embedding_service.py
+# Shared sentence-embedding service used by every app: one model per process, batched encoding
+# and an on-disk vector cache shared across processes.
+from typing import Any, Dict, List, Optional, Sequence
+from pathlib import Path
+import contextlib
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+
+try:  # cross-process append lock; without it only threads of one process are serialized
+    import fcntl
+except ImportError:
+    fcntl = None
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+CACHE_DIR = os.getenv("EMBED_CACHE_DIR", "data/embed_cache")
+BATCH_SIZE = 64
+
+_MODELS: Dict[str, Any] = {}
+_SERVICES: Dict[str, "EmbeddingService"] = {}
+_LOCK = threading.Lock()
+
+def get_model(model_name: str = MODEL_NAME):
+    """Process-wide SentenceTransformer registry: each model is loaded once, on first use."""
+    with _LOCK:
+        if model_name not in _MODELS:
+            from sentence_transformers import SentenceTransformer
+            _MODELS[model_name] = SentenceTransformer(model_name)
+        return _MODELS[model_name]
+
+def text_key(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+@contextlib.contextmanager
+def _file_lock(path: Path):
+    with open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+class VectorStore:
+    """
+    Append-only vector cache for one model, shared by every process pointing at the same directory:
+      keys.txt     one text hash per line; line i is row i
+      vectors.f32  raw float32 rows, read through np.memmap
+      meta.json    {"dim": ...}
+    Rows are written before their keys, so a key never points past the end of the vector file.
+    """
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.keys_path = self.root / "keys.txt"
+        self.vec_path = self.root / "vectors.f32"
+        self.meta_path = self.root / "meta.json"
+        self.row: Dict[str, int] = {}
+        self.n = 0
+        self.dim: Optional[int] = None
+        self._keys_offset = 0
+        self._mm = None
+        self._lock = threading.Lock()
+        self._refresh()
+
+    def _refresh(self):
+        """Pick up rows appended since the last call (by this or another process)."""
+        if self.dim is None and self.meta_path.exists():
+            self.dim = json.loads(self.meta_path.read_text())["dim"]
+        if not self.keys_path.exists():
+            return
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # a partially written last line is ignored
+        for k in data[:end].decode("ascii").split():
+            self.row.setdefault(k, self.n)
+            self.n += 1
+        self._keys_offset += end
+
+    def lookup(self, keys: Sequence[str]) -> np.ndarray:
+        """Row per key, -1 where the vector is not cached yet."""
+        with self._lock:
+            if any(k not in self.row for k in keys):
+                self._refresh()
+            return np.array([self.row.get(k, -1) for k in keys], dtype=np.int64)
+
+    def read(self, rows: np.ndarray) -> np.ndarray:
+        with self._lock:
+            if self._mm is None or len(self._mm) < self.n:
+                self._mm = np.memmap(self.vec_path, dtype=np.float32, mode="r", shape=(self.n, self.dim))
+            mm = self._mm
+        return np.asarray(mm[rows])
+
+    def append(self, keys: Sequence[str], vectors: np.ndarray):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._lock, _file_lock(self.root / ".lock"):
+            self._refresh()
+            first: Dict[str, int] = {}
+            for i, k in enumerate(keys):
+                if k not in self.row:
+                    first.setdefault(k, i)
+            new = list(first.values())
+            if not new:
+                return
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                self.meta_path.write_text(json.dumps({"dim": self.dim}))
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"vector dim {vectors.shape[1]} != cached dim {self.dim} in {self.root}")
+            with open(self.vec_path, "ab") as f:
+                f.truncate(self.n * self.dim * 4)  # rows of a writer that died before recording its keys
+                f.write(vectors[new].tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self.keys_path, "ab") as f:
+                f.truncate(self._keys_offset)  # a partially written key line
+                f.write("".join(keys[i] + "\n" for i in new).encode("ascii"))
+            self._refresh()
+
+class EmbeddingService:
+    """
+    Batched encoding with an on-disk cache keyed by (model, text hash): only texts never seen
+    by any process sharing cache_dir go through the model. cache_dir=None keeps everything in memory.
+    """
+    def __init__(self, model_name: str = MODEL_NAME, cache_dir: Optional[str] = CACHE_DIR,
+                 batch_size: int = BATCH_SIZE):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.store = VectorStore(Path(cache_dir) / model_name.replace("/", "__")) if cache_dir else None
+        self.encoded = 0  # texts actually sent to the model
+
+    @property
+    def model(self):
+        return get_model(self.model_name)
+
+    @property
+    def dim(self) -> int:
+        if self.store is not None and self.store.dim is not None:
+            return self.store.dim
+        return self.model.get_sentence_embedding_dimension()
+
+    def _infer(self, texts: List[str]) -> np.ndarray:
+        self.encoded += len(texts)
+        embs = self.model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True,
+                                 show_progress_bar=False)
+        return np.asarray(embs, dtype=np.float32)
+
+    def encode(self, texts: Sequence[str], normalize: bool = False) -> np.ndarray:
+        """(len(texts), dim) float32 array; duplicates within the call are encoded once.
+        normalize=True returns unit-length rows (the cache always holds the raw vectors)."""
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        uniq = list(dict.fromkeys(texts))
+        if self.store is None:
+            vecs = self._infer(uniq)
+        else:
+            keys = [text_key(t) for t in uniq]
+            rows = self.store.lookup(keys)
+            miss = np.flatnonzero(rows < 0)
+            if len(miss):
+                self.store.append([keys[i] for i in miss], self._infer([uniq[i] for i in miss]))
+                rows = self.store.lookup(keys)
+            vecs = self.store.read(rows)
+        if normalize:
+            vecs = vecs / np.maximum(np.linalg.norm(vecs, axis=1, keepdims=True), 1e-12)
+        pos = {t: i for i, t in enumerate(uniq)}
+        return vecs[[pos[t] for t in texts]]
+
+    def encode_one(self, text: str, normalize: bool = False) -> np.ndarray:
+        return self.encode([text], normalize=normalize)[0]
+
+def get_service(model_name: str = MODEL_NAME) -> EmbeddingService:
+    with _LOCK:
+        if model_name not in _SERVICES:
+            _SERVICES[model_name] = EmbeddingService(model_name)
+        return _SERVICES[model_name]
+
+def encode(texts: Sequence[str], model_name: str = MODEL_NAME, normalize: bool = False) -> np.ndarray:
+    return get_service(model_name).encode(texts, normalize=normalize)
+
+def encode_one(text: str, model_name: str = MODEL_NAME, normalize: bool = False) -> np.ndarray:
+    return get_service(model_name).encode_one(text, normalize=normalize)
+
+def embedding_dim(model_name: str = MODEL_NAME) -> int:
+    return get_service(model_name).dim
@@ -0,0 +1,65 @@
+# text.py
+# Text normalization engine shared by the entity-normalizer presets (src/normalizer/text/normalize.py)
+# and the academic-compass organization / person-name matchers (matching/normalize.py).
+import re, unicodedata
+from functools import lru_cache
+
+# Letters NFKD does not decompose to ASCII; without these "Łódź" would fold to "odz".
+_FOLD = str.maketrans({"ß": "ss", "æ": "ae", "œ": "oe", "ø": "o", "ł": "l", "đ": "d", "ð": "d", "þ": "th", "ı": "i"})
+# After ASCII folding one bytes.translate lowercases and turns everything but [a-z0-9] and
+# whitespace into a space (several times faster than str.translate or a regex pass).
+_ASCII = bytes(c + 32 if 65 <= c <= 90 else c if (chr(c).isalnum() or chr(c).isspace()) else 32
+               for c in range(256))
+
+def nfkd_ascii(s: str) -> str:
+    return unicodedata.normalize("NFKD", s).encode("ascii","ignore").decode()
+
+class TextNormalizer:
+    """
+    One-pass text normalization shared by every matcher:
+    lowercase -> NFKD/ASCII fold -> punctuation to spaces (translation tables) -> synonyms and
+    noise (token dict; multi-word phrases via one compiled alternation, longest first) -> whitespace collapse.
+    Results are memoized per instance; normalize_batch also dedupes within the batch.
+    """
+    def __init__(self, synonyms: dict[str, str] | None = None, noise=(), cache_size: int = 1 << 16):
+        self.synonyms = {self._base(k): self._base(v) for k, v in (synonyms or {}).items()}
+        self.noise = {self._base(n) for n in noise}
+        repl = {**self.synonyms, **{n: "" for n in self.noise}}  # noise wins over a synonym
+        self._repl = repl
+        self._tokens = {k: v for k, v in repl.items() if " " not in k}
+        self._sub = self._first = None
+        phrases = sorted((k for k in repl if " " in k), key=len, reverse=True)
+        if phrases:
+            self._first = {k.split()[0] for k in phrases}  # skip the regex unless a phrase can start here
+            alt = "|".join(map(re.escape, phrases))
+            self._sub = re.compile(rf"(?<![a-z0-9])(?:{alt})(?![a-z0-9])").sub
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+
+    @staticmethod
+    def _base(s: str) -> str:
+        if s.isascii():
+            b = s.encode()
+        else:
+            b = unicodedata.normalize("NFKD", s.lower().translate(_FOLD)).encode("ascii", "ignore")
+        return " ".join(b.translate(_ASCII).decode().split())
+
+    def _normalize(self, s: str) -> str:
+        s = self._base(s)
+        if not s or not self._repl:
+            return s
+        toks = s.split(" ")
+        if self._sub is not None and not self._first.isdisjoint(toks):
+            toks = self._sub(lambda m: self._repl[m.group(0)], s).split()
+        if self._tokens:
+            get = self._tokens.get
+            toks = [get(t, t) for t in toks]
+            if self.noise:
+                toks = [t for t in toks if t]
+        return " ".join(toks)
+
+    def __call__(self, s: str) -> str:
+        return self.normalize(s)
+
+    def normalize_batch(self, texts) -> list[str]:
+        done = {t: self.normalize(t) for t in dict.fromkeys(texts)}
+        return [done[t] for t in texts]
@@ -0,0 +1,91 @@
+# tests/test_embedding_service.py
+import numpy as np
+import pytest
+
+from academic_common import embedding_service
+from academic_common.embedding_service import EmbeddingService, VectorStore, text_key
+
+
+def _rows(n, dim=4, start=0):
+    return np.arange(start * dim, (start + n) * dim, dtype=np.float32).reshape(n, dim)
+
+
+def test_append_and_lookup(tmp_path):
+    store = VectorStore(tmp_path)
+    store.append(["a", "b", "a"], _rows(3))
+    assert store.n == 2
+    rows = store.lookup(["b", "a", "c"])
+    assert rows.tolist() == [1, 0, -1]
+    assert np.array_equal(store.read(rows[:2]), _rows(2)[[1, 0]])
+    store.append(["b", "c"], _rows(2, start=5))  # "b" is already cached and is not rewritten
+    assert store.n == 3
+    assert np.array_equal(store.read(store.lookup(["b", "c"])), np.stack([_rows(1, start=1)[0], _rows(1, start=6)[0]]))
+
+
+def test_reopen_sees_rows_of_other_instances(tmp_path):
+    first = VectorStore(tmp_path)
+    first.append(["a", "b"], _rows(2))
+    second = VectorStore(tmp_path)
+    assert second.lookup(["a", "b"]).tolist() == [0, 1]
+    assert np.array_equal(second.read(np.array([0, 1])), _rows(2))
+    second.append(["c"], _rows(1, start=2))
+    assert first.lookup(["c"]).tolist() == [2]  # picked up without reopening
+    assert np.array_equal(first.read(np.array([2])), _rows(1, start=2))
+
+
+def test_dim_mismatch_is_rejected(tmp_path):
+    store = VectorStore(tmp_path)
+    store.append(["a"], _rows(1))
+    with pytest.raises(ValueError):
+        store.append(["b"], np.zeros((1, 3), dtype=np.float32))
+
+
+def test_recovers_from_partial_key_line(tmp_path):
+    store = VectorStore(tmp_path)
+    store.append(["a", "b"], _rows(2))
+    with open(store.keys_path, "ab") as f:
+        f.write(b"dead")  # a writer died mid-line
+    reopened = VectorStore(tmp_path)
+    assert reopened.n == 2
+    assert reopened.lookup(["dead"]).tolist() == [-1]
+    reopened.append(["c"], _rows(1, start=2))
+    assert VectorStore(tmp_path).lookup(["a", "b", "c", "dead"]).tolist() == [0, 1, 2, -1]
+    assert store.keys_path.read_text().split() == ["a", "b", "c"]
+
+
+def test_recovers_from_orphan_vector_rows(tmp_path):
+    store = VectorStore(tmp_path)
+    store.append(["a"], _rows(1))
+    with open(store.vec_path, "ab") as f:
+        f.write(_rows(2, start=7).tobytes()[:-3])  # rows whose keys were never recorded
+    reopened = VectorStore(tmp_path)
+    reopened.append(["b"], _rows(1, start=1))
+    assert store.vec_path.stat().st_size == 2 * 4 * 4
+    assert np.array_equal(VectorStore(tmp_path).read(np.array([0, 1])), _rows(2))
+
+
+class _FakeModel:
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, **kwargs):
+        self.calls += len(texts)
+        return np.array([[len(t), t.count("a"), 1.0] for t in texts], dtype=np.float32)
+
+    def get_sentence_embedding_dimension(self):
+        return 3
+
+
+def test_service_encodes_each_text_once_across_instances(tmp_path, monkeypatch):
+    model = _FakeModel()
+    monkeypatch.setitem(embedding_service._MODELS, "fake", model)
+    svc = EmbeddingService("fake", cache_dir=str(tmp_path))
+    out = svc.encode(["aa", "b", "aa"])
+    assert out.shape == (3, 3) and np.array_equal(out[0], out[2])
+    assert model.calls == 2
+    again = EmbeddingService("fake", cache_dir=str(tmp_path))
+    assert np.array_equal(again.encode(["b", "aa"]), out[[1, 0]])
+    assert model.calls == 2 and again.encoded == 0
+    unit = again.encode(["aa"], normalize=True)
+    assert np.allclose(np.linalg.norm(unit, axis=1), 1.0)
+    assert np.array_equal(again.store.read(again.store.lookup([text_key("aa")])), out[:1])
@@ -0,0 +1,15 @@
+# tests/test_text.py
+from academic_common.text import TextNormalizer, nfkd_ascii
+
+
+def test_fold_and_punctuation():
+    n = TextNormalizer()
+    assert n("  Łódź Univ. of Tech.,  ") == "lodz univ of tech"
+    assert n("Straße_X-ray") == "strasse x ray"
+    assert nfkd_ascii("École") == "Ecole"
+
+
+def test_phrase_synonyms_longest_first():
+    n = TextNormalizer(synonyms={"mass inst of tech": "mit", "inst": "institute"})
+    assert n("Mass. Inst. of Tech.") == "mit"
+    assert n("Inst of Physics") == "institute of physics"
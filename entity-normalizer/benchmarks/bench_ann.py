@@ -0,0 +1,71 @@
+# benchmarks/bench_ann.py
+# Recall@k vs latency of HNSW / IVF-PQ against the exact flat index, per entity type in the eval set.
+#   python -m benchmarks.bench_ann --pairs data/eval/labeled_pairs.csv --k 10
+# "recall@k" is overlap with the flat top-k; "gold@k" is the share of inputs whose gold_id is in the top-k.
+import argparse, time
+import numpy as np, pandas as pd
+from sentence_transformers import SentenceTransformer
+from src.normalizer.candidates.index_factory import apply_search_params, build_faiss_index
+from src.normalizer.config import CFG
+from src.normalizer.pipeline import entity_name
+from src.normalizer.stores.catalog import Catalog
+
+def timed_search(index, Q, k):
+    t0 = time.perf_counter()
+    _, I = index.search(Q, k)
+    return I, (time.perf_counter() - t0) / len(Q)
+
+def overlap_recall(I, I_ref):
+    return float(np.mean([len(set(a) & set(b)) / len(b) for a, b in zip(I, I_ref)]))
+
+def gold_recall(I, gold_rows):
+    return float(np.mean([g in set(row) for row, g in zip(I, gold_rows)]))
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pairs", default="data/eval/labeled_pairs.csv")
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--hnsw_m", type=int, default=32)
+    ap.add_argument("--ef", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    ap.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = ap.parse_args()
+
+    pairs = pd.read_csv(args.pairs)
+    pairs["entity"] = pairs["entity_type"].map(entity_name)
+    model = SentenceTransformer(CFG.model_name)
+    encode = lambda xs: model.encode(xs, normalize_embeddings=True, convert_to_numpy=True,
+                                     show_progress_bar=False).astype("float32")
+    print(f"{'entity':<14} {'index':<7} {'knob':<12} {f'recall@{args.k}':>10} {f'gold@{args.k}':>8} {'us/query':>10} {'build s':>8}")
+    for entity, grp in pairs.groupby("entity"):
+        cat = Catalog(CFG.catalog_paths[entity])
+        id_to_row = {str(cat.cols[cat.id_col][i]): i for i in range(len(cat))}
+        gold = [id_to_row.get(str(g), -1) for g in grp["gold_id"]]
+        X, Q = encode(cat.names), encode(grp["input_name"].astype(str).tolist())
+        k = min(args.k, len(cat))
+
+        def report(name, knob, index, build_s, I_ref):
+            I, lat = timed_search(index, Q, k)
+            rec = 1.0 if I_ref is None else overlap_recall(I, I_ref)
+            print(f"{entity:<14} {name:<7} {knob:<12} {rec:>10.3f} {gold_recall(I, gold):>8.3f} {lat*1e6:>10.1f} {build_s:>8.2f}")
+            return I
+
+        t0 = time.perf_counter(); flat, _ = build_faiss_index(X, "flat")
+        I_flat = report("flat", "-", flat, time.perf_counter() - t0, None)
+
+        t0 = time.perf_counter(); hnsw, _ = build_faiss_index(X, "hnsw", hnsw_m=args.hnsw_m)
+        build_s = time.perf_counter() - t0
+        for ef in args.ef:
+            report("hnsw", f"efSearch={ef}", apply_search_params(hnsw, ef_search=max(ef, k)), build_s, I_flat)
+
+        try:
+            t0 = time.perf_counter(); ivf, params = build_faiss_index(X, "ivfpq")
+        except ValueError as e:
+            print(f"{entity:<14} ivfpq   skipped: {e}")
+            continue
+        build_s = time.perf_counter() - t0
+        for nprobe in args.nprobe:
+            if nprobe <= params["nlist"]:
+                report("ivfpq", f"nprobe={nprobe}", apply_search_params(ivf, nprobe=nprobe), build_s, I_flat)
+
+if __name__ == "__main__":
+    main()
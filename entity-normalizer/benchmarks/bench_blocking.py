@@ -0,0 +1,46 @@
+# benchmarks/bench_blocking.py
+# Fuzzy candidate recall and speedup of BlockingIndex vs the full rapidfuzz scan, per entity type.
+#   python -m benchmarks.bench_blocking --pairs data/eval/labeled_pairs.csv --k 20
+# "block recall" = gold name inside the blocked set; "top-k recall" = gold name in the fuzzy top-k.
+import argparse, time
+import pandas as pd
+from src.normalizer.candidates.blocking import BlockingIndex
+from src.normalizer.candidates.generator import gen_fuzzy_batch
+from src.normalizer.config import CFG
+from src.normalizer.pipeline import entity_name
+from src.normalizer.stores.catalog import Catalog
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pairs", default="data/eval/labeled_pairs.csv")
+    ap.add_argument("--k", type=int, default=20)
+    ap.add_argument("--key_types", nargs="+", default=CFG.blocking.get("key_types", ["ngram", "prefix"]))
+    ap.add_argument("--max_candidates", type=int, default=CFG.blocking.get("max_candidates", 1000))
+    args = ap.parse_args()
+
+    pairs = pd.read_csv(args.pairs)
+    pairs["entity"] = pairs["entity_type"].map(entity_name)
+    print(f"{'entity':<14} {'rows':>8} {'block recall':>13} {'top-k full':>11} {'top-k block':>12} "
+          f"{'full ms/q':>10} {'block ms/q':>11} {'speedup':>8} {'build s':>8}")
+    for entity, grp in pairs.groupby("entity"):
+        cat = Catalog(CFG.catalog_paths[entity])
+        id_to_name = {str(cat.cols[cat.id_col][i]): n for i, n in enumerate(cat.names)}
+        gold = [id_to_name.get(str(g)) for g in grp["gold_id"]]
+        queries = grp["input_name"].astype(str).tolist()
+
+        t0 = time.perf_counter()
+        blocker = BlockingIndex(cat.names, key_types=args.key_types, max_candidates=args.max_candidates)
+        build_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter(); full = gen_fuzzy_batch(queries, cat.names, k=args.k)
+        t_full = (time.perf_counter() - t0) / len(queries)
+        t0 = time.perf_counter(); blocked = blocker.fuzzy_topk(queries, k=args.k)
+        t_block = (time.perf_counter() - t0) / len(queries)
+
+        in_block = sum(g in {cat.names[i] for i in blocker.candidates(q)} for q, g in zip(queries, gold)) / len(queries)
+        topk = lambda res: sum(g in {c for c, _ in r} for r, g in zip(res, gold)) / len(queries)
+        print(f"{entity:<14} {len(cat):>8} {in_block:>13.3f} {topk(full):>11.3f} {topk(blocked):>12.3f} "
+              f"{t_full*1e3:>10.2f} {t_block*1e3:>11.2f} {t_full/t_block:>7.1f}x {build_s:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# benchmarks/bench_catalog.py
+# Per-query catalog lookup latency (50 row_by_name calls, as in BaseNormalizer) vs catalog size.
+#   python -m benchmarks.bench_catalog --sizes 1000 10000 100000
+import argparse, random, tempfile, time
+from pathlib import Path
+import pandas as pd
+from src.normalizer.stores.catalog import Catalog
+
+CANDS_PER_QUERY = 50
+
+def synth_catalog(n: int, path: Path):
+    rng = random.Random(n)
+    pd.DataFrame({
+        "id": [f"ORG{i:08d}" for i in range(n)],
+        "name": [f"University {rng.randrange(10**9):09d} {i}" for i in range(n)],
+        "country": [rng.choice(["US","GB","CN","DE","FR","JP"]) for _ in range(n)],
+    }).to_csv(path, index=False)
+
+def pandas_scan(df: pd.DataFrame, name: str):
+    hit = df[df["name"] == name]
+    return None if hit.empty else hit.iloc[0].to_dict()
+
+def time_per_query(lookup, names, n_queries):
+    rng = random.Random(0)
+    queries = [rng.sample(names, CANDS_PER_QUERY) for _ in range(n_queries)]
+    t0 = time.perf_counter()
+    for cands in queries:
+        for name in cands:
+            lookup(name)
+    return (time.perf_counter() - t0) / n_queries
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    ap.add_argument("--queries", type=int, default=200)
+    args = ap.parse_args()
+    print(f"{'rows':>10} {'pandas scan/query':>20} {'catalog/query':>16} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            path = Path(tmp) / f"cat_{n}.csv"
+            synth_catalog(n, path)
+            cat, df = Catalog(str(path)), pd.read_csv(path)
+            # the pandas scan is O(rows); keep its total runtime bounded on big catalogs
+            n_scan = max(5, min(args.queries, 2_000_000 // n))
+            t_scan = time_per_query(lambda s: pandas_scan(df, s), cat.names, n_scan)
+            t_cat = time_per_query(lambda s: cat.row_by_name(s).get("id"), cat.names, args.queries)
+            print(f"{n:>10} {t_scan*1e3:>17.2f} ms {t_cat*1e6:>13.1f} us {t_scan/t_cat:>8.0f}x")
+
+if __name__ == "__main__":
+    main()
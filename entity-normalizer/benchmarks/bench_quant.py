@@ -0,0 +1,61 @@
+# benchmarks/bench_quant.py
+# Memory vs recall of quantized catalog vectors (sq8, binary) against the exact float flat index,
+# per entity type in the eval set, with and without the exact float rerank from vectors.npy.
+#   python -m benchmarks.bench_quant --pairs data/eval/labeled_pairs.csv --k 10
+# "RAM MB" is the in-memory index; "disk MB" is the memory-mapped float matrix read only for reranking
+# (rerank=0 means quantized scores are used as-is and no float matrix is needed).
+import argparse, tempfile, time
+from pathlib import Path
+import numpy as np, pandas as pd
+from sentence_transformers import SentenceTransformer
+from src.normalizer.candidates.index_factory import build_faiss_index
+from src.normalizer.candidates.quantized import exact_rerank, index_nbytes, search_codes
+from src.normalizer.config import CFG
+from src.normalizer.pipeline import entity_name
+from src.normalizer.stores.catalog import Catalog
+from benchmarks.bench_ann import gold_recall, overlap_recall
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pairs", default="data/eval/labeled_pairs.csv")
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--rerank", type=int, nargs="+", default=[0, 2, 4, 8], help="rerank factors to try")
+    args = ap.parse_args()
+
+    pairs = pd.read_csv(args.pairs)
+    pairs["entity"] = pairs["entity_type"].map(entity_name)
+    model = SentenceTransformer(CFG.model_name)
+    encode = lambda xs: model.encode(xs, normalize_embeddings=True, convert_to_numpy=True,
+                                     show_progress_bar=False).astype("float32")
+    tmp = Path(tempfile.mkdtemp())
+    print(f"{'entity':<14} {'index':<7} {'rerank':>6} {'RAM MB':>8} {'disk MB':>8} {f'recall@{args.k}':>10} {f'gold@{args.k}':>8} {'us/query':>10}")
+    for entity, grp in pairs.groupby("entity"):
+        cat = Catalog(CFG.catalog_paths[entity])
+        id_to_row = {str(cat.cols[cat.id_col][i]): i for i in range(len(cat))}
+        gold = [id_to_row.get(str(g), -1) for g in grp["gold_id"]]
+        X, Q = encode(cat.names), encode(grp["input_name"].astype(str).tolist())
+        k = min(args.k, len(cat))
+        np.save(tmp / f"{entity}.npy", X)
+        vectors = np.load(tmp / f"{entity}.npy", mmap_mode="r")
+        disk_mb = X.nbytes / 2**20
+
+        flat, _ = build_faiss_index(X, "flat")
+        _, I_flat = flat.search(Q, k)
+        print(f"{entity:<14} {'flat':<7} {'-':>6} {index_nbytes(flat) / 2**20:>8.2f} {0:>8.2f} "
+              f"{1.0:>10.3f} {gold_recall(I_flat, gold):>8.3f} {'':>10}")
+        for index_type in ("sq8", "binary"):
+            index, _ = build_faiss_index(X, index_type)
+            ram_mb = index_nbytes(index) / 2**20
+            for factor in args.rerank:
+                t0 = time.perf_counter()
+                if factor:
+                    _, I = search_codes(index, Q, min(k * factor, len(cat)))
+                    _, I = exact_rerank(vectors, Q, I, k)
+                else:
+                    _, I = search_codes(index, Q, k)
+                lat = (time.perf_counter() - t0) / len(Q)
+                print(f"{entity:<14} {index_type:<7} {factor:>6} {ram_mb:>8.2f} {disk_mb if factor else 0:>8.2f} "
+                      f"{overlap_recall(I, I_flat):>10.3f} {gold_recall(I, gold):>8.3f} {lat*1e6:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# src/api/batcher.py
+# Dynamic micro-batching: concurrent requests are queued and flushed as one normalize_batch call
+# per entity type once `max_batch` items are waiting or the oldest has waited `max_wait_ms`.
+import asyncio, time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+class MicroBatcher:
+    def __init__(self, normalize_batch, max_batch: int = 64, max_wait_ms: float = 5.0):
+        self.normalize_batch = normalize_batch  # (entity_type, texts, contexts) -> list[dict]
+        self.max_batch, self.max_wait = max_batch, max_wait_ms / 1000.0
+        self.queue: asyncio.Queue | None = None
+        self._task = None
+        # one inference thread: batches run back to back while the next one fills up
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="normalize-batch")
+        self.batches = self.items = 0
+        self.batch_sizes = Counter()
+        self.busy_s = 0.0
+
+    async def start(self):
+        self.queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=True)
+
+    async def submit(self, entity_type: str, text: str, ctx: dict | None = None) -> dict:
+        fut = asyncio.get_running_loop().create_future()
+        await self.queue.put((entity_type, text, ctx or {}, fut))
+        return await fut
+
+    async def submit_many(self, entity_type: str, texts: list[str], ctxs: list[dict | None] | None = None) -> list[dict]:
+        ctxs = ctxs or [None] * len(texts)
+        return list(await asyncio.gather(*(self.submit(entity_type, t, c) for t, c in zip(texts, ctxs))))
+
+    async def _collect(self) -> list:
+        batch = [await self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            groups = {}
+            for item in batch:
+                groups.setdefault(item[0], []).append(item)
+            t0 = time.perf_counter()
+            for etype, items in groups.items():
+                items = [it for it in items if not it[3].cancelled()]
+                if not items:
+                    continue
+                try:
+                    outs = await loop.run_in_executor(self._executor, self.normalize_batch, etype,
+                                                      [it[1] for it in items], [it[2] for it in items])
+                except Exception as e:
+                    for it in items:
+                        if not it[3].done():
+                            it[3].set_exception(e)
+                    continue
+                for it, out in zip(items, outs):
+                    if not it[3].done():
+                        it[3].set_result(out)
+            self.busy_s += time.perf_counter() - t0
+            self.batches += 1
+            self.items += len(batch)
+            self.batch_sizes[len(batch)] += 1
+
+    def metrics(self) -> dict:
+        return {
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "batches_total": self.batches,
+            "items_total": self.items,
+            "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+            "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+            "busy_seconds": round(self.busy_s, 3),
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000,
+        }
@@ -1,16 +1,82 @@
 # src/api/main.py
-from fastapi import FastAPI
-from .schemas import NormalizeReq, NormalizeResp
-from ..normalizer.pipeline import NormalizationPipeline
+import asyncio, logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException
+from .batcher import MicroBatcher
+from .schemas import NormalizeReq, NormalizeResp, NormalizeBatchReq, NormalizeBatchResp
+from ..normalizer.config import CFG
+from ..normalizer.pipeline import ENTITY_ATTR, NormalizationPipeline
+from ..normalizer.stores.cache import get_cache
+
+log = logging.getLogger(__name__)
 
-app = FastAPI(title="Local Entity Normalizer")
 pipe = NormalizationPipeline()
+batcher = MicroBatcher(pipe.normalize_batch, **CFG.server.get("batching", {}))
+
+async def _watch_versions(every: float):
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(every)
+        try:
+            swapped = await loop.run_in_executor(None, pipe.refresh)
+            if swapped:
+                log.info("hot-swapped %s to new catalog/index versions", swapped)
+        except Exception:
+            log.exception("catalog reload failed; keeping the live version")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    preload = CFG.server.get("preload") or []
+    if preload:
+        loop = asyncio.get_running_loop()
+        if CFG.server.get("warm_up"):
+            timings = await loop.run_in_executor(None, pipe.warm_up, preload)
+            log.info("warm-up done: %s", timings)
+        else:
+            for e in preload:
+                await loop.run_in_executor(None, pipe.normalizer, e)
+    await batcher.start()
+    every = CFG.server.get("reload_poll_s") or 0
+    watcher = asyncio.create_task(_watch_versions(every)) if every > 0 else None
+    yield
+    if watcher:
+        watcher.cancel()
+    await batcher.stop()
+
+app = FastAPI(title="Local Entity Normalizer", lifespan=lifespan)
+
+def _check_entity(entity_type: str):
+    if entity_type not in ENTITY_ATTR:
+        raise HTTPException(status_code=400, detail=f"unknown entity_type {entity_type!r}")
+
+def _resp(out: dict) -> NormalizeResp:
+    _id = out.get("id")
+    return NormalizeResp(id=None if _id is None else str(_id), name=out.get("name"), score=out.get("score", 0.0))
 
 @app.post("/normalize", response_model=NormalizeResp)
-def normalize(req: NormalizeReq):
-    out = pipe.normalize(req.entity_type, req.text, req.context)
-    return NormalizeResp(id=out.get("id"), name=out.get("name"), score=out.get("score", 0.0))
+async def normalize(req: NormalizeReq):
+    _check_entity(req.entity_type)
+    return _resp(await batcher.submit(req.entity_type, req.text, req.context))
+
+@app.post("/normalize/batch", response_model=NormalizeBatchResp)
+async def normalize_batch(req: NormalizeBatchReq):
+    _check_entity(req.entity_type)
+    if req.contexts is not None and len(req.contexts) != len(req.texts):
+        raise HTTPException(status_code=422, detail="contexts must align with texts")
+    outs = await batcher.submit_many(req.entity_type, req.texts, req.contexts)
+    return NormalizeBatchResp(results=[_resp(o) for o in outs])
+
+@app.post("/reload")
+async def reload():
+    """Pick up catalog / index versions written by src/cli/ingest_delta.py without a restart."""
+    swapped = await asyncio.get_running_loop().run_in_executor(None, pipe.refresh)
+    return {"reloaded": swapped, "versions": {e: pipe.normalizer(e).version for e in pipe.loaded}}
+
+@app.get("/metrics")
+def metrics():
+    cache = get_cache(CFG.cache)
+    return {"batcher": batcher.metrics(), "cache": cache.stats() if cache else None, "loaded": pipe.loaded}
 
 
 ### Example usage:
-### uvicorn src.api.main:app --reload --host 0.0.0.0 --port 8000
\ No newline at end of file
+### uvicorn src.api.main:app --host 0.0.0.0 --port 8000
@@ -9,3 +9,11 @@ class NormalizeResp(BaseModel):
     id: str | None
     name: str | None
     score: float
+
+class NormalizeBatchReq(BaseModel):
+    entity_type: str
+    texts: list[str]
+    contexts: list[dict | None] | None = None
+
+class NormalizeBatchResp(BaseModel):
+    results: list[NormalizeResp]
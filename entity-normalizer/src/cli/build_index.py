@@ -1,22 +1,59 @@
-import pandas as pd, faiss, numpy as np
+# src/cli/build_index.py
+import pandas as pd
 from sentence_transformers import SentenceTransformer
 import argparse
+from ..normalizer.candidates.index_bundle import id_labels, model_fingerprint, write_bundle
+from ..normalizer.candidates.index_factory import INDEX_TYPES, build_faiss_index
+from ..normalizer.candidates.quantized import QUANTIZED
+from ..normalizer.stores.catalog import file_checksum
 
-def build(csv_path, name_col, out_path, model_name="BAAI/bge-small-en"):
+def build(csv_path, name_col, out_dir, model_name="BAAI/bge-small-en", index_type="flat", id_col="id",
+          float_vectors=None, **index_params):
     df = pd.read_csv(csv_path)
     names = df[name_col].astype(str).tolist()
+    ids = None
+    if id_col and id_col in df.columns:
+        ids = df[id_col].tolist()
+        if df[id_col].duplicated().any():
+            raise ValueError(f"{csv_path}: duplicate values in id column {id_col!r}")
     model = SentenceTransformer(model_name)
-    X = model.encode(names, normalize_embeddings=True)
-    index = faiss.IndexFlatIP(X.shape[1]); index.add(X)
-    faiss.write_index(index, out_path)
-    np.save(out_path.replace(".faiss",".ids.npy"), np.arange(len(names)))
-    print("Saved", out_path)
+    X = model.encode(names, normalize_embeddings=True, convert_to_numpy=True).astype("float32")
+    if float_vectors is None:
+        float_vectors = index_type in QUANTIZED  # exact rerank source for quantized candidates
+    index, params = build_faiss_index(X, index_type, ids=None if ids is None else id_labels(ids), **index_params)
+    version = write_bundle(out_dir, index, names, {
+        "model_name": model_name,
+        "model_fingerprint": model_fingerprint(model_name, X.shape[1]),
+        "catalog_path": str(csv_path),
+        "catalog_checksum": file_checksum(csv_path)[:16],
+        "index_type": index_type,
+        "index_params": params,
+    }, ids=ids, vectors=X if float_vectors else None)
+    print("Saved", out_dir, version, index_type, params)
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
     ap.add_argument("--csv", required=True)
     ap.add_argument("--name_col", default="name")
-    ap.add_argument("--out", required=True)
+    ap.add_argument("--id_col", default="id", help="ID-map the index by this column (enables ingest_delta); '' = positional")
+    ap.add_argument("--out", required=True, help="bundle dir, e.g. data/embeddings/indexes/orgs")
     ap.add_argument("--model", default="BAAI/bge-small-en")
+    ap.add_argument("--index_type", choices=INDEX_TYPES, default="flat")
+    ap.add_argument("--hnsw_m", type=int, default=32)
+    ap.add_argument("--ef_construction", type=int, default=200)
+    ap.add_argument("--nlist", type=int, default=None, help="ivfpq centroids (default ~4*sqrt(n))")
+    ap.add_argument("--pq_m", type=int, default=None, help="ivfpq sub-quantizers; must divide the embedding dim")
+    ap.add_argument("--pq_nbits", type=int, default=8)
+    ap.add_argument("--train_size", type=int, default=100_000)
+    ap.add_argument("--float_vectors", action=argparse.BooleanOptionalAction, default=None,
+                    help="store vectors.npy for the exact rerank (default: on for sq8 / binary)")
     args = ap.parse_args()
-    build(args.csv, args.name_col, args.out, args.model)
+    build(args.csv, args.name_col, args.out, args.model, args.index_type, args.id_col, args.float_vectors,
+          hnsw_m=args.hnsw_m, ef_construction=args.ef_construction, nlist=args.nlist,
+          pq_m=args.pq_m, pq_nbits=args.pq_nbits, train_size=args.train_size)
+
+
+### Example usage:
+# python -m src.cli.build_index --csv data/catalogs/orgs.csv --out data/embeddings/indexes/orgs
+# python -m src.cli.build_index --csv data/catalogs/orgs.csv --out data/embeddings/indexes/orgs --index_type hnsw --hnsw_m 32
+# python -m src.cli.build_index --csv data/catalogs/orgs.csv --out data/embeddings/indexes/orgs --index_type binary
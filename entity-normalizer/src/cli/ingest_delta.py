@@ -0,0 +1,113 @@
+# src/cli/ingest_delta.py
+# Apply a new catalog CSV to an ID-mapped index bundle without re-embedding the whole catalog:
+# rows are diffed by id, only added / renamed rows are encoded, and the result is written as the
+# next bundle version before the catalog file itself is replaced.
+import argparse, os, shutil
+from pathlib import Path
+import faiss, numpy as np
+import pandas as pd
+from ..normalizer.candidates.index_bundle import id_labels, load_bundle, load_ids, load_vectors, model_fingerprint, write_bundle
+from ..normalizer.candidates.index_factory import build_faiss_index
+from ..normalizer.candidates.quantized import pack_bits
+from ..normalizer.config import CFG
+from ..normalizer.pipeline import entity_name
+from ..normalizer.stores.catalog import file_checksum
+
+def diff_catalog(old_ids, old_names, new_ids, new_names) -> dict[str, list]:
+    """Ids added, removed, and renamed (needing a new vector) between two catalog versions."""
+    old = dict(zip(map(str, old_ids), old_names))
+    new = dict(zip(map(str, new_ids), new_names))
+    return {
+        "added": [i for i in new if i not in old],
+        "removed": [i for i in old if i not in new],
+        "changed": [i for i in new if i in old and old[i] != new[i]],
+    }
+
+def _drop(index, labels: np.ndarray, meta: dict):
+    """remove_ids, or for indexes that cannot delete (HNSW) rebuild from the stored vectors."""
+    if not len(labels):
+        return index
+    try:
+        index.remove_ids(labels)
+        return index
+    except RuntimeError:
+        pass
+    keep = np.setdiff1d(faiss.vector_to_array(index.id_map).astype("int64"), labels)
+    X = index.reconstruct_batch(keep) if len(keep) else np.zeros((0, index.d), dtype="float32")
+    index, _ = build_faiss_index(X, meta["index_type"], ids=keep, **meta.get("index_params", {}))
+    return index
+
+def _merge_vectors(old_vectors, old_ids, X, todo, ids):
+    """New float matrix aligned with ids: unchanged rows copied from the old bundle, the rest from X."""
+    if old_vectors is None:
+        return None
+    old_row = {i: r for r, i in enumerate(old_ids)}
+    new_row = {i: r for r, i in enumerate(todo)}
+    ids = [str(i) for i in ids]
+    fresh = np.array([i in new_row for i in ids], dtype=bool)
+    vectors = np.empty((len(ids), old_vectors.shape[1]), dtype="float32")
+    vectors[~fresh] = old_vectors[np.array([old_row[i] for i in ids if i not in new_row], dtype="int64")]
+    vectors[fresh] = X[np.array([new_row[i] for i in ids if i in new_row], dtype="int64")]
+    return vectors
+
+def ingest(csv_path, index_dir, catalog_path, name_col="name", id_col="id", batch_size=64, dry_run=False) -> dict:
+    index, old_names, meta = load_bundle(index_dir, mmap=False)
+    old_ids = load_ids(index_dir)
+    if old_ids is None:
+        raise ValueError(f"{index_dir}/{meta['version']} is not ID-mapped; rebuild it once with build_index --id_col {id_col}")
+    df = pd.read_csv(csv_path)
+    if df[id_col].duplicated().any():
+        raise ValueError(f"{csv_path}: duplicate values in id column {id_col!r}")
+    ids, names = df[id_col].tolist(), df[name_col].astype(str).tolist()
+    delta = diff_catalog(old_ids, old_names.tolist(), ids, names)
+    report = {"base_version": meta["version"], **{k: len(v) for k, v in delta.items()}}
+    checksum = file_checksum(csv_path)[:16]
+    if dry_run or (checksum == meta.get("catalog_checksum") and not any(delta.values())):
+        return {**report, "version": meta["version"]}
+
+    index = _drop(index, id_labels(delta["removed"] + delta["changed"]), meta)
+    todo = delta["added"] + delta["changed"]
+    X = np.zeros((0, meta["dim"]), dtype="float32")
+    if todo:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(meta["model_name"])
+        if model_fingerprint(meta["model_name"], model.get_sentence_embedding_dimension()) != meta["model_fingerprint"]:
+            raise ValueError(f"model {meta['model_name']} no longer matches the bundle fingerprint; run a full build_index")
+        by_id = dict(zip(map(str, ids), names))
+        X = model.encode([by_id[i] for i in todo], batch_size=batch_size, normalize_embeddings=True,
+                         convert_to_numpy=True, show_progress_bar=False).astype("float32")
+        index.add_with_ids(pack_bits(X) if isinstance(index, faiss.IndexBinary) else X, id_labels(todo))
+    vectors = _merge_vectors(load_vectors(index_dir, meta["version"]), old_ids, X, todo, ids)
+
+    version = write_bundle(index_dir, index, names, {
+        **{k: v for k, v in meta.items() if k not in ("version", "n", "dim", "created_at", "id_map", "binary", "float_vectors")},
+        "catalog_path": str(catalog_path),
+        "catalog_checksum": checksum,
+        "delta": report,
+    }, ids=ids, vectors=vectors)
+    # replace the catalog only after the bundle is live: servers reload once both agree (BaseNormalizer.is_stale)
+    if Path(csv_path).resolve() != Path(catalog_path).resolve():
+        tmp = Path(catalog_path).with_name(f".{Path(catalog_path).name}.tmp")
+        shutil.copyfile(csv_path, tmp)
+        os.replace(tmp, catalog_path)
+    return {**report, "version": version}
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--entity", required=True, help="entity type; resolves --index / --catalog from configs/app.yaml")
+    ap.add_argument("--csv", required=True, help="new full catalog CSV")
+    ap.add_argument("--index", default=None, help="bundle dir (default: indexes.<entity>)")
+    ap.add_argument("--catalog", default=None, help="live catalog CSV to replace (default: catalogs.<entity>)")
+    ap.add_argument("--name_col", default="name")
+    ap.add_argument("--id_col", default="id")
+    ap.add_argument("--dry_run", action="store_true", help="only report the diff")
+    args = ap.parse_args()
+    entity = entity_name(args.entity)
+    out = ingest(args.csv, args.index or CFG.index_paths[entity], args.catalog or CFG.catalog_paths[entity],
+                 args.name_col, args.id_col, dry_run=args.dry_run)
+    print(out)
+
+
+### Example usage:
+# python -m src.cli.ingest_delta --entity funders --csv incoming/funders_2024-06-01.csv
+# curl -X POST localhost:8000/reload   # or wait for server.reload_poll_s
@@ -1,17 +1,112 @@
 # src/cli/normalize.py
-import sys, csv, json
-from normalizer.pipeline import NormalizationPipeline
+import json, argparse, os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from ..normalizer.pipeline import NormalizationPipeline
+from .streaming import FORMATS, RowWriter, infer_format, iter_chunks, load_checkpoint, save_checkpoint
+
+FIELDS = ["entity_type","input","id","name","score"]
+
+def _ctx(v) -> dict:
+    return v if isinstance(v, dict) else json.loads(v or "{}")
+
+def normalize_chunk(pipe: NormalizationPipeline, rows: list[dict]) -> list[dict]:
+    # group by entity type so each group goes through one batched encode/search
+    groups = {}
+    for i, row in enumerate(rows):
+        groups.setdefault(row["entity_type"], []).append(i)
+    outs = [None] * len(rows)
+    for etype, idx in groups.items():
+        texts = [rows[i]["input"] for i in idx]
+        ctxs = [_ctx(rows[i].get("context")) for i in idx]
+        for i, out in zip(idx, pipe.normalize_batch(etype, texts, ctxs)):
+            outs[i] = out
+    return [{"entity_type": row["entity_type"], "input": row["input"],
+             "id": out.get("id"), "name": out.get("name"), "score": out.get("score", 0.0)}
+            for row, out in zip(rows, outs)]
+
+# one pipeline per worker process; bundles are mmap'd, so their pages are shared across workers
+_WORKER_PIPE = None
+
+def _init_worker():
+    global _WORKER_PIPE
+    _WORKER_PIPE = NormalizationPipeline()
+
+def _worker_chunk(rows):
+    return normalize_chunk(_WORKER_PIPE, rows)
+
+def _ordered_results(chunks, workers: int, max_inflight: int):
+    """Yield (n_rows, results) in input order; at most max_inflight chunks are read ahead (back-pressure)."""
+    if workers <= 0:
+        pipe = NormalizationPipeline()
+        for rows in chunks:
+            yield len(rows), normalize_chunk(pipe, rows)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = deque()
+        for rows in chunks:
+            pending.append((len(rows), pool.submit(_worker_chunk, rows)))
+            if len(pending) >= max_inflight:
+                n, fut = pending.popleft()
+                yield n, fut.result()
+        while pending:
+            n, fut = pending.popleft()
+            yield n, fut.result()
+
+def run(input=None, output=None, in_format=None, out_format=None, chunk_size=1024, workers=0,
+        max_inflight=None, checkpoint=None, checkpoint_every=1) -> int:
+    in_format = in_format or infer_format(input)
+    out_format = out_format or infer_format(output, default=in_format if in_format != "parquet" else "csv")
+    job = {"input": os.path.abspath(input) if input and input != "-" else "-", "output": output, "out_format": out_format}
+    state = load_checkpoint(checkpoint)
+    if state and {k: state.get(k) for k in job} != job:
+        raise SystemExit(f"checkpoint {checkpoint} belongs to a different run: {state}")
+    done = state["rows_done"] if state else 0
+    writer = RowWriter(output, out_format, FIELDS, resume_from=state)
+    # resume by seeking to the saved input offset (csv / jsonl) rather than re-reading `done` rows
+    offset = state.get("in_bytes") if state else None
+    reader = iter_chunks(input, in_format, chunk_size, skip=done, offset=offset)
+    positions, read_pos = deque(), {"in_bytes": offset} if offset is not None else {}
+
+    def chunks():
+        for rows, pos in reader:
+            positions.append(pos)  # chunks come back in input order, so the writer pops these in step
+            yield rows
+
+    try:
+        for i, (n, rows) in enumerate(_ordered_results(chunks(), workers, max_inflight or 2 * max(1, workers)), 1):
+            writer.write(rows)
+            done += n
+            read_pos = positions.popleft()
+            if checkpoint and i % checkpoint_every == 0:
+                save_checkpoint(checkpoint, {**job, "rows_done": done, **read_pos, **writer.sync()})
+        if checkpoint:
+            save_checkpoint(checkpoint, {**job, "rows_done": done, "complete": True, **read_pos, **writer.sync()})
+    finally:
+        writer.close()
+    return done
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--input", default="-", help="csv / jsonl / parquet file, '-' = stdin (csv or jsonl)")
+    ap.add_argument("--output", default="-", help="output file, '-' = stdout; a directory of part files for parquet")
+    ap.add_argument("--in_format", choices=FORMATS, default=None, help="default: from the input extension, else csv")
+    ap.add_argument("--out_format", choices=FORMATS, default=None, help="default: from the output extension, else input format")
+    ap.add_argument("--chunk_size", type=int, default=1024, help="rows per batched normalize call")
+    ap.add_argument("--workers", type=int, default=0, help="worker processes; 0 = normalize in this process")
+    ap.add_argument("--max_inflight", type=int, default=None, help="chunks read ahead of the writer (default 2*workers)")
+    ap.add_argument("--checkpoint", default=None, help="resume file; default <output>.ckpt when writing to a file")
+    ap.add_argument("--checkpoint_every", type=int, default=1, help="chunks between checkpoints")
+    args = ap.parse_args(argv)
+    checkpoint = args.checkpoint or (f"{args.output.rstrip('/')}.ckpt" if args.output != "-" else None)
+    run(args.input, args.output, args.in_format, args.out_format, args.chunk_size, args.workers,
+        args.max_inflight, checkpoint, args.checkpoint_every)
 
 if __name__ == "__main__":
-    pipe = NormalizationPipeline()
-    rdr = csv.DictReader(sys.stdin)
-    wtr = csv.DictWriter(sys.stdout, fieldnames=["entity_type","input","id","name","score"])
-    wtr.writeheader()
-    for row in rdr:
-        out = pipe.normalize(row["entity_type"], row["input"], json.loads(row.get("context","{}")))
-        wtr.writerow({"entity_type": row["entity_type"], "input": row["input"],
-                      "id": out.get("id"), "name": out.get("name"), "score": out.get("score", 0.0)})
+    main()
 
 
 ### Example usage:
-# cat inputs.csv | python -m src.cli.normalize > outputs.csv
\ No newline at end of file
+# cat inputs.csv | python -m src.cli.normalize --chunk_size 2048 > outputs.csv
+# python -m src.cli.normalize --input affiliations.parquet --output out.jsonl --workers 8 --chunk_size 4096
+# (re-run the same command after a crash: it resumes from out.jsonl.ckpt)
@@ -0,0 +1,149 @@
+# src/cli/streaming.py
+# Chunked readers / appendable writers for the normalize CLI: csv, jsonl and parquet (pyarrow),
+# plus the checkpoint file that makes a long run resumable.
+import csv, io, json, os, sys
+from itertools import islice
+from pathlib import Path
+
+FORMATS = ("csv", "jsonl", "parquet")
+
+def infer_format(path: str | None, default="csv") -> str:
+    if not path or path == "-":
+        return default
+    ext = Path(path).suffix.lower().lstrip(".")
+    return {"json": "jsonl", "ndjson": "jsonl", "pq": "parquet"}.get(ext, ext if ext in FORMATS else default)
+
+def _pyarrow():
+    try:
+        import pyarrow, pyarrow.parquet
+    except ImportError as e:
+        raise SystemExit("parquet input/output needs pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+def _counted_lines(f, pos: list):
+    """Decoded lines of a binary file, keeping pos[0] at the byte offset just past the last line handed out."""
+    for line in iter(f.readline, b""):
+        pos[0] += len(line)
+        yield line.decode("utf-8")
+
+def _advance(f, pos: list, offset: int):
+    if f.seekable():
+        f.seek(offset)
+    else:  # stdin: discard the bytes already processed without parsing them
+        while pos[0] < offset and (block := f.read(min(1 << 20, offset - pos[0]))):
+            pos[0] += len(block)
+    pos[0] = offset
+
+def iter_chunks(path: str | None, fmt: str, chunk_size: int, skip: int = 0, offset: int | None = None):
+    """
+    Yield (rows, position) with at most chunk_size row dicts per chunk. For csv / jsonl, position is
+    {"in_bytes": n}, the input offset just past the chunk; passing it back as `offset` resumes there
+    with one seek instead of re-parsing the rows before it. Parquet skips `skip` rows by whole
+    row groups (position is {}); csv / jsonl honour `skip` only when no offset is given.
+    """
+    if fmt == "parquet":
+        pf = _pyarrow().parquet.ParquetFile(path)
+        groups = []
+        for g in range(pf.num_row_groups):
+            n = pf.metadata.row_group(g).num_rows
+            if not groups and skip >= n:
+                skip -= n
+                continue
+            groups.append(g)
+        rows = (r for b in pf.iter_batches(batch_size=chunk_size, row_groups=groups) for r in b.to_pylist())
+        rows = islice(rows, skip, None)
+        while chunk := list(islice(rows, chunk_size)):
+            yield chunk, {}
+        return
+    f = sys.stdin.buffer if not path or path == "-" else open(path, "rb")
+    try:
+        pos = [0]
+        lines = _counted_lines(f, pos)
+        if fmt == "csv":
+            header = next(csv.reader(lines), None)
+            if header is None:
+                return
+            if offset:
+                _advance(f, pos, offset)
+            rows = csv.DictReader(lines, fieldnames=header)
+        else:
+            if offset:
+                _advance(f, pos, offset)
+            rows = (json.loads(line) for line in lines if line.strip())
+        if offset is None:
+            rows = islice(rows, skip, None)
+        while chunk := list(islice(rows, chunk_size)):
+            yield chunk, {"in_bytes": pos[0]}
+    finally:
+        if f is not sys.stdin.buffer:
+            f.close()
+
+def read_chunks(path: str | None, fmt: str, chunk_size: int, skip: int = 0, offset: int | None = None):
+    """Yield lists of row dicts, at most chunk_size each, after skipping the first `skip` rows (or `offset` bytes)."""
+    for chunk, _ in iter_chunks(path, fmt, chunk_size, skip, offset):
+        yield chunk
+
+class RowWriter:
+    """Appends row chunks to csv / jsonl (one file) or parquet (one part file per chunk in a directory)."""
+    def __init__(self, path: str | None, fmt: str, fields: list[str], resume_from: dict | None = None):
+        self.path, self.fmt, self.fields = path, fmt, fields
+        self.parts = (resume_from or {}).get("parts", 0)
+        if fmt == "parquet":
+            if not path or path == "-":
+                raise SystemExit("parquet output needs --output <dir>")
+            Path(path).mkdir(parents=True, exist_ok=True)
+            for p in Path(path).glob("part-*.parquet"):  # parts written after the last checkpoint
+                if int(p.stem.split("-")[1]) >= self.parts:
+                    p.unlink()
+            return
+        if not path or path == "-":
+            self.f = sys.stdout
+        elif resume_from:
+            self.f = open(path, "r+", newline="", encoding="utf-8")
+            self.f.truncate(resume_from["out_bytes"])  # drop rows written after the last checkpoint
+            self.f.seek(resume_from["out_bytes"])
+        else:
+            self.f = open(path, "w", newline="", encoding="utf-8")
+        self.csv = csv.DictWriter(self.f, fieldnames=fields) if fmt == "csv" else None
+        if self.csv and not resume_from:
+            self.csv.writeheader()
+
+    def write(self, rows: list[dict]):
+        if self.fmt == "parquet":
+            pa = _pyarrow()
+            table = pa.Table.from_pylist([{k: r.get(k) for k in self.fields} for r in rows])
+            pa.parquet.write_table(table, Path(self.path) / f"part-{self.parts:06d}.parquet")
+            self.parts += 1
+        elif self.csv:
+            self.csv.writerows(rows)
+        else:
+            self.f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in rows)
+
+    def sync(self) -> dict:
+        """Make everything written so far durable; returns the position to record in the checkpoint."""
+        if self.fmt == "parquet":
+            return {"parts": self.parts}
+        self.f.flush()
+        try:
+            os.fsync(self.f.fileno())
+        except (OSError, io.UnsupportedOperation):
+            pass  # pipes / stdout
+        return {"out_bytes": self.f.tell() if self.f.seekable() else None}
+
+    def close(self):
+        if self.fmt != "parquet" and self.f is not sys.stdout:
+            self.f.close()
+
+def load_checkpoint(path: str | None) -> dict | None:
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return None
+
+def save_checkpoint(path: str, state: dict):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
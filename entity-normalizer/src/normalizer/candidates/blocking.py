@@ -0,0 +1,78 @@
+# src/normalizer/candidates/blocking.py
+# Inverted blocking index over catalog names: only names sharing enough keys with the query
+# are handed to the fuzzy scorer, instead of the whole catalog.
+import numpy as np
+from rapidfuzz import process, fuzz
+from ..text.normalize import basic_clean
+
+KEY_TYPES = ("ngram", "prefix", "phonetic")
+
+_SOUNDEX = {c: d for d, letters in enumerate(("aeiouyhw", "bfpv", "cgjkqsxz", "dt", "l", "mn", "r")) for c in letters}
+
+def soundex(token: str) -> str:
+    token = "".join(c for c in token.lower() if c.isalpha())
+    if not token:
+        return ""
+    out, last = token[0], _SOUNDEX.get(token[0], 0)
+    for c in token[1:]:
+        d = _SOUNDEX.get(c, 0)
+        if d and d != last:
+            out += str(d)
+        if c not in "hw":
+            last = d
+        if len(out) == 4:
+            break
+    return out.ljust(4, "0")
+
+def block_keys(name: str, key_types=("ngram", "prefix"), ngram: int = 3, prefix_len: int = 4) -> set[str]:
+    s = basic_clean(name)
+    keys = set()
+    if "ngram" in key_types:
+        padded = f" {s} "
+        keys.update("g:" + padded[i:i + ngram] for i in range(len(padded) - ngram + 1))
+    toks = s.split()
+    if "prefix" in key_types:
+        keys.update("p:" + t[:prefix_len] for t in toks)
+    if "phonetic" in key_types:
+        keys.update("s:" + soundex(t) for t in toks if soundex(t))
+    return keys
+
+class BlockingIndex:
+    def __init__(self, names: list[str], key_types=("ngram", "prefix"), ngram: int = 3, prefix_len: int = 4,
+                 max_df: float = 0.2, max_candidates: int = 1000):
+        unknown = set(key_types) - set(KEY_TYPES)
+        if unknown:
+            raise ValueError(f"unknown blocking key types {sorted(unknown)}; expected {KEY_TYPES}")
+        self.names = names
+        self.key_args = {"key_types": tuple(key_types), "ngram": ngram, "prefix_len": prefix_len}
+        self.max_candidates = max_candidates
+        postings = {}
+        for i, name in enumerate(names):
+            for k in block_keys(name, **self.key_args):
+                postings.setdefault(k, []).append(i)
+        # keys present in more than max_df of the catalog ("uni", "of ") block nothing; drop them
+        cap = max(1, int(max_df * len(names)))
+        self.postings = {k: np.asarray(v, dtype=np.int32) for k, v in postings.items() if len(v) <= cap}
+
+    def candidates(self, query: str, limit: int | None = None) -> np.ndarray:
+        """Catalog row ids ranked by number of shared keys (at most `limit`)."""
+        limit = limit or self.max_candidates
+        lists = [self.postings[k] for k in block_keys(query, **self.key_args) if k in self.postings]
+        if not lists:
+            return np.empty(0, dtype=np.int32)
+        ids, counts = np.unique(np.concatenate(lists), return_counts=True)
+        if len(ids) > limit:
+            top = np.argpartition(-counts, limit - 1)[:limit]
+            ids, counts = ids[top], counts[top]
+        return ids[np.argsort(-counts, kind="stable")]
+
+    def fuzzy_topk_ids(self, queries: list[str], k: int = 20) -> list[tuple[np.ndarray, np.ndarray]]:
+        out = []
+        for q in queries:
+            ids = self.candidates(q)
+            hits = process.extract(q, [self.names[i] for i in ids], limit=k, scorer=fuzz.token_sort_ratio)
+            out.append((ids[[h[2] for h in hits]].astype(np.int64), np.array([h[1] for h in hits], np.float32)))
+        return out
+
+    def fuzzy_topk(self, queries: list[str], k: int = 20) -> list[list[tuple[str, float]]]:
+        return [[(self.names[i], float(s)) for i, s in zip(ids, sc)] for ids, sc in self.fuzzy_topk_ids(queries, k)]
@@ -0,0 +1,30 @@
+# src/normalizer/candidates/encoder.py
+# Process-wide, reference-counted SentenceTransformer instances: every FaissSearcher that asks
+# for the same (model, device) shares one copy of the weights.
+import threading
+
+_LOCK = threading.Lock()
+_MODELS: dict[tuple[str, str | None], list] = {}  # (model_name, device) -> [model, refcount]
+
+def acquire_encoder(model_name: str, device: str | None = None):
+    key = (model_name, device)
+    with _LOCK:
+        if key not in _MODELS:
+            from sentence_transformers import SentenceTransformer  # heavy import, deferred to first use
+            _MODELS[key] = [SentenceTransformer(model_name, device=device), 0]
+        _MODELS[key][1] += 1
+        return _MODELS[key][0]
+
+def release_encoder(model_name: str, device: str | None = None):
+    key = (model_name, device)
+    with _LOCK:
+        entry = _MODELS.get(key)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del _MODELS[key]
+
+def loaded_encoders() -> dict[tuple[str, str | None], int]:
+    with _LOCK:
+        return {k: v[1] for k, v in _MODELS.items()}
@@ -1,22 +1,86 @@
 # src/normalizer/candidates/faiss_index.py
+import logging
 import faiss, numpy as np
-from sentence_transformers import SentenceTransformer
+from .encoder import acquire_encoder, release_encoder
+from .index_bundle import current_version, id_labels, load_bundle, load_vectors, model_fingerprint
+from .index_factory import apply_search_params
+from .quantized import exact_rerank, search_codes
+
+log = logging.getLogger(__name__)
 
 class FaissSearcher:
-    def __init__(self, names, model_name, index_path=None, normalize=True):
+    def __init__(self, names, model_name, index_path=None, normalize=True, batch_size=64, catalog_version=None,
+                 search_params: dict | None = None, device: str | None = None, ids=None):
         self.names = names
-        self.model = SentenceTransformer(model_name)
+        self.ids = ids
+        self._labels = self._label_pos = None
+        self.model_name, self.device = model_name, device
+        self.model = acquire_encoder(model_name, device)
+        self._released = False
         self.normalize = normalize
-        if index_path and Path(index_path).exists():
-            self.index = faiss.read_index(str(index_path))
-            self.embeds = np.load(str(Path(index_path).with_suffix(".ids.npy")))
-        else:
-            X = self.model.encode(names, normalize_embeddings=True)
+        self.batch_size = batch_size
+        self.search_params = search_params or {}
+        self.rerank_factor = self.search_params.get("rerank_factor", 4)
+        self.vectors = None  # on-disk float matrix for the exact rerank, if the bundle has one
+        self.fingerprint = model_fingerprint(model_name, self.model.get_sentence_embedding_dimension(), normalize)
+        self.meta = None
+        if not (index_path and current_version(index_path) and self._load(index_path, catalog_version)):
+            X = self.encode(names)
             self.index = faiss.IndexFlatIP(X.shape[1])
-            self.index.add(X)
-            self.embeds = X  # keep in memory for serialization
+            self.index.add(X)  # the index holds the only in-memory copy of the vectors
+
+    def _load(self, index_path, catalog_version) -> bool:
+        index, names, meta = load_bundle(index_path)
+        stale = [k for k, ok in (("model", meta.get("model_fingerprint") == self.fingerprint),
+                                 ("catalog", catalog_version is None or meta.get("catalog_checksum") == catalog_version),
+                                 ("size", len(names) == len(self.names) and index.ntotal == len(self.names)),
+                                 ("ids", not meta.get("id_map") or self.ids is not None))
+                 if not ok]
+        if stale:
+            log.warning("index bundle %s/%s is stale (%s); re-encoding catalog", index_path, meta.get("version"), ", ".join(stale))
+            return False
+        if meta.get("id_map"):
+            # FAISS returns id labels; translate them back to catalog row positions
+            labels = id_labels(self.ids)
+            order = np.argsort(labels, kind="stable")
+            self._labels, self._label_pos = labels[order], order
+        knobs = {k: v for k, v in self.search_params.items() if k in ("ef_search", "nprobe")}
+        self.index, self.meta = apply_search_params(index, **knobs), meta
+        self.vectors = load_vectors(index_path, meta["version"])
+        return True
+
+    def close(self):
+        # drop our registry reference only; a batch still running on this searcher keeps self.model
+        if not self._released:
+            release_encoder(self.model_name, self.device)
+            self._released = True
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        X = self.model.encode(texts, batch_size=self.batch_size, normalize_embeddings=self.normalize,
+                              convert_to_numpy=True, show_progress_bar=False)
+        return np.ascontiguousarray(X, dtype="float32")
 
     def search(self, query: str, k=50):
-        q = self.model.encode([query], normalize_embeddings=True)
-        D, I = self.index.search(q, k)
-        return [(int(i), float(s)) for i, s in zip(I[0], D[0])]
+        return self.search_batch([query], k=k)[0]
+
+    def search_arrays(self, queries: list[str], k=50) -> tuple[np.ndarray, np.ndarray]:
+        # one forward pass + one index.search over the whole query matrix; I is -1 padded
+        return self.search_vectors(self.encode(queries), k)
+
+    def search_vectors(self, q: np.ndarray, k=50) -> tuple[np.ndarray, np.ndarray]:
+        k = min(k, self.index.ntotal)
+        # quantized bundles: over-fetch candidates, then rescore them exactly from the float matrix
+        kq = min(k * self.rerank_factor, self.index.ntotal) if self.vectors is not None else k
+        D, I = search_codes(self.index, q, kq)
+        if self._labels is not None:
+            j = np.searchsorted(self._labels, I).clip(max=len(self._labels) - 1)
+            I = np.where((I >= 0) & (self._labels[j] == I), self._label_pos[j], -1)
+        if self.vectors is not None:
+            D, I = exact_rerank(self.vectors, q, I, k)
+        return D, I
+
+    def search_batch(self, queries: list[str], k=50) -> list[list[tuple[int, float]]]:
+        if not queries:
+            return []
+        D, I = self.search_arrays(queries, k)
+        return [[(int(i), float(s)) for i, s in zip(row_i, row_d) if i >= 0] for row_i, row_d in zip(I, D)]
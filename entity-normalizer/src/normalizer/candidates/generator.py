@@ -1,16 +1,82 @@
 # src/normalizer/candidates/generator.py
+import numpy as np
 from rapidfuzz import process, fuzz
+from .blocking import BlockingIndex
+from .faiss_index import FaissSearcher
+from ..profiling import NULL_TIMER
+
+# upper bound on queries x names score cells held at once by cdist (float32 -> ~64MB)
+CDIST_MAX_CELLS = 16_000_000
 
 def gen_fuzzy(name: str, names: list[str], k=20):
     return process.extract(name, names, limit=k, scorer=fuzz.token_sort_ratio)
 
-def gen_candidates(name: str, names: list[str], faiss_searcher: FaissSearcher, k_embed=50, k_fuzzy=20):
-    fuzzy = gen_fuzzy(name, names, k=k_fuzzy)  # [(candidate, score0..100), ...]
-    embed = [(names[i], s) for i, s in faiss_searcher.search(name, k=k_embed)]
+def fuzzy_topk_ids(queries: list[str], names: list[str], k=20) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Top-k fuzzy (row ids, scores 0..100) for every query, scored with one cdist call per block of queries."""
+    if not queries or not names:
+        return [(np.empty(0, np.int64), np.empty(0, np.float32)) for _ in queries]
+    k = min(k, len(names))
+    step = max(1, CDIST_MAX_CELLS // len(names))
+    out = []
+    for start in range(0, len(queries), step):
+        S = process.cdist(queries[start:start + step], names, scorer=fuzz.token_sort_ratio,
+                          dtype=np.float32, workers=-1)
+        top = np.argpartition(-S, k - 1, axis=1)[:, :k]
+        for row, idx in zip(S, top):
+            idx = idx[np.argsort(-row[idx], kind="stable")]
+            out.append((idx.astype(np.int64), row[idx]))
+    return out
+
+def gen_fuzzy_batch(queries: list[str], names: list[str], k=20) -> list[list[tuple[str, float]]]:
+    return [[(names[i], float(s)) for i, s in zip(ids, sc)] for ids, sc in fuzzy_topk_ids(queries, names, k)]
+
+def _merge(fuzzy, embed):
     # de-duplicate by best score
     bag = {}
-    for cand, s in fuzzy:
+    for cand, s, *_ in fuzzy:
         bag[cand] = max(bag.get(cand, 0), 0.5 * (s/100))
     for cand, s in embed:
         bag[cand] = max(bag.get(cand, 0), bag.get(cand, 0) + 0.5 * s)
     return sorted(bag.items(), key=lambda x: x[1], reverse=True)
+
+def gen_candidates(name: str, names: list[str], faiss_searcher: FaissSearcher, k_embed=50, k_fuzzy=20):
+    fuzzy = gen_fuzzy(name, names, k=k_fuzzy)  # [(candidate, score0..100), ...]
+    embed = [(names[i], s) for i, s in faiss_searcher.search(name, k=k_embed)]
+    return _merge(fuzzy, embed)
+
+def gen_candidates_batch(queries: list[str], names: list[str], faiss_searcher: FaissSearcher, k_embed=50, k_fuzzy=20,
+                         blocker: BlockingIndex | None = None):
+    # with a blocker, fuzzy scoring only sees the blocked candidate set; without one it scans every name
+    fuzzy = blocker.fuzzy_topk(queries, k=k_fuzzy) if blocker else gen_fuzzy_batch(queries, names, k=k_fuzzy)
+    embed = faiss_searcher.search_batch(queries, k=k_embed)
+    return [_merge(f, [(names[i], s) for i, s in e]) for f, e in zip(fuzzy, embed)]
+
+def merge_candidate_ids(f_ids: np.ndarray, f_scores: np.ndarray, e_ids: np.ndarray, e_scores: np.ndarray, limit=50):
+    """Array form of _merge keyed by row id: mix = 0.5*fuzzy/100 + max(0, 0.5*embed), best `limit` first."""
+    uniq, inv = np.unique(np.concatenate([f_ids, e_ids]).astype(np.int64), return_inverse=True)
+    f = np.zeros(len(uniq), np.float32)
+    np.maximum.at(f, inv[:len(f_ids)], 0.5 * np.asarray(f_scores, np.float32) / 100)
+    e = np.zeros(len(uniq), np.float32)
+    np.maximum.at(e, inv[len(f_ids):], 0.5 * np.asarray(e_scores, np.float32))
+    mix = f + e
+    order = np.argsort(-mix, kind="stable")[:limit]
+    return uniq[order], mix[order]
+
+def gen_candidate_ids_batch(queries: list[str], names: list[str], faiss_searcher: FaissSearcher, k_embed=50, k_fuzzy=20,
+                            blocker: BlockingIndex | None = None, limit=50, timer=NULL_TIMER) -> tuple[np.ndarray, np.ndarray]:
+    """Candidate block for a query batch: (row ids, mix scores), both (n_queries, limit), ids -1 padded."""
+    ids = np.full((len(queries), limit), -1, np.int64)
+    mix = np.zeros((len(queries), limit), np.float32)
+    if not queries:
+        return ids, mix
+    with timer.stage("fuzzy"):
+        fuzzy = blocker.fuzzy_topk_ids(queries, k=k_fuzzy) if blocker else fuzzy_topk_ids(queries, names, k=k_fuzzy)
+    with timer.stage("encode"):
+        q = faiss_searcher.encode(queries)
+    with timer.stage("faiss"):
+        D, I = faiss_searcher.search_vectors(q, k=k_embed)
+    for r, ((f_ids, f_sc), e_ids, e_sc) in enumerate(zip(fuzzy, I, D)):
+        keep = e_ids >= 0
+        u, m = merge_candidate_ids(f_ids, f_sc, e_ids[keep], e_sc[keep], limit)
+        ids[r, :len(u)], mix[r, :len(u)] = u, m
+    return ids, mix
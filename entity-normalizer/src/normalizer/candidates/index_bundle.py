@@ -0,0 +1,82 @@
+# src/normalizer/candidates/index_bundle.py
+# Versioned on-disk index bundles:
+#   <root>/CURRENT            -> name of the live version dir, e.g. "v0003"
+#   <root>/v0003/index.faiss  FAISS index over the catalog names
+#   <root>/v0003/names.npy    name array aligned with index ids
+#   <root>/v0003/meta.json    model fingerprint, catalog checksum, index params
+#   <root>/v0003/vectors.npy  float32 catalog vectors aligned with names.npy, memory-mapped for
+#                             the exact rerank behind quantized (sq8 / binary) indexes; optional
+#   <root>/v0003/ids.npy      catalog ids aligned with names.npy (ID-mapped bundles only; FAISS
+#                             labels are id_labels(ids), so rows are found by id, not position)
+import hashlib, json, os, shutil, time
+from pathlib import Path
+import faiss, numpy as np
+
+# MMAP_IFC (zero-copy mmap of the whole file) where faiss has it; combining it with the older
+# IO_FLAG_MMAP breaks IVF indexes ("mmap only supported for File objects")
+MMAP_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+def model_fingerprint(model_name: str, dim: int, normalize: bool = True) -> str:
+    return hashlib.sha1(f"{model_name}|{dim}|{int(normalize)}".encode()).hexdigest()[:16]
+
+def id_labels(ids) -> np.ndarray:
+    """Stable int64 FAISS labels for catalog ids: a row keeps its vector across catalog edits."""
+    return np.fromiter((int.from_bytes(hashlib.blake2b(str(i).encode(), digest_size=8).digest(), "little") >> 1
+                        for i in ids), dtype="int64", count=len(ids))
+
+def current_version(root) -> str | None:
+    p = Path(root) / "CURRENT"
+    return p.read_text().strip() if p.exists() else None
+
+def _next_version(root: Path) -> str:
+    nums = [int(p.name[1:]) for p in root.glob("v[0-9]*") if p.name[1:].isdigit()]
+    return f"v{max(nums, default=0) + 1:04d}"
+
+def write_bundle(root, index, names: list[str], meta: dict, ids=None, vectors: np.ndarray | None = None) -> str:
+    """Write a new version next to the live one, then flip CURRENT atomically."""
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    version = _next_version(root)
+    tmp = root / f".{version}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+    binary = isinstance(index, faiss.IndexBinary)
+    (faiss.write_index_binary if binary else faiss.write_index)(index, str(tmp / "index.faiss"))
+    np.save(tmp / "names.npy", np.asarray(names, dtype=str))
+    if ids is not None:
+        np.save(tmp / "ids.npy", np.asarray([str(i) for i in ids], dtype=str))
+    if vectors is not None:
+        np.save(tmp / "vectors.npy", np.asarray(vectors, dtype="float32"))
+    meta = {**meta, "id_map": ids is not None, "binary": binary, "float_vectors": vectors is not None, "version": version, "n": len(names), "dim": index.d, "created_at": int(time.time())}
+    (tmp / "meta.json").write_text(json.dumps(meta, indent=2))
+    tmp.rename(root / version)
+    ptr = root / ".CURRENT.tmp"
+    ptr.write_text(version)
+    os.replace(ptr, root / "CURRENT")
+    return version
+
+def read_meta(root, version: str | None = None) -> dict | None:
+    version = version or current_version(root)
+    if not version:
+        return None
+    return json.loads((Path(root) / version / "meta.json").read_text())
+
+def load_bundle(root, version: str | None = None, mmap: bool = True):
+    """Return (index, names, meta); with mmap the index and names pages are shared between processes."""
+    version = version or current_version(root)
+    d = Path(root) / version
+    meta = json.loads((d / "meta.json").read_text())
+    read = faiss.read_index_binary if meta.get("binary") else faiss.read_index
+    index = read(str(d / "index.faiss"), MMAP_FLAGS if mmap else 0)
+    names = np.load(d / "names.npy", mmap_mode="r" if mmap else None)
+    return index, names, meta
+
+def load_ids(root, version: str | None = None) -> list[str] | None:
+    """Catalog ids of an ID-mapped bundle, aligned with its names; None for positional bundles."""
+    p = Path(root) / (version or current_version(root)) / "ids.npy"
+    return np.load(p).tolist() if p.exists() else None
+
+def load_vectors(root, version: str | None = None, mmap: bool = True) -> np.ndarray | None:
+    """The bundle's float32 vector matrix (memory-mapped by default), or None if it was not stored."""
+    p = Path(root) / (version or current_version(root)) / "vectors.npy"
+    return np.load(p, mmap_mode="r" if mmap else None) if p.exists() else None
@@ -0,0 +1,83 @@
+# src/normalizer/candidates/index_factory.py
+# Index types selectable in build_index.py. All use inner product over normalized vectors,
+# except binary (Hamming over sign bits; see quantized.py).
+import math
+import faiss, numpy as np
+from .quantized import pack_bits
+
+INDEX_TYPES = ("flat", "hnsw", "ivfpq", "sq8", "binary")
+
+def build_faiss_index(X: np.ndarray, index_type: str = "flat", hnsw_m: int = 32, ef_construction: int = 200,
+                      nlist: int | None = None, pq_m: int | None = None, pq_nbits: int = 8,
+                      train_size: int = 100_000, seed: int = 0, ids: np.ndarray | None = None):
+    """
+    Build and fill an index over X; returns (index, params) where params are recorded in the bundle meta.
+    With ids (int64 labels) the index is ID-mapped so later deltas can add_with_ids / remove_ids.
+    """
+    n, d = X.shape
+    if index_type == "flat":
+        index = faiss.IndexFlatIP(d)
+        params = {}
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(d, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = ef_construction
+        params = {"hnsw_m": hnsw_m, "ef_construction": ef_construction}
+    elif index_type == "ivfpq":
+        # faiss wants ~39 training points per centroid; sqrt(n)*4 is the usual starting nlist
+        nlist = nlist or max(1, min(int(4 * math.sqrt(n)), n // 39))
+        pq_m = pq_m or next(m for m in (48, 32, 24, 16, 12, 8, 4, 2, 1) if d % m == 0)
+        if d % pq_m:
+            raise ValueError(f"pq_m={pq_m} must divide the embedding dim {d}")
+        if n < max(nlist, 2 ** pq_nbits):
+            raise ValueError(f"ivfpq needs at least {max(nlist, 2 ** pq_nbits)} vectors to train, catalog has {n}; use flat")
+        quantizer = faiss.IndexFlatIP(d)
+        index = faiss.IndexIVFPQ(quantizer, d, nlist, pq_m, pq_nbits, faiss.METRIC_INNER_PRODUCT)
+        sample = X
+        if n > train_size:
+            sample = X[np.random.default_rng(seed).choice(n, train_size, replace=False)]
+        index.train(sample)
+        params = {"nlist": nlist, "pq_m": pq_m, "pq_nbits": pq_nbits, "train_size": len(sample), "seed": seed}
+    elif index_type == "sq8":
+        index = faiss.IndexScalarQuantizer(d, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+        sample = X
+        if n > train_size:
+            sample = X[np.random.default_rng(seed).choice(n, train_size, replace=False)]
+        index.train(sample)  # per-dimension min/max
+        params = {"train_size": len(sample), "seed": seed}
+    elif index_type == "binary":
+        if d % 8:
+            raise ValueError(f"binary index needs an embedding dim divisible by 8, got {d}")
+        index = faiss.IndexBinaryFlat(d)
+        X = pack_bits(X)
+        params = {}
+    else:
+        raise ValueError(f"unknown index_type {index_type!r}; expected one of {INDEX_TYPES}")
+    if ids is None:
+        index.add(X)
+    else:
+        if index_type == "binary":
+            index = faiss.IndexBinaryIDMap2(index)
+        elif index_type != "ivfpq":
+            index = faiss.IndexIDMap2(index)  # ivf inverted lists store labels natively
+        index.add_with_ids(X, np.asarray(ids, dtype="int64"))
+    return index, params
+
+def unwrap_index(index):
+    """The ANN index under an IndexIDMap/IndexIDMap2 wrapper (or the index itself)."""
+    if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+        return faiss.downcast_index(index.index)
+    return index
+
+def apply_search_params(index, ef_search: int | None = None, nprobe: int | None = None):
+    """Set query-time knobs (configs/app.yaml `search:`) on whichever index type was loaded."""
+    if isinstance(index, faiss.IndexBinary):
+        return index  # no query-time knobs
+    inner = unwrap_index(index)
+    if ef_search and isinstance(inner, faiss.IndexHNSW):
+        inner.hnsw.efSearch = ef_search
+    if nprobe:
+        try:
+            faiss.extract_index_ivf(inner).nprobe = nprobe
+        except RuntimeError:
+            pass  # not an IVF index
+    return index
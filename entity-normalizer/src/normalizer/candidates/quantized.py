@@ -0,0 +1,35 @@
+# src/normalizer/candidates/quantized.py
+# Quantized candidate search + exact float rerank.
+#   sq8:    8-bit scalar quantized codes, 4x smaller than float32
+#   binary: sign bits searched by Hamming distance, 32x smaller
+# The float32 vectors stay on disk (vectors.npy in the bundle, memory-mapped); only the rows of
+# the top k * rerank_factor candidates are read back to compute exact inner products.
+import faiss, numpy as np
+
+QUANTIZED = ("sq8", "binary")
+PAD_SCORE = -np.finfo(np.float32).max  # what faiss reports for -1 (missing) results under inner product
+
+def pack_bits(X: np.ndarray) -> np.ndarray:
+    return np.packbits(X > 0, axis=1)
+
+def search_codes(index, q: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """index.search for float or binary indexes; Hamming distances are mapped to a [-1, 1] similarity."""
+    if isinstance(index, faiss.IndexBinary):
+        D, I = index.search(pack_bits(q), k)
+        return (1.0 - 2.0 * D / index.d).astype("float32"), I
+    return index.search(q, k)
+
+def exact_rerank(vectors: np.ndarray, q: np.ndarray, I: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Rescore candidate rows I (-1 padded) with exact q . v from the float matrix; keep the best k."""
+    rows, inv = np.unique(np.where(I >= 0, I, 0), return_inverse=True)  # sorted reads from the memmap
+    V = np.asarray(vectors[rows], dtype="float32")[inv.reshape(I.shape)]
+    S = np.einsum("qkd,qd->qk", V, q)
+    S[I < 0] = PAD_SCORE
+    top = np.argsort(-S, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(S, top, 1), np.take_along_axis(I, top, 1)
+
+def index_nbytes(index) -> int:
+    """In-memory size of an index, measured as its serialized size."""
+    if isinstance(index, faiss.IndexBinary):
+        return int(faiss.serialize_index_binary(index).nbytes)
+    return int(faiss.serialize_index(index).nbytes)
@@ -1,26 +1,130 @@
 # src/normalizer/entity_types/base.py
+import hashlib, json, os
+from ..candidates.blocking import BlockingIndex
 from ..candidates.faiss_index import FaissSearcher
-from ..candidates.generator import gen_candidates
-from ..ranking.context_features import ctx_score
-from ..ranking.reranker import final_score
-from ..stores.catalog import Catalog
+from ..candidates.index_bundle import current_version, read_meta
+from ..candidates.generator import gen_candidate_ids_batch
+from ..ranking.context_features import ctx_matrix
+from ..ranking.reranker import rerank_batch
+from ..rules.alias_store import get_alias_store
+from ..profiling import NULL_TIMER
+from ..stores.cache import clean_cache_key, get_cache
+from ..stores.catalog import Catalog, file_checksum
+from ..text.normalize import basic_clean, clean_batch
 from ..config import CFG
 
+def _stat_sig(path) -> tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
 class BaseNormalizer:
     def __init__(self, entity: str, catalog_path: str):
         self.entity = entity
+        self.catalog_path, self.index_path = catalog_path, CFG.index_paths.get(entity)
+        self._catalog_sig = _stat_sig(catalog_path)
         self.catalog = Catalog(catalog_path)
-        self.searcher = FaissSearcher(self.catalog.names, CFG.model_name)
+        self.searcher = FaissSearcher(self.catalog.names, CFG.model_name, index_path=self.index_path,
+                                      catalog_version=self.catalog.version, search_params=CFG.search, device=CFG.device,
+                                      ids=self.catalog.cols.get(self.catalog.id_col))
+        b = CFG.blocking
+        self.blocker = None
+        if b.get("enabled") and not b.get("full_scan"):
+            self.blocker = BlockingIndex(self.catalog.names, **{k: v for k, v in b.items() if k not in ("enabled", "full_scan")})
+        w_version = hashlib.sha1(json.dumps(CFG.weights[entity], sort_keys=True).encode()).hexdigest()[:16]
+        i_version = (self.searcher.meta or {}).get("version", "mem")
+        self.aliases = get_alias_store()
+        self.version = f"{self.catalog.version}:{w_version}:{i_version}:{self.aliases.version}"
+        self.cache = get_cache(CFG.cache)
+        self.timer = NULL_TIMER
+        if self.cache:
+            self.cache.invalidate(entity, self.version)
+
+    def close(self):
+        self.searcher.close()
+
+    def is_stale(self) -> bool:
+        """
+        True once the catalog file and/or its index bundle moved on and are consistent with each
+        other again (an ingest halfway between writing the bundle and the catalog is not picked up).
+        """
+        loaded_index = (self.searcher.meta or {}).get("version")
+        live_index = current_version(self.index_path) if self.index_path else None
+        if _stat_sig(self.catalog_path) == self._catalog_sig and live_index == loaded_index:
+            return False
+        checksum = file_checksum(self.catalog_path)[:16]
+        if live_index:
+            return read_meta(self.index_path, live_index).get("catalog_checksum") == checksum
+        return checksum != self.catalog.version
 
     def normalize(self, text: str, user_ctx: dict | None = None):
-        user_ctx = user_ctx or {}
+        return self.normalize_batch([text], [user_ctx])[0]
+
+    def alias_hit(self, text: str, cleaned: str | None = None) -> dict | None:
+        # exact-alias fast path: no fuzzy, embedding or rerank work
+        canonical = self.aliases.lookup_clean(self.entity, basic_clean(text) if cleaned is None else cleaned)
+        row = self.catalog.row_by_name(canonical) if canonical else None
+        return None if row is None else {"name": canonical, "id": row.get(self.catalog.id_col), "score": 1.0, "row": row}
+
+    def normalize_batch(self, texts: list[str], user_ctxs: list[dict | None] | None = None, top_k: int = 0) -> list[dict]:
+        """
+        Normalize a batch of strings. With top_k > 0 every result also carries its ranked
+        "candidates" [(id, name, score), ...]; those requests bypass the result cache.
+        """
+        user_ctxs = [c or {} for c in (user_ctxs or [None] * len(texts))]
+        with self.timer.stage("clean"):
+            cleaned = clean_batch(texts)
+        with self.timer.stage("alias"):
+            outs = [self.alias_hit(t, c) for t, c in zip(texts, cleaned)]
+        if top_k:
+            for o in outs:
+                if o is not None:
+                    o["candidates"] = [(o["id"], o["name"], 1.0)]
+        rest = [i for i, o in enumerate(outs) if o is None]
+        if rest:
+            sub = ([texts[i] for i in rest], [cleaned[i] for i in rest], [user_ctxs[i] for i in rest])
+            res = self._normalize_uncached(sub[0], sub[2], top_k) if top_k else self._normalize_cached(*sub)
+            for i, out in zip(rest, res):
+                outs[i] = out
+        return outs
+
+    def _normalize_cached(self, texts: list[str], cleaned: list[str], user_ctxs: list[dict]) -> list[dict]:
+        if not self.cache:
+            return self._normalize_uncached(texts, user_ctxs)
+        with self.timer.stage("cache"):
+            keys = [clean_cache_key(self.entity, c, ctx, self.version) for c, ctx in zip(cleaned, user_ctxs)]
+            found = self.cache.get_many(keys)
+        # each distinct missing key is computed once, even if repeated inside the batch
+        todo = {k: i for i, k in reversed(list(enumerate(keys))) if k not in found}
+        if todo:
+            idx = list(todo.values())
+            outs = self._normalize_uncached([texts[i] for i in idx], [user_ctxs[i] for i in idx])
+            with self.timer.stage("cache"):
+                for k, out in zip(todo, outs):
+                    out = {**out, "row": dict(out["row"])} if out.get("row") is not None else out
+                    found[k] = out
+                    self.cache.put(k, out, self.entity, self.version)
+        return [found[k] for k in keys]
+
+    def _normalize_uncached(self, texts: list[str], user_ctxs: list[dict], top_k: int = 0) -> list[dict]:
         w = CFG.weights[self.entity]
-        cands = gen_candidates(text, self.catalog.names, self.searcher)
-        best = None
-        for cand_name, embed_mix in cands[:50]:
-            row = self.catalog.row_by_name(cand_name)
-            ctxs = ctx_score(self.entity, user_ctx, row)
-            score = final_score(text, cand_name, embed_mix, ctxs, w)
-            if not best or score > best["score"]:
-                best = {"name": cand_name, "id": row.get("id"), "score": score, "row": row}
-        return best if best and best["score"] >= w["threshold"] else {"name": None, "id": None, "score": best["score"] if best else 0.0}
+        with self.timer.stage("alias"):
+            texts = [self.aliases.expand(self.entity, t) for t in texts]  # aliases embedded in longer strings
+        ids, mix = gen_candidate_ids_batch(texts, self.catalog.names, self.searcher, blocker=self.blocker, timer=self.timer)
+        with self.timer.stage("rerank"):
+            ctx = ctx_matrix(self.entity, user_ctxs, self.catalog.cols, ids)
+            top_ids, top_scores = rerank_batch(texts, ids, mix, ctx, self.catalog.cols[self.catalog.name_col], w, k=max(1, top_k))
+        with self.timer.stage("catalog"):
+            outs = [self._result(int(i), float(s), w) for i, s in zip(top_ids[:, 0], top_scores[:, 0])]
+            if top_k:
+                for out, r_ids, r_scores in zip(outs, top_ids, top_scores):
+                    out["candidates"] = [(self.catalog.row(i)[self.catalog.id_col], self.catalog.names[i], float(s))
+                                         for i, s in zip(r_ids, r_scores) if i >= 0]
+        return outs
+
+    def _result(self, i: int, score: float, w: dict) -> dict:
+        if i < 0:
+            return {"name": None, "id": None, "score": 0.0}
+        if score < w["threshold"]:
+            return {"name": None, "id": None, "score": score}
+        row = self.catalog.row(i)
+        return {"name": self.catalog.names[i], "id": row.get(self.catalog.id_col), "score": score, "row": row}
@@ -0,0 +1,5 @@
+# src/normalizer/entity_types/countries.py
+from .base import BaseNormalizer
+class CountryNormalizer(BaseNormalizer):
+    def __init__(self, catalog_path="data/catalogs/countries.csv"):
+        super().__init__("countries", catalog_path)
@@ -0,0 +1,5 @@
+# src/normalizer/entity_types/funders.py
+from .base import BaseNormalizer
+class FunderNormalizer(BaseNormalizer):
+    def __init__(self, catalog_path="data/catalogs/funders.csv"):
+        super().__init__("funders", catalog_path)
@@ -0,0 +1,5 @@
+# src/normalizer/entity_types/organizations.py
+from .base import BaseNormalizer
+class OrganizationNormalizer(BaseNormalizer):
+    def __init__(self, catalog_path="data/catalogs/orgs.csv"):
+        super().__init__("organizations", catalog_path)
@@ -0,0 +1,5 @@
+# src/normalizer/entity_types/topics.py
+from .base import BaseNormalizer
+class TopicNormalizer(BaseNormalizer):
+    def __init__(self, catalog_path="data/catalogs/topics.csv"):
+        super().__init__("topics", catalog_path)
@@ -1,19 +1,172 @@
 # src/normalizer/eval/evaluate.py
 # Expect data/eval/labeled_pairs.csv: input_name,entity_type,gold_id,context(json)
-import json, pandas as pd
-from ..pipeline import NormalizationPipeline
+#   python -m src.normalizer.eval.evaluate --mode batched --out data/eval/report.json
+#   python -m src.normalizer.eval.evaluate --mode multiprocess --workers 4 --baseline data/eval/report_main.json
+import argparse, json, os, sys, time
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from ..config import CFG
+from ..pipeline import NormalizationPipeline, entity_name
+from ..profiling import NULL_TIMER, StageTimer
+from .metrics import gold_rank, latency_percentiles, recall_at_k, top1_accuracy
 
-def run_eval():
-    df = pd.read_csv("data/eval/labeled_pairs.csv")
+MODES = ("single", "batched", "multiprocess")
+KS = (1, 5, 10)
+
+def _ctx(v) -> dict:
+    return json.loads(v) if isinstance(v, str) and v.strip() else {}
+
+def _make_pipeline(use_cache: bool, entity_types=()) -> NormalizationPipeline:
+    """Pipeline with the eval's entity types loaded and warmed, so no load time lands in a timed chunk."""
+    if not use_cache:
+        CFG.cache = {**CFG.cache, "enabled": False}  # time the full path, not sqlite hits
     pipe = NormalizationPipeline()
-    preds = []
-    for _, r in df.iterrows():
-        ctx = json.loads(r.get("context","{}"))
-        out = pipe.normalize(r["entity_type"], r["input_name"], ctx)
-        preds.append({"pred_id": out.get("id"), "pred_name": out.get("name"), "score": out.get("score",0.0)})
-    out_df = pd.concat([df, pd.DataFrame(preds)], axis=1)
-    print("Top-1 acc:", (out_df["pred_id"] == out_df["gold_id"]).mean())
-    out_df.to_csv("data/eval/predictions.csv", index=False)
+    if entity_types:
+        pipe.warm_up(entity_types)
+    return pipe
+
+def run_chunk(pipe, entity_type, texts, ctxs, top_k, per_query):
+    """Normalize one chunk; returns (outputs, per-query latencies in s, stage seconds)."""
+    norm = pipe.normalizer(entity_type)
+    norm.timer = timer = StageTimer()
+    try:
+        if per_query:
+            outs, lats = [], []
+            for t, c in zip(texts, ctxs):
+                t0 = time.perf_counter()
+                outs += norm.normalize_batch([t], [c], top_k=top_k)
+                lats.append(time.perf_counter() - t0)
+        else:
+            t0 = time.perf_counter()
+            outs = norm.normalize_batch(texts, ctxs, top_k=top_k)
+            lats = [(time.perf_counter() - t0) / max(1, len(texts))] * len(texts)  # amortized
+    finally:
+        norm.timer = NULL_TIMER
+    return outs, lats, dict(timer.seconds)
+
+_WORKER_PIPE = None
+
+def _init_worker(use_cache, entity_types=()):
+    global _WORKER_PIPE
+    _WORKER_PIPE = _make_pipeline(use_cache, entity_types)
+
+def _worker_chunk(args):
+    return run_chunk(_WORKER_PIPE, *args)
+
+def _ping(_):
+    time.sleep(0.05)
+    return os.getpid()
+
+def _entity_report(rows: pd.DataFrame, lats, stages: StageTimer, wall: float, top_k: int) -> dict:
+    n = len(rows)
+    rep = {"n": n, "accuracy": round(top1_accuracy(rows), 6), "mrr": round(float(rows["reciprocal_rank"].mean()), 6)}
+    rep.update({f"recall@{k}": round(recall_at_k(rows, k), 6) for k in KS if k <= top_k})
+    rep.update(latency_percentiles(lats))
+    rep["throughput_qps"] = round(n / wall, 2) if wall else 0.0
+    rep["stage_seconds"] = stages.as_dict()
+    rep["stage_ms_per_query"] = {k: round(v * 1e3 / n, 4) for k, v in rep["stage_seconds"].items()}
+    return rep
+
+def run_eval(pairs="data/eval/labeled_pairs.csv", mode="batched", batch_size=256, workers=os.cpu_count() or 1,
+             top_k=10, use_cache=False, out="data/eval/report.json", predictions="data/eval/predictions.csv") -> dict:
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}")
+    df = pd.read_csv(pairs)
+    df["entity"] = df["entity_type"].map(entity_name)
+    entities = tuple(sorted(df["entity"].unique()))
+    pool = pipe = None
+    if mode == "multiprocess":
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(use_cache, entities))
+        seen = set()
+        for _ in range(20):  # wait until every worker has run its initializer (model + index load)
+            seen.update(pool.map(_ping, range(workers * 2)))
+            if len(seen) >= workers:
+                break
+    else:
+        pipe = _make_pipeline(use_cache, entities)
+
+    report = {"meta": {"pairs": pairs, "mode": mode, "batch_size": batch_size, "workers": workers if pool else 1,
+                       "top_k": top_k, "model": CFG.model_name, "created_at": int(time.time())},
+              "entities": {}}
+    parts, all_lats, all_stages, total_wall = [], [], StageTimer(), 0.0
+    try:
+        for entity, grp in df.groupby("entity", sort=True):
+            texts = grp["input_name"].astype(str).tolist()
+            ctxs = [_ctx(v) for v in grp.get("context", pd.Series([None] * len(grp)))]
+            size = 1 if mode == "single" else batch_size
+            chunks = [(entity, texts[i:i + size], ctxs[i:i + size], top_k, mode == "single")
+                      for i in range(0, len(texts), size)]
+            t0 = time.perf_counter()
+            results = list(pool.map(_worker_chunk, chunks)) if pool else [run_chunk(pipe, *c) for c in chunks]
+            wall = time.perf_counter() - t0
+
+            outs, lats, stages = [], [], StageTimer()
+            for o, l, s in results:
+                outs += o; lats += l; stages.merge(s)
+            rows = grp.copy()
+            rows["pred_id"] = [o.get("id") for o in outs]
+            rows["pred_name"] = [o.get("name") for o in outs]
+            rows["score"] = [o.get("score", 0.0) for o in outs]
+            rows["gold_rank"] = [gold_rank([c[0] for c in o.get("candidates", [])], g) for o, g in zip(outs, rows["gold_id"])]
+            rows["reciprocal_rank"] = [1.0 / r if r else 0.0 for r in rows["gold_rank"]]
+            report["entities"][entity] = _entity_report(rows, lats, stages, wall, top_k)
+            parts.append(rows); all_lats += lats; all_stages.merge(stages); total_wall += wall
+    finally:
+        if pool:
+            pool.shutdown()
+
+    if parts:
+        out_df = pd.concat(parts).sort_index()
+        report["overall"] = _entity_report(out_df, all_lats, all_stages, total_wall, top_k)
+        if predictions:
+            out_df.to_csv(predictions, index=False)
+    if out:
+        with open(out, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+def compare_reports(base: dict, new: dict, max_acc_drop=0.005, max_slowdown=0.10) -> list[str]:
+    """Regressions of `new` against `base`: accuracy/MRR drops and throughput or p95 latency slowdowns."""
+    problems = []
+    for entity, b in {**base.get("entities", {}), "overall": base.get("overall", {})}.items():
+        n = new.get("overall", {}) if entity == "overall" else new.get("entities", {}).get(entity)
+        if not b or not n:
+            continue
+        for m in ("accuracy", "mrr"):
+            if n.get(m, 0) < b.get(m, 0) - max_acc_drop:
+                problems.append(f"{entity}: {m} {b[m]:.4f} -> {n[m]:.4f}")
+        if b.get("throughput_qps") and n["throughput_qps"] < b["throughput_qps"] * (1 - max_slowdown):
+            problems.append(f"{entity}: throughput {b['throughput_qps']} -> {n['throughput_qps']} q/s")
+        if b.get("p95_ms") and n["p95_ms"] > b["p95_ms"] * (1 + max_slowdown):
+            problems.append(f"{entity}: p95 {b['p95_ms']} -> {n['p95_ms']} ms")
+    return problems
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pairs", default="data/eval/labeled_pairs.csv")
+    ap.add_argument("--mode", choices=MODES, default="batched")
+    ap.add_argument("--batch_size", type=int, default=256)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--top_k", type=int, default=10, help="candidates kept per query for MRR / recall@k")
+    ap.add_argument("--use_cache", action="store_true", help="leave the result cache on (off by default)")
+    ap.add_argument("--out", default="data/eval/report.json")
+    ap.add_argument("--predictions", default="data/eval/predictions.csv")
+    ap.add_argument("--baseline", help="earlier report.json; exit 1 on regressions")
+    ap.add_argument("--max_acc_drop", type=float, default=0.005)
+    ap.add_argument("--max_slowdown", type=float, default=0.10)
+    args = ap.parse_args(argv)
+    report = run_eval(args.pairs, args.mode, args.batch_size, args.workers, args.top_k, args.use_cache,
+                      args.out, args.predictions)
+    for entity, r in {**report["entities"], "overall": report.get("overall", {})}.items():
+        if r:
+            print(f"{entity:<14} n={r['n']:<6} acc={r['accuracy']:.3f} mrr={r['mrr']:.3f} "
+                  f"p50={r['p50_ms']:.2f}ms p95={r['p95_ms']:.2f}ms p99={r['p99_ms']:.2f}ms {r['throughput_qps']:.0f} q/s")
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare_reports(json.load(f), report, args.max_acc_drop, args.max_slowdown)
+        for p in problems:
+            print("REGRESSION", p)
+        sys.exit(1 if problems else 0)
 
 if __name__ == "__main__":
-    run_eval()
+    main()
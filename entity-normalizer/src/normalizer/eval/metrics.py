@@ -1,8 +1,29 @@
 # src/normalizer/eval/metrics.py
+import numpy as np
 import pandas as pd
 
+def _same_id(a, b) -> bool:
+    return a is not None and not (isinstance(a, float) and np.isnan(a)) and str(a) == str(b)
+
 def top1_accuracy(df: pd.DataFrame):
-    return (df["pred_id"] == df["gold_id"]).mean()
+    return float(np.mean([_same_id(p, g) for p, g in zip(df["pred_id"], df["gold_id"])])) if len(df) else 0.0
+
+def gold_rank(cand_ids: list, gold_id) -> int:
+    """1-based position of gold_id among ranked candidate ids, 0 when absent."""
+    for r, c in enumerate(cand_ids, 1):
+        if _same_id(c, gold_id):
+            return r
+    return 0
 
 def mrr(df: pd.DataFrame):
     return df["reciprocal_rank"].mean()
+
+def recall_at_k(df: pd.DataFrame, k: int):
+    return float(df["gold_rank"].between(1, k).mean())
+
+def latency_percentiles(seconds) -> dict:
+    ms = np.asarray(seconds, dtype=float) * 1e3
+    if not len(ms):
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "mean_ms": 0.0}
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {"p50_ms": round(p50, 4), "p95_ms": round(p95, 4), "p99_ms": round(p99, 4), "mean_ms": round(ms.mean(), 4)}
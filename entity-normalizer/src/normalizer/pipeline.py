@@ -1,24 +1,104 @@
 # src/normalizer/pipeline.py
+import threading, time
 from .entity_types.journals import JournalNormalizer
 from .entity_types.organizations import OrganizationNormalizer
 from .entity_types.countries import CountryNormalizer
 from .entity_types.funders import FunderNormalizer
 from .entity_types.topics import TopicNormalizer
 
+ENTITY_ATTR = {
+    "journal":"journals","journals":"journals",
+    "organization":"orgs","org":"orgs","organizations":"orgs",
+    "country":"countries","countries":"countries",
+    "funder":"funders","funders":"funders",
+    "topic":"topics","topics":"topics",
+}
+
+NORMALIZERS = {
+    "journals": JournalNormalizer,
+    "organizations": OrganizationNormalizer,
+    "countries": CountryNormalizer,
+    "funders": FunderNormalizer,
+    "topics": TopicNormalizer,
+}
+
+def entity_name(entity_type: str) -> str:
+    """Canonical entity name (the key used in weights.yaml / app.yaml) for any accepted alias."""
+    attr = ENTITY_ATTR[entity_type]
+    return "organizations" if attr == "orgs" else attr
+
 class NormalizationPipeline:
-    def __init__(self):
-        self.journals = JournalNormalizer()
-        self.orgs = OrganizationNormalizer()
-        self.countries = CountryNormalizer()
-        self.funders = FunderNormalizer()
-        self.topics = TopicNormalizer()
+    """
+    Normalizers are built on first use, so a run that only touches countries never loads the
+    other catalogs or indexes. Normalizers using the same model share one encoder.
+    """
+    def __init__(self, preload=()):
+        self._normalizers = {}
+        self._locks = {e: threading.Lock() for e in NORMALIZERS}
+        for e in preload:
+            self.normalizer(e)
+
+    def __getattr__(self, attr):
+        # old eager attributes: pipe.orgs, pipe.journals, ...
+        if attr in set(ENTITY_ATTR.values()):
+            return self.normalizer("organizations" if attr == "orgs" else attr)
+        raise AttributeError(attr)
+
+    def normalizer(self, entity_type: str):
+        name = entity_name(entity_type)
+        n = self._normalizers.get(name)
+        if n is None:
+            with self._locks[name]:
+                n = self._normalizers.get(name)
+                if n is None:
+                    n = self._normalizers[name] = NORMALIZERS[name]()
+        return n
+
+    @property
+    def loaded(self) -> list[str]:
+        return sorted(self._normalizers)
+
+    def warm_up(self, entity_types=None) -> dict[str, float]:
+        """Load the given entity types (all by default) and push one query through each; returns seconds per type."""
+        timings = {}
+        for e in entity_types or NORMALIZERS:
+            t0 = time.perf_counter()
+            self.normalizer(e).normalize_batch(["warm up"], top_k=1)
+            timings[entity_name(e)] = round(time.perf_counter() - t0, 3)
+        return timings
+
+    def reload(self, entity_type: str):
+        """
+        Build a fresh normalizer (new catalog / index version) next to the live one and swap it in.
+        Batches already running keep their reference to the old one, so no request is dropped.
+        """
+        name = entity_name(entity_type)
+        new = NORMALIZERS[name]()
+        with self._locks[name]:
+            old, self._normalizers[name] = self._normalizers.get(name), new
+        if old is not None:
+            old.close()
+        return new
+
+    def refresh(self) -> list[str]:
+        """Hot-swap every loaded normalizer whose catalog or index bundle changed on disk."""
+        stale = [e for e, n in list(self._normalizers.items()) if n.is_stale()]
+        for e in stale:
+            self.reload(e)
+        return stale
+
+    def unload(self, entity_type: str):
+        name = entity_name(entity_type)
+        with self._locks[name]:
+            n = self._normalizers.pop(name, None)
+        if n is not None:
+            n.close()
 
     def normalize(self, entity_type: str, text: str, ctx: dict | None = None):
-        n = getattr(self, {
-            "journal":"journals","journals":"journals",
-            "organization":"orgs","org":"orgs","organizations":"orgs",
-            "country":"countries","countries":"countries",
-            "funder":"funders","funders":"funders",
-            "topic":"topics","topics":"topics",
-        }[entity_type])
-        return n.normalize(text, ctx or {})
+        return self.normalizer(entity_type).normalize(text, ctx or {})
+
+    def normalize_batch(self, entity_type: str, texts: list[str], contexts: list[dict | None] | None = None, top_k: int = 0):
+        contexts = contexts or [None] * len(texts)
+        if len(contexts) != len(texts):
+            raise ValueError("texts and contexts must have the same length")
+        return self.normalizer(entity_type).normalize_batch(list(texts), [c or {} for c in contexts], top_k=top_k)
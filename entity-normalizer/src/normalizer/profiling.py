@@ -0,0 +1,36 @@
+# src/normalizer/profiling.py
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+STAGES = ("clean", "alias", "cache", "fuzzy", "encode", "faiss", "rerank", "catalog")
+
+class StageTimer:
+    """Accumulates wall time per pipeline stage; attach to a normalizer with `normalizer.timer = StageTimer()`."""
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.calls = defaultdict(int)
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - t0
+            self.calls[name] += 1
+
+    def merge(self, other: "StageTimer | dict"):
+        secs = other.seconds if isinstance(other, StageTimer) else other
+        for k, v in secs.items():
+            self.seconds[k] += v
+
+    def as_dict(self) -> dict:
+        return {k: round(self.seconds[k], 6) for k in STAGES if k in self.seconds} | \
+               {k: round(v, 6) for k, v in self.seconds.items() if k not in STAGES}
+
+class NullTimer:
+    def stage(self, name: str):
+        return nullcontext()
+
+NULL_TIMER = NullTimer()
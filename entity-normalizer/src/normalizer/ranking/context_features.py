@@ -1,4 +1,13 @@
 # src/normalizer/ranking/context_features.py
+import numpy as np
+
+# (user context key, catalog column) pairs that count as a context match, per entity type
+CTX_RULES = {
+    "organizations": (("country", "country"),),
+    "journals": (("issn", "issn"),),
+    # ... extend rules as needed
+}
+
 def ctx_score(entity_type: str, user_ctx: dict, cand_row: dict) -> float:
     """
     Example: for organizations, boost if user_ctx.country == cand_row.country
@@ -6,11 +15,22 @@ def ctx_score(entity_type: str, user_ctx: dict, cand_row: dict) -> float:
     Return value in [0, 1].
     """
     s = 0.0
-    if entity_type == "organizations":
-        if user_ctx.get("country") and cand_row.get("country"):
-            s += 1.0 if user_ctx["country"] == cand_row["country"] else 0.0
-    if entity_type == "journals":
-        if user_ctx.get("issn") and cand_row.get("issn"):
-            s += 1.0 if user_ctx["issn"] == cand_row["issn"] else 0.0
-    # ... extend rules as needed
+    for key, col in CTX_RULES.get(entity_type, ()):
+        if user_ctx.get(key) and cand_row.get(col):
+            s += 1.0 if user_ctx[key] == cand_row[col] else 0.0
     return min(s, 1.0)
+
+def ctx_matrix(entity_type: str, user_ctxs: list[dict], cols: dict[str, np.ndarray], cand_ids: np.ndarray) -> np.ndarray:
+    """ctx_score for a whole candidate block: (n_queries, n_cands) in [0, 1], 0 on -1 padding."""
+    out = np.zeros(cand_ids.shape, np.float32)
+    for key, col in CTX_RULES.get(entity_type, ()):
+        if col not in cols:
+            continue
+        rows = [r for r, c in enumerate(user_ctxs) if c.get(key)]
+        if not rows:
+            continue
+        want = np.array([user_ctxs[r][key] for r in rows], dtype=object)[:, None]
+        have = cols[col][cand_ids[rows].clip(0)]
+        out[rows] = np.maximum(out[rows], (have == want).astype(np.float32))
+    out[cand_ids < 0] = 0.0
+    return out
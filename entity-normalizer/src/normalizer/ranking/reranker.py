@@ -1,5 +1,6 @@
 # src/normalizer/ranking/reranker.py
-from rapidfuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
 
 def hybrid_score(user_input: str, cand_name: str, embed_score: float, entity_weights: dict) -> float:
     fuzzy = fuzz.token_sort_ratio(user_input, cand_name) / 100.0
@@ -10,3 +11,30 @@ def final_score(user_input, cand_name, embed_score, ctx_s, entity_weights):
     base = hybrid_score(user_input, cand_name, embed_score, entity_weights)
     γ = entity_weights["gamma_ctx"]
     return base + γ * ctx_s
+
+def fuzzy_matrix(queries: list[str], cand_ids: np.ndarray, names: np.ndarray) -> np.ndarray:
+    """token_sort_ratio/100 for every (query, candidate) cell of a ragged candidate block, scored
+    pairwise in one cpdist call (cdist would also score every query against every other query's names)."""
+    out = np.zeros(cand_ids.shape, np.float32)
+    rows, cols = np.nonzero(cand_ids >= 0)
+    if not len(rows):
+        return out
+    # threads only pay off on large blocks; below that the pool start-up dominates
+    workers = -1 if len(rows) > 200_000 else 1
+    q = np.asarray(queries, dtype=object)[rows].tolist()
+    c = np.asarray(names, dtype=object)[cand_ids[rows, cols]].tolist()  # pass catalog.cols[...] to avoid a copy
+    out[rows, cols] = process.cpdist(q, c,
+                                     scorer=fuzz.token_sort_ratio, dtype=np.float32, workers=workers) / 100.0
+    return out
+
+def rerank_batch(queries: list[str], cand_ids: np.ndarray, embed_scores: np.ndarray, ctx_scores: np.ndarray,
+                 names: np.ndarray, entity_weights: dict, k: int = 1) -> tuple[np.ndarray, np.ndarray]:
+    """
+    final_score over a (n_queries, n_cands) candidate block as array ops.
+    Returns (ids, scores), each (n_queries, k), best first; -1 / -inf where a row has fewer candidates.
+    """
+    α, β, γ = entity_weights["alpha_fuzzy"], entity_weights["beta_embed"], entity_weights["gamma_ctx"]
+    scores = α * fuzzy_matrix(queries, cand_ids, names) + β * embed_scores + γ * ctx_scores
+    scores = np.where(cand_ids >= 0, scores, -np.inf).astype(np.float32)
+    top = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(cand_ids, top, axis=1), np.take_along_axis(scores, top, axis=1)
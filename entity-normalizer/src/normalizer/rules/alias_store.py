@@ -0,0 +1,117 @@
+# src/normalizer/rules/alias_store.py
+# Alias tables compiled once per process: an exact-match dict per entity plus an automaton
+# for locating aliases inside longer strings. Keys are normalize_text()'d, so lookups are
+# one clean + one dict probe.
+import csv, hashlib, json
+from functools import lru_cache
+from pathlib import Path
+from ..utils_text import normalize_text
+from ..text.rules import ALIAS_MAP
+
+try:
+    import ahocorasick
+except ImportError:  # fall back to scanning token spans against the exact dict
+    ahocorasick = None
+
+TOKEN_MAPS = Path(__file__).parent / "token_maps"
+ALIAS_FILES = {
+    "country_aliases.csv": "countries",
+    "org_aliases.csv": "organizations",
+    "funder_aliases.csv": "funders",
+    "journal_aliases.csv": "journals",
+}
+ANY = "*"  # entries that apply to every entity type (text/rules.py ALIAS_MAP)
+
+def read_alias_csv(path) -> list[tuple[str, str]]:
+    with open(path, newline="") as f:
+        rows = [r for r in csv.reader(f) if len(r) >= 2]
+    if rows and [c.strip().lower() for c in rows[0][:2]] == ["alias", "canonical"]:
+        rows = rows[1:]
+    return [(r[0], r[1].strip()) for r in rows]
+
+class AliasStore:
+    def __init__(self):
+        self.exact: dict[str, dict[str, str]] = {}
+        self._automata = {}
+        self._max_tokens = {}
+        self.version = ""
+
+    def add(self, entity: str, alias: str, canonical: str):
+        key = normalize_text(alias)
+        if key:
+            self.exact.setdefault(entity, {}).setdefault(key, canonical)
+
+    def compile(self) -> "AliasStore":
+        self.version = hashlib.sha1(json.dumps(self.exact, sort_keys=True).encode()).hexdigest()[:16]
+        for entity, table in self.exact.items():
+            self._max_tokens[entity] = max(len(k.split()) for k in table)
+            if ahocorasick:
+                A = ahocorasick.Automaton()
+                for key, canonical in table.items():
+                    A.add_word(f" {key} ", (key, canonical))  # space padding = token boundaries
+                A.make_automaton()
+                self._automata[entity] = A
+        return self
+
+    def lookup(self, entity: str, text: str) -> str | None:
+        """Canonical name when the whole string is a known alias."""
+        return self.lookup_clean(entity, normalize_text(text))
+
+    def lookup_clean(self, entity: str, key: str) -> str | None:
+        hit = self.exact.get(entity, {}).get(key)
+        return hit if hit is not None else self.exact.get(ANY, {}).get(key)
+
+    def _find_in(self, entity: str, key: str) -> list[tuple[int, int, str, str]]:
+        table = self.exact.get(entity)
+        if not table:
+            return []
+        hits = []
+        if entity in self._automata:
+            padded = f" {key} "
+            for end, (alias, canonical) in self._automata[entity].iter(padded):
+                start = end - len(alias) - 1  # drop the leading pad -> index into key
+                hits.append((start, start + len(alias), alias, canonical))
+        else:
+            toks, offs, pos = key.split(), [], 0
+            for t in toks:
+                offs.append(pos); pos += len(t) + 1
+            for i in range(len(toks)):
+                for n in range(1, min(self._max_tokens[entity], len(toks) - i) + 1):
+                    alias = " ".join(toks[i:i + n])
+                    if alias in table:
+                        hits.append((offs[i], offs[i] + len(alias), alias, table[alias]))
+        return hits
+
+    def find(self, entity: str, text: str) -> list[tuple[int, int, str, str]]:
+        """Longest non-overlapping aliases in normalize_text(text) as (start, end, alias, canonical)."""
+        key = normalize_text(text)
+        hits = sorted(self._find_in(entity, key) + self._find_in(ANY, key), key=lambda h: (h[0], h[0] - h[1]))
+        out, last = [], -1
+        for h in hits:
+            if h[0] > last:
+                out.append(h)
+                last = h[1]
+        return out
+
+    def expand(self, entity: str, text: str) -> str:
+        """Replace every alias found inside `text` with its canonical name (text unchanged if none)."""
+        hits = self.find(entity, text)
+        if not hits:
+            return text
+        key, parts, pos = normalize_text(text), [], 0
+        for start, end, _, canonical in hits:
+            parts += [key[pos:start], canonical]
+            pos = end
+        return "".join(parts + [key[pos:]])
+
+@lru_cache(maxsize=None)
+def get_alias_store(token_maps: str = str(TOKEN_MAPS)) -> AliasStore:
+    store = AliasStore()
+    for fname, entity in ALIAS_FILES.items():
+        path = Path(token_maps) / fname
+        if path.exists():
+            for alias, canonical in read_alias_csv(path):
+                store.add(entity, alias, canonical)
+    for alias, canonical in ALIAS_MAP.items():
+        store.add(ANY, alias, canonical)
+    return store.compile()
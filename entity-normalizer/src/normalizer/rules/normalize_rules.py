@@ -1,17 +1,25 @@
 # src/normalizer/rules/normalize_rules.py
-import csv, json
-from .token_maps import *
+import json
+from functools import lru_cache
+from .alias_store import read_alias_csv
 from ..utils_text import normalize_text
 
+@lru_cache(maxsize=None)
+def _alias_table(alias_csv: str) -> dict[str, str]:
+    table = {}
+    for alias, canonical in read_alias_csv(alias_csv):
+        table.setdefault(normalize_text(alias), canonical)
+    return table
+
+@lru_cache(maxsize=None)
+def _abbrev_map(common_json: str) -> dict[str, str]:
+    with open(common_json) as f:
+        text = f.read().strip()
+    return json.loads(text) if text else {}
+
 def apply_alias_map(name: str, alias_csv: str) -> str | None:
-    n = normalize_text(name)
-    with open(alias_csv) as f:
-        for row in csv.reader(f):
-            alias, canonical = row
-            if normalize_text(alias) == n:
-                return canonical
-    return None
+    return _alias_table(alias_csv).get(normalize_text(name))
 
 def expand_abbrev(tokens: list[str], common_json: str) -> list[str]:
-    maps = json.load(open(common_json))
+    maps = _abbrev_map(common_json)
     return [maps.get(t, t) for t in tokens]
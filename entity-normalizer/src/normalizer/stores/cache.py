@@ -0,0 +1,130 @@
+# src/normalizer/stores/cache.py
+import atexit, hashlib, json, sqlite3, threading
+from collections import OrderedDict
+from pathlib import Path
+from ..text.normalize import basic_clean
+
+def ctx_hash(ctx: dict | None) -> str:
+    if not ctx:
+        return ""
+    return hashlib.sha1(json.dumps(ctx, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+def cache_key(entity: str, text: str, ctx: dict | None, version: str) -> str:
+    return clean_cache_key(entity, basic_clean(text), ctx, version)
+
+def clean_cache_key(entity: str, cleaned: str, ctx: dict | None, version: str) -> str:
+    raw = "\x1f".join((entity, cleaned, ctx_hash(ctx), version))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+class ResultCache:
+    """
+    Normalization results keyed by (entity, cleaned text, context hash, catalog+weights version).
+    A bounded in-process LRU sits in front of a sqlite table; writes are buffered and
+    flushed in one transaction every `flush_every` puts. The live version of each entity is
+    recorded, so a version change drops only the rows of the version it replaces.
+    """
+    def __init__(self, path: str, lru_size: int = 100_000, flush_every: int = 512):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, entity TEXT, version TEXT, value TEXT)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_entity ON results (entity, version)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS live_versions (entity TEXT PRIMARY KEY, version TEXT)")
+        self.conn.commit()
+        self.lru_size, self.flush_every = lru_size, flush_every
+        self._lru = OrderedDict()  # key -> (entity, version, value)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def _remember(self, key, entity, version, value):
+        self._lru[key] = (entity, version, value)
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def get_many(self, keys: list[str]) -> dict[str, dict]:
+        found, todo = {}, []
+        with self._lock:
+            for k in dict.fromkeys(keys):
+                if k in self._lru:
+                    self._lru.move_to_end(k)
+                    found[k] = self._lru[k][2]
+                elif k in self._pending:
+                    found[k] = self._pending[k][2]
+                else:
+                    todo.append(k)
+            for start in range(0, len(todo), 900):  # stay under SQLITE_MAX_VARIABLE_NUMBER
+                chunk = todo[start:start + 900]
+                q = f"SELECT key, entity, version, value FROM results WHERE key IN ({','.join('?' * len(chunk))})"
+                for k, e, ver, v in self.conn.execute(q, chunk):
+                    found[k] = json.loads(v)
+                    self._remember(k, e, ver, found[k])
+            self.hits += sum(1 for k in keys if k in found)
+            self.misses += sum(1 for k in keys if k not in found)
+        return found
+
+    def get(self, key: str) -> dict | None:
+        return self.get_many([key]).get(key)
+
+    def put(self, key: str, value: dict, entity: str, version: str):
+        with self._lock:
+            self._remember(key, entity, version, value)
+            self._pending[key] = (entity, version, value)
+            if len(self._pending) >= self.flush_every:
+                self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        rows = [(k, e, v, json.dumps(val, default=str)) for k, (e, v, val) in self._pending.items()]
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO results (key, entity, version, value) VALUES (?,?,?,?)", rows)
+        self._pending.clear()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def invalidate(self, entity: str, version: str):
+        """
+        Make `version` the live catalog/weights version of `entity` and drop the results of the version
+        it replaces, in sqlite and in the LRU. Other entities and other versions are left alone.
+        """
+        with self._lock:
+            self._flush()
+            row = self.conn.execute("SELECT version FROM live_versions WHERE entity = ?", (entity,)).fetchone()
+            old = row[0] if row else None
+            if old == version:
+                return
+            with self.conn:
+                if old is not None:
+                    self.conn.execute("DELETE FROM results WHERE entity = ? AND version = ?", (entity, old))
+                self.conn.execute("INSERT OR REPLACE INTO live_versions (entity, version) VALUES (?, ?)", (entity, version))
+            for k in [k for k, (e, v, _) in self._lru.items() if e == entity and v == old]:
+                del self._lru[k]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0,
+                "lru_entries": len(self._lru)}
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+_CACHE = None
+
+def get_cache(cfg: dict) -> ResultCache | None:
+    """Process-wide cache built from the `cache:` block of configs/app.yaml (None when disabled)."""
+    global _CACHE
+    if not cfg.get("enabled"):
+        return None
+    if cfg.get("backend", "sqlite") != "sqlite":
+        raise ValueError(f"unsupported cache backend: {cfg['backend']}")
+    if _CACHE is None:
+        _CACHE = ResultCache(cfg.get("path", "data/cache.sqlite"), cfg.get("lru_size", 100_000), cfg.get("flush_every", 512))
+        atexit.register(_CACHE.close)
+    return _CACHE
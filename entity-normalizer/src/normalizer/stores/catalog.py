@@ -1,31 +1,81 @@
 # src/normalizer/stores/catalog.py
+import hashlib
+from collections.abc import Mapping
+import numpy as np
 import pandas as pd
-from pathlib import Path
+
+def file_checksum(path: str, chunk=1 << 20) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        while block := f.read(chunk):
+            h.update(block)
+    return h.hexdigest()
+
+class CatalogRow(Mapping):
+    """Read-only view of one catalog row; values are read from the column arrays on access."""
+    __slots__ = ("_cols", "_i")
+
+    def __init__(self, cols: dict[str, np.ndarray], i: int):
+        self._cols = cols
+        self._i = i
+
+    def __getitem__(self, col):
+        v = self._cols[col][self._i]
+        return v.item() if isinstance(v, np.generic) else v
+
+    def __iter__(self):
+        return iter(self._cols)
+
+    def __len__(self):
+        return len(self._cols)
+
+    def to_dict(self) -> dict:
+        return dict(self)
+
+    def __repr__(self):
+        return f"CatalogRow({self.to_dict()!r})"
 
 class Catalog:
+    """Columnar catalog: one typed array per column plus name->row and id->row hash indexes."""
     def __init__(self, path_csv: str, key_cols=("id","name")):
-        self.df = pd.read_csv(path_csv)
-        self.df["name_norm"] = self.df["name"].str.lower()
-        self.names = self.df["name"].tolist()
+        self.id_col, self.name_col = key_cols
+        self.version = file_checksum(path_csv)[:16]
+        df = pd.read_csv(path_csv)
+        df[self.name_col] = df[self.name_col].astype(str)
+        df["name_norm"] = df[self.name_col].str.lower()
+        self.cols = {c: df[c].to_numpy() for c in df.columns}
+        self.names = df[self.name_col].tolist()
+        # first occurrence wins, matching the old df[...].iloc[0] semantics
+        self._by_name = {n: i for i, n in reversed(list(enumerate(self.names)))}
+        self._by_id = {}
+        if self.id_col in self.cols:
+            ids = self.cols[self.id_col].tolist()
+            self._by_id = {v: i for i, v in reversed(list(enumerate(ids)))}
 
-    def row_by_name(self, name: str) -> dict | None:
-        hit = self.df[self.df["name"] == name]
-        return None if hit.empty else hit.iloc[0].to_dict()
+    def __len__(self):
+        return len(self.names)
 
+    def row(self, i: int) -> CatalogRow:
+        return CatalogRow(self.cols, i)
 
-import pandas as pd
+    def index_of(self, name: str) -> int | None:
+        return self._by_name.get(name)
+
+    def row_by_name(self, name: str) -> CatalogRow | None:
+        i = self._by_name.get(name)
+        return None if i is None else CatalogRow(self.cols, i)
+
+    def row_by_id(self, _id) -> CatalogRow | None:
+        i = self._by_id.get(_id)
+        return None if i is None else CatalogRow(self.cols, i)
 
-class Catalog2:
+
+class Catalog2(Catalog):
     def __init__(self, path: str, name_col="name"):
-        self.df = pd.read_csv(path)
-        self.df[name_col] = self.df[name_col].astype(str)
-        self.name_col = name_col
-        self.names = self.df[name_col].tolist()
-
-    def by_name(self, name: str) -> dict | None:
-        hit = self.df[self.df[self.name_col] == name]
-        return None if hit.empty else hit.iloc[0].to_dict()
-
-    def by_id(self, _id) -> dict | None:
-        hit = self.df[self.df["id"] == _id]
-        return None if hit.empty else hit.iloc[0].to_dict()
+        super().__init__(path, key_cols=("id", name_col))
+
+    def by_name(self, name: str) -> CatalogRow | None:
+        return self.row_by_name(name)
+
+    def by_id(self, _id) -> CatalogRow | None:
+        return self.row_by_id(_id)
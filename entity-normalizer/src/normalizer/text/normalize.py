@@ -1,20 +1,15 @@
-import re, unicodedata
+from academic_common.text import TextNormalizer, nfkd_ascii  # re-exported
 
-_PUNCT = re.compile(r"[^\w\s]")
-_WS = re.compile(r"\s+")
+NOISE_ORG = ("department of","school of","faculty of","lab","laboratory","college of")
 
-def nfkd_ascii(s: str) -> str:
-    return unicodedata.normalize("NFKD", s).encode("ascii","ignore").decode()
+BASIC = TextNormalizer()
+ORG_NOISE = TextNormalizer(noise=NOISE_ORG)
 
 def basic_clean(s: str) -> str:
-    s = nfkd_ascii(s.lower())
-    s = _PUNCT.sub(" ", s)
-    s = _WS.sub(" ", s).strip()
-    return s
+    return BASIC.normalize(s)
+
+def clean_batch(texts) -> list[str]:
+    return BASIC.normalize_batch(texts)
 
-NOISE_ORG = ("department of","school of","faculty of","lab","laboratory","college of")
 def strip_org_noise(s: str) -> str:
-    t = s
-    for n in NOISE_ORG:
-        t = t.replace(n, " ")
-    return _WS.sub(" ", t).strip()
+    return ORG_NOISE.normalize(s)
@@ -1,14 +1,3 @@
 # src/normalizer/utils_text.py
-import re, unicodedata
-
-PUNCT_RE = re.compile(r"[^\w\s]")
-WS_RE = re.compile(r"\s+")
-
-def norm_unicode(s: str) -> str:
-    return unicodedata.normalize("NFKD", s).encode("ascii", "ignore").decode()
-
-def normalize_text(s: str) -> str:
-    s = norm_unicode(s.lower())
-    s = PUNCT_RE.sub(" ", s)
-    s = WS_RE.sub(" ", s).strip()
-    return s
+# Kept for existing imports; normalization itself lives in text/normalize.py (TextNormalizer).
+from .text.normalize import basic_clean as normalize_text, clean_batch as normalize_texts, nfkd_ascii as norm_unicode
@@ -0,0 +1,46 @@
+# tests/test_batcher.py
+import asyncio
+import pytest
+from src.api.batcher import MicroBatcher
+
+def _run(coro):
+    return asyncio.run(coro)
+
+def test_concurrent_requests_share_one_batch():
+    calls = []
+    def fake_batch(etype, texts, ctxs):
+        calls.append((etype, list(texts)))
+        return [{"name": t.upper(), "id": None, "score": 1.0} for t in texts]
+
+    async def go():
+        b = MicroBatcher(fake_batch, max_batch=64, max_wait_ms=50)
+        await b.start()
+        outs = await asyncio.gather(*(b.submit("org", f"t{i}") for i in range(10)),
+                                    b.submit_many("funder", ["a", "b"]))
+        await b.stop()
+        return outs, b.metrics()
+
+    outs, m = _run(go())
+    assert [o["name"] for o in outs[:10]] == [f"T{i}" for i in range(10)]
+    assert [o["name"] for o in outs[10]] == ["A", "B"]
+    assert sorted(len(t) for _, t in calls) == [2, 10]  # one call per entity type
+    assert m["batches_total"] == 1 and m["items_total"] == 12 and m["queue_depth"] == 0
+
+def test_max_batch_and_errors():
+    def fake_batch(etype, texts, ctxs):
+        if etype == "bad":
+            raise KeyError(etype)
+        return [{"name": t} for t in texts]
+
+    async def go():
+        b = MicroBatcher(fake_batch, max_batch=3, max_wait_ms=20)
+        await b.start()
+        outs = await b.submit_many("org", [str(i) for i in range(7)])
+        with pytest.raises(KeyError):
+            await b.submit("bad", "x")
+        await b.stop()
+        return outs, b.metrics()
+
+    outs, m = _run(go())
+    assert [o["name"] for o in outs] == [str(i) for i in range(7)]
+    assert max(m["batch_size_histogram"]) == 3
@@ -0,0 +1,37 @@
+# tests/test_cache.py
+from src.normalizer.stores.cache import ResultCache, cache_key
+
+def test_key_uses_cleaned_text_and_context():
+    assert cache_key("organizations", "Univ. of Oxford", {}, "v1") == cache_key("organizations", "univ of  oxford", None, "v1")
+    assert cache_key("organizations", "oxford", {"country": "GB"}, "v1") != cache_key("organizations", "oxford", {}, "v1")
+    assert cache_key("organizations", "oxford", {}, "v1") != cache_key("organizations", "oxford", {}, "v2")
+
+def test_roundtrip_persists_and_invalidates(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    c = ResultCache(path, lru_size=2, flush_every=2)
+    c.invalidate("funders", "v1")  # first start: nothing to drop
+    c.put("a", {"id": 1}, "funders", "v1")
+    c.put("b", {"id": 2}, "funders", "v1")   # triggers a flush
+    c.put("c", {"id": 3}, "funders", "v2")   # evicts "a" from the LRU, still pending
+    assert c.get_many(["a", "b", "c", "zz"]) == {"a": {"id": 1}, "b": {"id": 2}, "c": {"id": 3}}
+    c.close()
+
+    c2 = ResultCache(path)
+    assert c2.get("c") == {"id": 3}
+    c2.invalidate("funders", "v2")
+    assert c2.get("a") is None and c2.get("c") == {"id": 3}
+    assert c2.stats()["hits"] == 2 and c2.stats()["misses"] == 1
+    c2.close()
+
+def test_invalidate_drops_only_the_replaced_version(tmp_path):
+    c = ResultCache(str(tmp_path / "cache.sqlite"), flush_every=1)
+    c.invalidate("funders", "v1")
+    c.put("old", {"id": 1}, "funders", "v1")
+    c.put("other_version", {"id": 2}, "funders", "v0")   # e.g. written by another process
+    c.put("other_entity", {"id": 3}, "journals", "v1")
+    c.invalidate("funders", "v1")  # same version again: no-op
+    assert c.get("old") == {"id": 1}
+    c.invalidate("funders", "v2")
+    assert c.get_many(["old", "other_version", "other_entity"]) == {"other_version": {"id": 2}, "other_entity": {"id": 3}}
+    assert c.stats()["lru_entries"] == 2
+    c.close()
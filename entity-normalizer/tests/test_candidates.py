@@ -0,0 +1,54 @@
+# tests/test_candidates.py
+import pytest
+from src.normalizer.candidates.generator import gen_fuzzy, gen_fuzzy_batch, gen_candidates, gen_candidates_batch
+
+NAMES = ["Massachusetts Institute of Technology", "University of Oxford", "University of Cambridge",
+         "Stanford University", "Oxford Brookes University", "Imperial College London"]
+
+class StubSearcher:
+    """Deterministic stand-in for FaissSearcher: embedding score = shared-token ratio."""
+    def search_batch(self, queries, k=50):
+        out = []
+        for q in queries:
+            qt = set(q.lower().split())
+            scored = [(i, len(qt & set(n.lower().split())) / len(qt)) for i, n in enumerate(NAMES)]
+            out.append(sorted(scored, key=lambda x: -x[1])[:k])
+        return out
+
+    def search(self, query, k=50):
+        return self.search_batch([query], k)[0]
+
+def test_fuzzy_batch_matches_single_query():
+    queries = ["univ of oxford", "stanford", "imperial college"]
+    batch = gen_fuzzy_batch(queries, NAMES, k=3)
+    for q, got in zip(queries, batch):
+        assert [(n, round(s, 4)) for n, s in got] == [(n, round(s, 4)) for n, s, _ in gen_fuzzy(q, NAMES, k=3)]
+
+def test_candidates_batch_matches_single_query():
+    queries = ["university oxford", "cambridge university"]
+    searcher = StubSearcher()
+    batch = gen_candidates_batch(queries, NAMES, searcher, k_embed=4, k_fuzzy=3)
+    for q, got in zip(queries, batch):
+        want = gen_candidates(q, NAMES, searcher, k_embed=4, k_fuzzy=3)
+        assert [n for n, _ in got] == [n for n, _ in want]
+        assert [s for _, s in got] == pytest.approx([s for _, s in want], abs=1e-6)
+
+def test_fuzzy_batch_empty_inputs():
+    assert gen_fuzzy_batch([], NAMES) == []
+    assert gen_fuzzy_batch(["x"], []) == [[]]
+
+def test_blocking_index_restricts_fuzzy_pass():
+    from src.normalizer.candidates.blocking import BlockingIndex
+    blocker = BlockingIndex(NAMES, max_df=0.5)
+    ids = blocker.candidates("Univ. of Oxford")
+    assert NAMES.index("University of Oxford") in ids
+    assert NAMES.index("Imperial College London") not in ids
+    blocked, full = blocker.fuzzy_topk(["univ of oxford"], k=2)[0], gen_fuzzy_batch(["univ of oxford"], NAMES, k=2)[0]
+    assert [n for n, _ in blocked] == [n for n, _ in full]
+    assert len(blocker.candidates("zzzz qqqq")) == 0
+
+def test_phonetic_keys_group_name_variants():
+    from src.normalizer.candidates.blocking import BlockingIndex, soundex
+    assert soundex("Robert") == soundex("Rupert") == "r163"
+    blocker = BlockingIndex(["Wang Wei", "Wong Wei", "Smith John"], key_types=("phonetic",), max_df=1.0)
+    assert sorted(blocker.candidates("Wang W.")) == [0, 1]
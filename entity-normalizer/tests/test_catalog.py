@@ -0,0 +1,22 @@
+# tests/test_catalog.py
+from src.normalizer.stores.catalog import Catalog, Catalog2
+
+def _write(tmp_path):
+    p = tmp_path / "orgs.csv"
+    p.write_text("id,name,country\n1,Stanford University,US\n2,University of Oxford,GB\n3,Stanford University,US\n")
+    return str(p)
+
+def test_row_by_name_and_id(tmp_path):
+    cat = Catalog(_write(tmp_path))
+    row = cat.row_by_name("University of Oxford")
+    assert row["id"] == 2 and row.get("country") == "GB"
+    assert cat.row_by_name("Stanford University")["id"] == 1  # first occurrence wins
+    assert cat.row_by_id(3)["name"] == "Stanford University"
+    assert cat.row_by_name("MIT") is None and cat.row_by_id(99) is None
+    assert row.to_dict() == {"id": 2, "name": "University of Oxford", "country": "GB", "name_norm": "university of oxford"}
+
+def test_catalog2_aliases(tmp_path):
+    cat = Catalog2(_write(tmp_path))
+    assert cat.by_name("University of Oxford")["id"] == 2
+    assert cat.by_id(1)["country"] == "US"
+    assert cat.names[0] == "Stanford University"
@@ -0,0 +1,16 @@
+# tests/test_encoder.py
+import sys, types
+from src.normalizer.candidates import encoder
+
+def test_encoder_shared_and_refcounted(monkeypatch):
+    made = []
+    fake = types.ModuleType("sentence_transformers")
+    fake.SentenceTransformer = lambda name, device=None: made.append(name) or object()
+    monkeypatch.setitem(sys.modules, "sentence_transformers", fake)
+    a = encoder.acquire_encoder("m-test")
+    b = encoder.acquire_encoder("m-test")
+    assert a is b and made == ["m-test"]
+    encoder.release_encoder("m-test")
+    assert encoder.loaded_encoders()[("m-test", None)] == 1
+    encoder.release_encoder("m-test")
+    assert ("m-test", None) not in encoder.loaded_encoders()
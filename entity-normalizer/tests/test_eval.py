@@ -0,0 +1,37 @@
+# tests/test_eval.py
+import pandas as pd
+from src.normalizer import pipeline
+from src.normalizer.eval.evaluate import _make_pipeline, compare_reports, run_chunk
+from src.normalizer.eval.metrics import gold_rank, latency_percentiles, mrr, recall_at_k, top1_accuracy
+
+def test_rank_metrics():
+    df = pd.DataFrame({"gold_id": [1, "J2", 3], "pred_id": ["1", None, 4]})
+    df["gold_rank"] = [gold_rank(c, g) for c, g in zip([[1, 7], [5, "J2"], [4, 5]], df["gold_id"])]
+    df["reciprocal_rank"] = [1 / r if r else 0.0 for r in df["gold_rank"]]
+    assert list(df["gold_rank"]) == [1, 2, 0]
+    assert top1_accuracy(df) == 1 / 3
+    assert mrr(df) == 0.5 and recall_at_k(df, 1) == 1 / 3 and recall_at_k(df, 5) == 2 / 3
+
+def test_latency_percentiles_in_ms():
+    p = latency_percentiles([0.001] * 99 + [0.1])
+    assert p["p50_ms"] == 1.0 and p["p99_ms"] > 1.0
+
+def test_compare_reports_flags_regressions():
+    base = {"entities": {"funders": {"accuracy": 0.9, "mrr": 0.9, "throughput_qps": 1000, "p95_ms": 1.0}}}
+    same = {"entities": {"funders": {"accuracy": 0.9, "mrr": 0.91, "throughput_qps": 950, "p95_ms": 1.05}}}
+    worse = {"entities": {"funders": {"accuracy": 0.8, "mrr": 0.9, "throughput_qps": 500, "p95_ms": 2.0}}}
+    assert compare_reports(base, same) == []
+    assert len(compare_reports(base, worse)) == 3
+
+def test_eval_pipeline_is_loaded_before_timing(monkeypatch):
+    built = []
+    class FakeNormalizer:
+        def __init__(self):
+            built.append(self)
+        def normalize_batch(self, texts, ctxs=None, top_k=1):
+            return [{"id": None}] * len(texts)
+    monkeypatch.setitem(pipeline.NORMALIZERS, "funders", FakeNormalizer)
+    pipe = _make_pipeline(True, ("funders",))
+    assert pipe.loaded == ["funders"] and len(built) == 1
+    outs, lats, _ = run_chunk(pipe, "funders", ["a", "b"], [{}, {}], 1, False)
+    assert len(outs) == 2 and len(built) == 1  # nothing was built inside the timed chunk
@@ -0,0 +1,52 @@
+# tests/test_index_bundle.py
+import faiss, numpy as np
+from src.normalizer.candidates.index_bundle import current_version, load_bundle, read_meta, write_bundle
+
+def _index(n=20, d=8, seed=0):
+    X = np.random.default_rng(seed).random((n, d), dtype=np.float32)
+    ix = faiss.IndexFlatIP(d); ix.add(X)
+    return ix, X
+
+def test_write_then_mmap_load(tmp_path):
+    ix, X = _index()
+    names = [f"name {i}" for i in range(20)]
+    assert write_bundle(tmp_path, ix, names, {"catalog_checksum": "abc"}) == "v0001"
+    loaded, got_names, meta = load_bundle(tmp_path)
+    assert list(got_names) == names
+    assert meta["catalog_checksum"] == "abc" and meta["n"] == 20 and meta["dim"] == 8
+    assert (loaded.search(X[:3], 1)[1] == ix.search(X[:3], 1)[1]).all()
+
+def test_new_version_flips_current(tmp_path):
+    ix, _ = _index()
+    write_bundle(tmp_path, ix, ["a"] * 20, {"catalog_checksum": "old"})
+    write_bundle(tmp_path, ix, ["b"] * 20, {"catalog_checksum": "new"})
+    assert current_version(tmp_path) == "v0002"
+    assert read_meta(tmp_path)["catalog_checksum"] == "new"
+    assert read_meta(tmp_path, "v0001")["catalog_checksum"] == "old"
+
+def test_id_mapped_bundle_round_trip(tmp_path):
+    from src.normalizer.candidates.index_bundle import id_labels, load_ids
+    from src.normalizer.candidates.index_factory import build_faiss_index
+    X = _index()[1]
+    X /= np.linalg.norm(X, axis=1, keepdims=True)
+    ids = [f"F{i}" for i in range(20)]
+    ix, _ = build_faiss_index(X, "flat", ids=id_labels(ids))
+    write_bundle(tmp_path, ix, [f"n{i}" for i in range(20)], {}, ids=ids)
+    loaded, _, meta = load_bundle(tmp_path)
+    assert meta["id_map"] and load_ids(tmp_path) == ids
+    assert (loaded.search(X[:3], 1)[1][:, 0] == id_labels(ids[:3])).all()
+    assert (id_labels(["F1", 7]) == id_labels(["F1", "7"])).all()
+
+def test_delta_diff_and_hnsw_drop():
+    from src.cli.ingest_delta import _drop, diff_catalog
+    from src.normalizer.candidates.index_bundle import id_labels
+    from src.normalizer.candidates.index_factory import build_faiss_index
+    d = diff_catalog(["a", "b", "c"], ["A", "B", "C"], ["b", "c", "d"], ["B", "C2", "D"])
+    assert d == {"added": ["d"], "removed": ["a"], "changed": ["c"]}
+    X = _index()[1]
+    X /= np.linalg.norm(X, axis=1, keepdims=True)
+    ids = [str(i) for i in range(20)]
+    ix, params = build_faiss_index(X, "hnsw", hnsw_m=8, ids=id_labels(ids))
+    ix = _drop(ix, id_labels(["3", "4"]), {"index_type": "hnsw", "index_params": params})  # HNSW can't remove_ids: rebuilt
+    assert ix.ntotal == 18
+    assert ix.search(X[5:6], 1)[1][0, 0] == id_labels(["5"])[0]
@@ -0,0 +1,36 @@
+# tests/test_quantized.py
+import numpy as np
+from src.normalizer.candidates.index_bundle import load_bundle, load_vectors, write_bundle
+from src.normalizer.candidates.index_factory import build_faiss_index
+from src.normalizer.candidates.quantized import PAD_SCORE, exact_rerank, search_codes
+
+def _unit(n, d=64, seed=0):
+    X = np.random.default_rng(seed).standard_normal((n, d)).astype("float32")
+    return X / np.linalg.norm(X, axis=1, keepdims=True)
+
+def test_exact_rerank_orders_by_float_score_and_keeps_padding():
+    X, q = _unit(10), _unit(1, seed=1)
+    I = np.array([[3, 7, -1, 1]])
+    D, J = exact_rerank(X, q, I, 4)
+    expect = sorted([3, 7, 1], key=lambda i: -float(X[i] @ q[0]))
+    assert J[0, :3].tolist() == expect and J[0, 3] == -1 and D[0, 3] == PAD_SCORE
+    assert np.allclose(D[0, :3], [X[i] @ q[0] for i in expect], atol=1e-6)
+
+def test_quantized_candidates_plus_rerank_match_flat():
+    X = _unit(500)
+    Q = X[:20] + 0.05 * _unit(20, seed=2)
+    _, I_flat = build_faiss_index(X, "flat")[0].search(Q, 5)
+    index, _ = build_faiss_index(X, "sq8")
+    _, I = search_codes(index, Q, 20)
+    assert (exact_rerank(X, Q, I, 5)[1] == I_flat).all()
+
+def test_binary_bundle_round_trip(tmp_path):
+    X = _unit(100)
+    index, _ = build_faiss_index(X, "binary")
+    write_bundle(tmp_path, index, [str(i) for i in range(100)], {}, vectors=X)
+    loaded, _, meta = load_bundle(tmp_path)
+    assert meta["binary"] and meta["float_vectors"]
+    vectors = load_vectors(tmp_path)
+    assert isinstance(vectors, np.memmap) and np.array_equal(vectors, X)
+    D, I = search_codes(loaded, X[:5], 1)
+    assert (I[:, 0] == np.arange(5)).all() and np.allclose(D[:, 0], 1.0)
@@ -0,0 +1,31 @@
+# tests/test_reranker.py
+import numpy as np
+import pytest
+from src.normalizer.ranking.context_features import ctx_matrix, ctx_score
+from src.normalizer.ranking.reranker import final_score, rerank_batch
+
+NAMES = np.array(["Stanford University", "University of Oxford", "Oxford Brookes University", "MIT"], dtype=object)
+COLS = {"name": NAMES, "country": np.array(["US", "GB", "GB", "US"], dtype=object)}
+W = {"alpha_fuzzy": 0.30, "beta_embed": 0.55, "gamma_ctx": 0.15, "threshold": 0.66}
+
+def test_ctx_matrix_matches_ctx_score():
+    ids = np.array([[1, 2, 0], [3, 0, -1]])
+    ctxs = [{"country": "GB"}, {}]
+    M = ctx_matrix("organizations", ctxs, COLS, ids)
+    for r, ctx in enumerate(ctxs):
+        for c, i in enumerate(ids[r]):
+            want = 0.0 if i < 0 else ctx_score("organizations", ctx, {k: v[i] for k, v in COLS.items()})
+            assert M[r, c] == want
+
+def test_rerank_batch_matches_scalar_final_score():
+    queries = ["univ of oxford", "stanford"]
+    ids = np.array([[2, 1, 0], [0, 3, -1]])
+    embed = np.array([[0.4, 0.5, 0.1], [0.6, 0.2, 0.0]], dtype=np.float32)
+    ctx = ctx_matrix("organizations", [{"country": "GB"}, {}], COLS, ids)
+    top_ids, top_scores = rerank_batch(queries, ids, embed, ctx, NAMES, W, k=3)
+    for r, q in enumerate(queries):
+        scalar = {i: final_score(q, NAMES[i], embed[r, c], ctx[r, c], W) for c, i in enumerate(ids[r]) if i >= 0}
+        best = sorted(scalar, key=lambda i: -scalar[i])
+        assert list(top_ids[r][: len(best)]) == best
+        assert top_scores[r][: len(best)] == pytest.approx([scalar[i] for i in best], abs=1e-5)
+    assert top_ids[1, 2] == -1 and np.isneginf(top_scores[1, 2])
@@ -0,0 +1,47 @@
+# tests/test_rules.py
+import pytest
+from src.normalizer.rules import alias_store
+from src.normalizer.rules.alias_store import ANY, AliasStore
+from src.normalizer.rules.normalize_rules import apply_alias_map, expand_abbrev
+
+def _store():
+    s = AliasStore()
+    s.add("organizations", "MIT", "Massachusetts Institute of Technology")
+    s.add("organizations", "Univ. of Calif., Berkeley", "University of California, Berkeley")
+    s.add("organizations", "univ of calif", "University of California")
+    s.add(ANY, "uk", "United Kingdom")
+    return s.compile()
+
+@pytest.fixture(params=[True, False], ids=["automaton", "token-scan"])
+def store(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(alias_store, "ahocorasick", None)
+    elif alias_store.ahocorasick is None:
+        pytest.skip("pyahocorasick not installed")
+    return _store()
+
+def test_exact_lookup(store):
+    assert store.lookup("organizations", " m.i.t ") is None  # punctuation -> "m i t"
+    assert store.lookup("organizations", "MIT") == "Massachusetts Institute of Technology"
+    assert store.lookup("countries", "U.K.") is None and store.lookup("countries", "UK") == "United Kingdom"
+    assert store.lookup("funders", "mit") is None
+
+def test_find_longest_non_overlapping(store):
+    hits = store.find("organizations", "Dept. of Physics, Univ of Calif Berkeley, UK")
+    assert [(a, c) for _, _, a, c in hits] == [("univ of calif berkeley", "University of California, Berkeley"),
+                                               ("uk", "United Kingdom")]
+    assert store.find("organizations", "summit") == []  # no match inside a token
+
+def test_expand(store):
+    assert store.expand("organizations", "physics dept, MIT") == "physics dept Massachusetts Institute of Technology"
+    assert store.expand("organizations", "Stanford") == "Stanford"
+
+def test_csv_helpers_read_once(tmp_path):
+    p = tmp_path / "org_aliases.csv"
+    p.write_text("alias,canonical\nUCB,\"University of California, Berkeley\"\n")
+    assert apply_alias_map("ucb", str(p)) == "University of California, Berkeley"
+    p.write_text("")  # compiled table is cached for the process
+    assert apply_alias_map("U.C.B.", str(p)) is None and apply_alias_map("UCB", str(p)) is not None
+    j = tmp_path / "common.json"
+    j.write_text('{"univ": "university"}')
+    assert expand_abbrev(["univ", "of", "oxford"], str(j)) == ["university", "of", "oxford"]
@@ -0,0 +1,58 @@
+# tests/test_streaming.py
+import json
+import pytest
+from src.cli.streaming import RowWriter, infer_format, iter_chunks, load_checkpoint, read_chunks, save_checkpoint
+
+FIELDS = ["entity_type", "input"]
+
+def _rows(n, start=0):
+    return [{"entity_type": "org", "input": f"name {i}"} for i in range(start, start + n)]
+
+def test_infer_format():
+    assert infer_format("a.parquet") == "parquet" and infer_format("a.ndjson") == "jsonl"
+    assert infer_format("-") == "csv" and infer_format("a.txt", default="jsonl") == "jsonl"
+
+def test_read_chunks_bounded_and_skip(tmp_path):
+    p = tmp_path / "in.jsonl"
+    p.write_text("".join(json.dumps(r) + "\n" for r in _rows(10)))
+    chunks = list(read_chunks(str(p), "jsonl", 4, skip=3))
+    assert [len(c) for c in chunks] == [4, 3]
+    assert chunks[0][0]["input"] == "name 3"
+
+def test_csv_writer_resumes_at_checkpoint(tmp_path):
+    out, ckpt = str(tmp_path / "out.csv"), str(tmp_path / "out.ckpt")
+    w = RowWriter(out, "csv", FIELDS)
+    w.write(_rows(3))
+    save_checkpoint(ckpt, {"rows_done": 3, **w.sync()})
+    w.write(_rows(2, 3))  # written after the checkpoint, then the run "crashes"
+    w.close()
+    state = load_checkpoint(ckpt)
+    w = RowWriter(out, "csv", FIELDS, resume_from=state)
+    w.write(_rows(2, 3))
+    w.close()
+    lines = open(out).read().splitlines()
+    assert lines[0] == "entity_type,input" and len(lines) == 6 and lines[-1] == "org,name 4"
+
+def test_resume_from_byte_offset(tmp_path):
+    p = tmp_path / "in.csv"
+    p.write_text('entity_type,input\norg,"multi\nline"\norg,Ünï\n' + "".join(f"org,name {i}\n" for i in range(5)),
+                 encoding="utf-8")
+    chunks = list(iter_chunks(str(p), "csv", 2))
+    assert [r["input"] for r in chunks[0][0]] == ["multi\nline", "Ünï"]
+    offset = chunks[0][1]["in_bytes"]
+    resumed = list(read_chunks(str(p), "csv", 10, skip=99, offset=offset))  # the offset wins over skip
+    assert [r["input"] for r in resumed[0]] == [f"name {i}" for i in range(5)]
+    assert chunks[-1][1]["in_bytes"] == p.stat().st_size
+
+    j = tmp_path / "in.jsonl"
+    j.write_text("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in _rows(6)), encoding="utf-8")
+    _, pos = next(iter_chunks(str(j), "jsonl", 4))
+    assert [r["input"] for r in next(read_chunks(str(j), "jsonl", 4, offset=pos["in_bytes"]))] == ["name 4", "name 5"]
+
+def test_parquet_skips_whole_row_groups(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+    p = tmp_path / "in.parquet"
+    pq.write_table(pa.Table.from_pylist(_rows(10)), p, row_group_size=4)
+    chunks = list(read_chunks(str(p), "parquet", 3, skip=5))
+    assert [len(c) for c in chunks] == [3, 2] and chunks[0][0]["input"] == "name 5"
@@ -0,0 +1,23 @@
+# tests/test_text.py
+from src.normalizer.text.normalize import TextNormalizer, basic_clean, clean_batch, strip_org_noise
+from src.normalizer.utils_text import normalize_text
+
+def test_basic_clean_folds_and_strips():
+    assert basic_clean("  Łódź Univ. of Tech.,  ") == "lodz univ of tech"
+    assert basic_clean("École Polytechnique Fédérale") == "ecole polytechnique federale"
+    assert basic_clean("Straße_X-ray") == "strasse x ray"
+    assert normalize_text("M.I.T.") == basic_clean("M.I.T.") == "m i t"
+
+def test_synonyms_and_noise_in_one_pass():
+    n = TextNormalizer(synonyms={"univ": "university", "dept": "department"}, noise=("of", "school of"))
+    assert n("Dept. of Physics, Univ of Tokyo") == "department physics university tokyo"
+    assert n("School of Medicine") == "medicine"
+    assert n("univers") == "univers"  # whole tokens only
+    assert strip_org_noise("Dept of Physics Laboratory, School of  Medicine") == "dept of physics medicine"
+
+def test_batch_matches_single_and_memoizes():
+    texts = ["MIT", "M.I.T", "MIT", ""]
+    assert clean_batch(texts) == [basic_clean(t) for t in texts] == ["mit", "m i t", "mit", ""]
+    n = TextNormalizer()
+    n.normalize_batch(texts)
+    assert n.normalize.cache_info().misses == 3
@@ -1,29 +1,32 @@
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import util
 import json
 from expert_finder.prompt import build_prompt
 from expert_finder.data_loader import load_expert_profiles
+from academic_common.embedding_service import encode, encode_one
 import openai
 import os
 
-model = SentenceTransformer("all-MiniLM-L6-v2")
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
 def find_experts(title, abstract, excluded_institution, preferred_region, min_citations):
     query_text = title + " " + abstract
-    query_embedding = model.encode(query_text, convert_to_tensor=True)
+    query_embedding = encode_one(query_text)
 
-    experts = load_expert_profiles()
-    scored_experts = []
-
-    for expert in experts:
+    experts = []
+    for expert in load_expert_profiles():
         if expert["total_citations"] < min_citations:
             continue
         if excluded_institution and excluded_institution.lower() in expert["affiliation"].lower():
             continue
         if preferred_region and preferred_region.lower() not in expert.get("region", "").lower():
             continue
+        experts.append(expert)
+
+    # one batched (and cached) encode for every remaining profile
+    expert_embeddings = encode([" ".join(expert["expertise"]) for expert in experts])
+    scored_experts = []
 
-        expert_embedding = model.encode(" ".join(expert["expertise"]), convert_to_tensor=True)
+    for expert, expert_embedding in zip(experts, expert_embeddings):
         score = float(util.cos_sim(query_embedding, expert_embedding)[0])
         if score > 0.4:
             expert["score"] = score
@@ -2,12 +2,11 @@
 from typing import List, Dict, Any, Tuple
 import numpy as np
 from collections import Counter, defaultdict
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import util
 import math
 import networkx as nx
 
-# Lightweight embedding model for field names
-_EMB_MODEL = SentenceTransformer("all-MiniLM-L6-v2")
+from academic_common.embedding_service import encode
 
 # -------------------------
 # Stubs: replace with real API fetchers
@@ -52,7 +51,7 @@ def embed_fields(fields: List[str]) -> Dict[str, np.ndarray]:
     unique = list(dict.fromkeys(fields))
     if not unique:
         return {}
-    embs = _EMB_MODEL.encode(unique, convert_to_numpy=True, show_progress_bar=False)
+    embs = encode(unique)
     return {f: embs[i] for i, f in enumerate(unique)}
 
 def cosine_sim(a: np.ndarray, b: np.ndarray) -> float:
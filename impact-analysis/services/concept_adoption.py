@@ -1,28 +1,52 @@
 # concept_adoption.py
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 import re
+import hashlib
+import threading
 import numpy as np
 import math
-from collections import Counter, defaultdict
-from sentence_transformers import SentenceTransformer, util
+from collections import Counter, OrderedDict, defaultdict
+from sentence_transformers import util
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from academic_common.embedding_service import embedding_dim, encode
 
-# Optional: spaCy for noun-phrase extraction (fallback to regex n-grams if not available)
+# Optional: spaCy for noun-phrase extraction (fallback to tokenizer-based chunks if not available).
+# Loaded once, on first use; noun_chunks only needs the tagger + parser, so the rest is excluded.
+SPACY_MODEL = "en_core_web_sm"
+SPACY_EXCLUDE = ["ner", "lemmatizer", "textcat"]
+_nlp = None
+_nlp_loaded = False
+_nlp_lock = threading.Lock()
+
+PHRASE_CACHE_SIZE = 50_000  # documents whose extracted noun phrases are kept, keyed by text hash
+_phrase_cache: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+# Optional: Aho-Corasick for one-pass exact phrase counting (fallback to one regex per phrase)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Optional: FAISS range search for candidate dedup (fallback to blocked numpy GEMM)
 try:
-    import spacy
-    nlp = spacy.load("en_core_web_sm")
-except Exception:
-    nlp = None
+    import faiss
+except ImportError:
+    faiss = None
 
-# Embedding model (lightweight for demo; swap for higher-capacity in prod)
-EMB_MODEL = SentenceTransformer("all-MiniLM-L6-v2")
+SIM_BLOCK = 65536  # citation sentences per candidate x sentence similarity block
+DEDUP_BLOCK = 2048  # candidate rows per similarity block when FAISS is not available
 
 # ----------------------
 # Utilities / Extraction
 # ----------------------
 
+_TOKEN = re.compile(r"\b\w[\w\-\_]+\b")
+_PHRASE_BREAK = re.compile(r"[.,;:!?()\[\]{}\"]")
+
 def simple_tokenize(text: str) -> List[str]:
     # simple whitespace tokenizer + lower
-    return [t.lower() for t in re.findall(r"\b\w[\w\-\_]+\b", text)]
+    return [t.lower() for t in _TOKEN.findall(text)]
 
 def extract_ngrams(text: str, n_min=1, n_max=4, min_freq=1) -> Counter:
     """
@@ -36,7 +60,7 @@ def extract_ngrams(text: str, n_min=1, n_max=4, min_freq=1) -> Counter:
         for i in range(L - n + 1):
             ng = " ".join(tokens[i:i+n])
             # simple filter: remove stop-ish tokens and extremely common single words
-            if re.search(r'^[0-9]+$', ng):
+            if ng.isascii() and ng.isdigit():
                 continue
             if len(ng) < 3:
                 continue
@@ -44,22 +68,74 @@ def extract_ngrams(text: str, n_min=1, n_max=4, min_freq=1) -> Counter:
     # filter by min_freq
     return Counter({k:v for k,v in c.items() if v >= min_freq})
 
+def get_nlp():
+    """The shared spaCy pipeline, or None when spaCy / the model is not installed."""
+    global _nlp, _nlp_loaded
+    with _nlp_lock:
+        if not _nlp_loaded:
+            try:
+                import spacy
+                _nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+            except Exception:
+                _nlp = None
+            _nlp_loaded = True
+        return _nlp
+
+def _doc_key(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def tokenizer_phrases(text: str, max_len: int = 4) -> Tuple[str, ...]:
+    """
+    spaCy-free noun-phrase approximation: split the token stream at stopwords and punctuation and
+    keep the runs in between (runs longer than max_len contribute their 2- and 3-token windows).
+    """
+    phrases = []
+    for segment in _PHRASE_BREAK.split(text.lower()):
+        run = []
+        for tok in _TOKEN.findall(segment) + [""]:
+            if tok and tok not in ENGLISH_STOP_WORDS and not tok.isdigit():
+                run.append(tok)
+                continue
+            if len(run) <= max_len:
+                if run:
+                    phrases.append(" ".join(run))
+            else:
+                phrases.extend(" ".join(run[i:i+n]) for n in (2, 3) for i in range(len(run) - n + 1))
+            run = []
+    return tuple(dict.fromkeys(phrases))
+
+def extract_noun_phrases_batch(texts: Sequence[str], min_len=2, n_process: int = 1, batch_size: int = 64) -> List[List[str]]:
+    """
+    Noun phrases for many documents. Documents already seen (same text hash) come from the cache;
+    the rest stream through one nlp.pipe call with n_process workers, or the tokenizer path without spaCy.
+    """
+    keys = [_doc_key(t) for t in texts]
+    with _cache_lock:
+        missing = {k: t for k, t in zip(keys, texts) if k not in _phrase_cache}
+    extracted: Dict[str, Tuple[str, ...]] = {}
+    if missing:
+        nlp = get_nlp()
+        if nlp is not None:
+            docs = nlp.pipe(missing.values(), n_process=n_process, batch_size=batch_size)
+            phrases = (tuple(chunk.text.strip().lower() for chunk in doc.noun_chunks) for doc in docs)
+        else:
+            phrases = (tokenizer_phrases(t) for t in missing.values())
+        extracted = dict(zip(missing, phrases))
+    with _cache_lock:
+        _phrase_cache.update(extracted)
+        found = {k: _phrase_cache[k] for k in keys if k in _phrase_cache}
+        for k in found:
+            _phrase_cache.move_to_end(k)
+        while len(_phrase_cache) > PHRASE_CACHE_SIZE:
+            _phrase_cache.popitem(last=False)
+    found.update(extracted)  # in case the cache was smaller than this batch
+    return [[p for p in found[k] if len(p.split()) >= min_len] for k in keys]
+
 def extract_noun_phrases(text: str, min_len=2) -> List[str]:
     """
-    Extract noun phrases using spaCy if available; fallback to n-grams.
+    Extract noun phrases using spaCy if available; fallback to tokenizer-based chunks.
     """
-    if nlp:
-        doc = nlp(text)
-        phrases = []
-        for np in doc.noun_chunks:
-            s = np.text.strip().lower()
-            if len(s.split()) >= min_len:
-                phrases.append(s)
-        return phrases
-    else:
-        # fallback: return common 2-3 grams
-        ng = extract_ngrams(text, n_min=2, n_max=3, min_freq=1)
-        return list(ng.keys())
+    return extract_noun_phrases_batch([text], min_len=min_len)[0]
 
 def detect_formulae(text: str) -> List[str]:
     """
@@ -83,34 +159,77 @@ def detect_formulae(text: str) -> List[str]:
 
 def embed_texts(texts: List[str]) -> np.ndarray:
     if not texts:
-        return np.zeros((0, EMB_MODEL.get_sentence_embedding_dimension()))
-    return EMB_MODEL.encode(texts, convert_to_numpy=True, show_progress_bar=False)
+        return np.zeros((0, embedding_dim()))
+    return encode(texts)
 
-def deduplicate_candidates(candidates: List[str], threshold: float = 0.85) -> List[str]:
+def similar_pairs(embs: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Neighbour lists (CSR: indptr, indices) of every row with cosine similarity >= threshold, self included.
+    FAISS range search when available, otherwise DEDUP_BLOCK rows at a time; memory is O(N + pairs).
+    """
+    X = np.ascontiguousarray(embs / np.maximum(np.linalg.norm(embs, axis=1, keepdims=True), 1e-8), dtype=np.float32)
+    n = X.shape[0]
+    if faiss is not None:
+        index = faiss.IndexFlatIP(X.shape[1])
+        index.add(X)
+        lims, D, I = index.range_search(X, threshold - 1e-6)  # faiss keeps scores > radius; re-apply >=
+        rows = np.repeat(np.arange(n), np.diff(lims).astype(np.int64))
+        keep = D >= threshold
+        rows, cols = rows[keep], I[keep]
+    else:
+        parts = []
+        for start in range(0, n, DEDUP_BLOCK):
+            r, c = np.nonzero(X[start:start + DEDUP_BLOCK] @ X.T >= threshold)
+            parts.append((r + start, c))
+        rows, cols = (np.concatenate(p) for p in zip(*parts)) if parts else (np.zeros(0, int), np.zeros(0, int))
+    order = np.lexsort((cols, rows))
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n))])
+    return indptr, cols[order].astype(np.int64)
+
+def deduplicate_candidates(candidates: List[str], threshold: float = 0.85, transitive: bool = False) -> List[str]:
     """
     Deduplicate list of phrase candidates using embeddings:
       - If two candidates have cosine similarity >= threshold, keep the longer/more frequent one.
+    Candidates are visited longest first (ties: input order); each kept phrase absorbs its
+    still-unabsorbed neighbours. transitive=True instead merges whole connected components
+    (union-find) and keeps the longest phrase of each.
     Returns list of representative candidates.
     """
     if not candidates:
         return []
     embs = embed_texts(candidates)
-    keep = []
-    used = set()
-    sims = util.cos_sim(embs, embs).cpu().numpy()
+    indptr, nbrs = similar_pairs(embs, threshold)
     # score by length (longer / more tokens prioritized)
     scores = [len(c.split()) for c in candidates]
     order = sorted(range(len(candidates)), key=lambda i: (-scores[i], i))
+    if transitive:
+        parent = list(range(len(candidates)))
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        for i in range(len(candidates)):
+            for j in nbrs[indptr[i]:indptr[i+1]]:
+                ri, rj = find(i), find(int(j))
+                if ri != rj:
+                    parent[rj] = ri
+        seen = set()
+        keep = []
+        for idx in order:  # first member of a component in this order is its longest phrase
+            root = find(idx)
+            if root not in seen:
+                seen.add(root)
+                keep.append(candidates[idx])
+        return keep
+    used = np.zeros(len(candidates), dtype=bool)
+    keep = []
     for idx in order:
-        if idx in used:
+        if used[idx]:
             continue
         keep.append(candidates[idx])
         # mark others as used if similar
-        for j in range(len(candidates)):
-            if j == idx or j in used:
-                continue
-            if sims[idx, j] >= threshold:
-                used.add(j)
+        used[nbrs[indptr[idx]:indptr[idx+1]]] = True
     return keep
 
 # ----------------------
@@ -134,23 +253,102 @@ def semantic_match(phrase: str, doc_text: str, doc_emb: np.ndarray, phrase_emb:
     sims = util.cos_sim(phrase_emb, doc_emb).cpu().numpy().flatten()
     return bool((sims >= sim_threshold).any())
 
+def split_sentences(doc_text: str) -> List[str]:
+    # naive split by punctuation; swap to nltk.sent_tokenize if available
+    return [s.strip() for s in re.split(r'(?<=[\.\?\!])\s+', doc_text) if s.strip()]
+
 def build_doc_sentence_embeddings(doc_text: str) -> Tuple[List[str], np.ndarray]:
     """
     Split doc into sentences and embed them. Return (sentences, embeddings).
     Uses a naive sentence splitter.
     """
-    # naive split by punctuation; swap to nltk.sent_tokenize if available
-    sents = [s.strip() for s in re.split(r'(?<=[\.\?\!])\s+', doc_text) if s.strip()]
+    sents = split_sentences(doc_text)
     if not sents:
-        return [], np.zeros((0, EMB_MODEL.get_sentence_embedding_dimension()))
+        return [], np.zeros((0, embedding_dim()))
     embs = embed_texts(sents)
     return sents, embs
 
+# ----------------------
+# Vectorized matching
+# ----------------------
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+class PhraseMatcher:
+    """
+    Exact, case-insensitive, whole-word phrase counts for many phrases at once: one Aho-Corasick
+    pass per document, with the same \\b boundaries and non-overlapping counting as
+    exact_ngram_match_count (which remains the fallback without pyahocorasick).
+    """
+    def __init__(self, phrases: List[str]):
+        self.phrases = phrases
+        self.automaton = None
+        if ahocorasick is not None and phrases:
+            self.automaton = ahocorasick.Automaton()
+            for i, p in enumerate(phrases):
+                key = p.lower()
+                if key:
+                    _, ids = self.automaton.get(key, (len(key), []))
+                    ids.append(i)  # phrases that only differ in case share one key
+                    self.automaton.add_word(key, (len(key), ids))
+            self.automaton.make_automaton()
+
+    def _regex_counts(self, text: str) -> np.ndarray:
+        return np.array([exact_ngram_match_count(p, text) for p in self.phrases], dtype=np.int64)
+
+    def counts(self, text: str) -> np.ndarray:
+        low = text.lower()
+        if self.automaton is None or len(low) != len(text):  # rare Unicode where lowercasing shifts offsets
+            return self._regex_counts(text)
+        out = np.zeros(len(self.phrases), dtype=np.int64)
+        last_end = {}
+        n = len(low)
+        for end, (length, ids) in self.automaton.iter(low):
+            start = end - length + 1
+            # \b: word-ness must change at both edges of the occurrence
+            if (start > 0 and _is_word(low[start - 1])) == _is_word(low[start]):
+                continue
+            if (end + 1 < n and _is_word(low[end + 1])) == _is_word(low[end]):
+                continue
+            if start <= last_end.get(ids[0], -1):  # findall does not count overlapping occurrences
+                continue
+            last_end[ids[0]] = end
+            out[ids] += 1
+        return out
+
+def max_sentence_similarity(cand_embs: np.ndarray, sent_embs: np.ndarray, doc_offsets: np.ndarray) -> np.ndarray:
+    """
+    (n_candidates x n_docs) max cosine similarity between each candidate and any sentence of each doc.
+    sent_embs stacks every doc's sentences; doc i owns rows doc_offsets[i]:doc_offsets[i+1].
+    Docs without sentences get -inf. Candidate x sentence similarities are one GEMM per block of
+    SIM_BLOCK sentences, reduced per doc with np.maximum.reduceat.
+    """
+    n_docs = len(doc_offsets) - 1
+    out = np.full((len(cand_embs), n_docs), -np.inf, dtype=np.float32)
+    if not len(cand_embs) or not len(sent_embs):
+        return out
+    unit = lambda X: (X / np.maximum(np.linalg.norm(X, axis=1, keepdims=True), 1e-8)).astype(np.float32)
+    C, S = unit(cand_embs), unit(sent_embs)
+    nonempty = np.flatnonzero(np.diff(doc_offsets) > 0)
+    lo = 0
+    while lo < len(nonempty):
+        # whole docs per block, at least one doc even if it alone exceeds SIM_BLOCK
+        first = doc_offsets[nonempty[lo]]
+        hi = max(lo + 1, int(np.searchsorted(doc_offsets[nonempty + 1], first + SIM_BLOCK, side="right")))
+        docs = nonempty[lo:hi]
+        last = doc_offsets[docs[-1] + 1]
+        sims = C @ S[first:last].T
+        out[:, docs] = np.maximum.reduceat(sims, doc_offsets[docs] - first, axis=1)
+        lo = hi
+    return out
+
 # ----------------------
 # Main function
 # ----------------------
 
-def build_candidate_concepts(paper_text: str, top_k_ngrams=60, ngram_min_freq=1) -> List[str]:
+def build_candidate_concepts(paper_text: str, top_k_ngrams=60, ngram_min_freq=1,
+                             noun_phrases: Optional[List[str]] = None) -> List[str]:
     """
     Extract candidate concept phrases combining noun-phrases, n-grams, formulae.
     Returns deduplicated representative candidates.
@@ -158,7 +356,8 @@ def build_candidate_concepts(paper_text: str, top_k_ngrams=60, ngram_min_freq=1)
     ngram_counts = extract_ngrams(paper_text, n_min=1, n_max=4, min_freq=ngram_min_freq)
     top_ngrams = [ng for ng,_ in ngram_counts.most_common(top_k_ngrams)]
 
-    noun_phrases = extract_noun_phrases(paper_text, min_len=1)
+    if noun_phrases is None:
+        noun_phrases = extract_noun_phrases(paper_text, min_len=1)
     formulae = detect_formulae(paper_text)
 
     combined = list(dict.fromkeys(top_ngrams + noun_phrases + formulae))  # preserve order, dedupe
@@ -166,6 +365,11 @@ def build_candidate_concepts(paper_text: str, top_k_ngrams=60, ngram_min_freq=1)
     candidates = deduplicate_candidates(combined, threshold=0.86)
     return candidates
 
+def build_candidate_concepts_many(paper_texts: List[str], n_process: int = 1, **kwargs) -> List[List[str]]:
+    """build_candidate_concepts for many papers, with noun phrases from one batched nlp.pipe pass."""
+    phrases = extract_noun_phrases_batch(paper_texts, min_len=1, n_process=n_process)
+    return [build_candidate_concepts(t, noun_phrases=p, **kwargs) for t, p in zip(paper_texts, phrases)]
+
 def compute_concept_adoption(paper: Dict[str, Any], citations: List[Dict[str, Any]],
                              sim_threshold_semantic: float = 0.72,
                              semantic_count_threshold: int = 1) -> Dict[str, Any]:
@@ -179,42 +383,30 @@ def compute_concept_adoption(paper: Dict[str, Any], citations: List[Dict[str, An
     paper_text = (paper.get("title","") + "\n\n" + paper.get("abstract","")).strip()
     candidates = build_candidate_concepts(paper_text)
 
-    # precompute embeddings for candidates
-    cand_embs = embed_texts(candidates)
+    # every citation sentence in one stacked matrix (doc i owns rows offsets[i]:offsets[i+1]),
+    # embedded together with the candidates in one batched call
+    texts = [c.get("text") or (c.get("title","") + "\n\n" + c.get("abstract","")) for c in citations]
+    doc_sents = [split_sentences(t) for t in texts]
+    offsets = np.concatenate([[0], np.cumsum([len(s) for s in doc_sents])]).astype(np.int64)
+    embs = embed_texts(candidates + [s for sents in doc_sents for s in sents])
+    cand_embs, sent_embs = embs[:len(candidates)], embs[len(candidates):]
 
-    # prepare citations: for each citation build a combined text and sentence embeddings
-    prepared = []
-    for c in citations:
-        text = c.get("text") or (c.get("title","") + "\n\n" + c.get("abstract",""))
-        sents, sent_embs = build_doc_sentence_embeddings(text)
-        prepared.append({"meta": c, "text": text, "sents": sents, "sent_embs": sent_embs})
+    # (candidates x docs): exact phrase counts, one automaton pass per doc; semantic hit where no exact one
+    matcher = PhraseMatcher(candidates)
+    exact = np.stack([matcher.counts(t) for t in texts], axis=1) if texts else np.zeros((len(candidates), 0), dtype=np.int64)
+    semantic = (exact == 0) & (max_sentence_similarity(cand_embs, sent_embs, offsets) >= sim_threshold_semantic)
+    used = (exact > 0) | semantic
 
     # per-concept stats
     concept_stats = {}
     for idx, concept in enumerate(candidates):
-        cemb = cand_embs[idx:idx+1]
-        exact_count = 0
-        semantic_count = 0
-        first_year = None
-        years = []
-        matched_docs = []
-        for doc in prepared:
-            ex = exact_ngram_match_count(concept, doc["text"])
-            sem = 0
-            if not ex:
-                # semantic match
-                if semantic_match(concept, doc["text"], doc["sent_embs"], cemb, sim_threshold_semantic):
-                    sem = 1
-            used = ex or sem
-            if used:
-                semantic_count += sem
-                exact_count += ex
-                y = doc["meta"].get("year")
-                if y:
-                    years.append(y)
-                    if first_year is None or y < first_year:
-                        first_year = y
-                matched_docs.append({"meta": doc["meta"], "exact_matches": ex, "semantic_match": bool(sem)})
+        docs = np.flatnonzero(used[idx])
+        exact_count = int(exact[idx, docs].sum())
+        semantic_count = int(semantic[idx, docs].sum())
+        years = [y for y in (citations[d].get("year") for d in docs) if y]
+        first_year = min(years) if years else None
+        matched_docs = [{"meta": citations[d], "exact_matches": int(exact[idx, d]), "semantic_match": bool(semantic[idx, d])}
+                        for d in docs]
         total_matches = len(matched_docs)
         # adoption velocity: matches per year since publication (if year present)
         pub_year = paper.get("year")
@@ -1,15 +1,17 @@
 # diffusion.py
 from typing import List, Dict, Any, Tuple
 import numpy as np
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import util
 from sklearn.decomposition import PCA
 from sklearn.cluster import KMeans
 from collections import Counter, defaultdict
 import math
 import datetime
+import os
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
 
-# Load embedding model (choose lightweight model for speed in demo)
-_EMBED_MODEL = SentenceTransformer("all-MiniLM-L6-v2")
+from academic_common.embedding_service import embedding_dim, encode
 
 # -------------------------
 # Utilities
@@ -17,9 +19,8 @@ _EMBED_MODEL = SentenceTransformer("all-MiniLM-L6-v2")
 def embed_texts(texts: List[str]) -> np.ndarray:
     """Return numpy array of embeddings for a list of texts."""
     if not texts:
-        return np.zeros((0, _EMBED_MODEL.get_sentence_embedding_dimension()))
-    embs = _EMBED_MODEL.encode(texts, convert_to_numpy=True, show_progress_bar=False)
-    return embs
+        return np.zeros((0, embedding_dim()))
+    return encode(texts)
 
 def cosine_distance(a: np.ndarray, b: np.ndarray) -> float:
     """1 - cosine_similarity"""
@@ -64,6 +65,10 @@ def fetch_citations(paper_id: str) -> List[Dict[str, Any]]:
 # -------------------------
 # Core diffusion calculations
 # -------------------------
+def citation_text(c: Dict[str, Any]) -> str:
+    """Title + abstract, the text embedded for papers and citations alike."""
+    return (c.get("title","") + "\n\n" + c.get("abstract","")).strip()
+
 def build_citation_corpus(paper: Dict[str, Any], citations: List[Dict[str, Any]]) -> Tuple[List[str], np.ndarray, np.ndarray]:
     """
     Returns:
@@ -71,12 +76,7 @@ def build_citation_corpus(paper: Dict[str, Any], citations: List[Dict[str, Any]]
       - emb_all: embeddings array (N x D) aligned with texts
       - emb_paper: embedding vector for the focal paper
     """
-    paper_text = (paper.get("title","") + "\n\n" + paper.get("abstract","")).strip()
-    citation_texts = []
-    for c in citations:
-        text = (c.get("title","") + "\n\n" + c.get("abstract","")).strip()
-        citation_texts.append(text)
-    texts = [paper_text] + citation_texts
+    texts = [citation_text(paper)] + [citation_text(c) for c in citations]
     emb_all = embed_texts(texts)
     emb_paper = emb_all[0:1, :]
     return texts, emb_all, emb_paper
@@ -103,6 +103,12 @@ def cluster_topics(embeddings: np.ndarray, k: int = 4) -> List[int]:
     labels = km.fit_predict(embeddings)
     return labels.tolist()
 
+def project_and_cluster(emb_all: np.ndarray) -> Tuple[np.ndarray, List[int]]:
+    """Per-paper PCA projection + KMeans labels (the same calls the single-paper path makes)."""
+    coords = topic_projection(emb_all)
+    labels = cluster_topics(emb_all, k=min(6, max(1, emb_all.shape[0]//3)))
+    return coords, labels
+
 # -------------------------
 # Metric computations
 # -------------------------
@@ -122,25 +128,29 @@ def normalized_entropy(counter: Dict[Any, int]) -> float:
     maxH = math.log(len(props), 2) if len(props) > 1 else 1.0
     return float(H / maxH) if maxH > 0 else 0.0
 
+# naive keyword mapping for demo (replace with real classifier)
+VENUE_TO_DISCIPLINE = {
+    "chem": "Chemistry", "bio": "Biology", "ml": "Computer Science", "phys": "Physics", "chemistry":"Chemistry"
+}
+
+def venue_discipline(venue: str) -> str:
+    v = (venue or "").lower()
+    for k, d in VENUE_TO_DISCIPLINE.items():
+        if k in v:
+            return d
+    return "Other"
+
+def citation_countries(c: Dict[str, Any]) -> set:
+    affs = c.get("affiliations", []) or []
+    return {a.get("country") for a in affs if a.get("country")}
+
 def compute_breadth_by_disciplines(citations: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Input: citations with 'venue' or 'venue_subjects' or classification.
     Basic heuristic: map venues to disciplines by keyword (production-ready: call classification API).
     Output: dict with discipline_counts, discipline_entropy, n_disciplines
     """
-    # naive keyword mapping for demo (replace with real classifier)
-    venue_to_discipline = {
-        "chem": "Chemistry", "bio": "Biology", "ml": "Computer Science", "phys": "Physics", "chemistry":"Chemistry"
-    }
-    counts = Counter()
-    for c in citations:
-        v = (c.get("venue") or "").lower()
-        disc = "Other"
-        for k, d in venue_to_discipline.items():
-            if k in v:
-                disc = d
-                break
-        counts[disc] += 1
+    counts = Counter(venue_discipline(c.get("venue")) for c in citations)
     return {
         "discipline_counts": dict(counts),
         "discipline_entropy_norm": normalized_entropy(counts),
@@ -153,8 +163,7 @@ def compute_geographic_spread(citations: List[Dict[str, Any]]) -> Dict[str, Any]
     """
     country_counts = Counter()
     for c in citations:
-        affs = c.get("affiliations", []) or []
-        countries = {a.get("country") for a in affs if a.get("country")}
+        countries = citation_countries(c)
         if not countries:
             country_counts["Unknown"] += 1
         else:
@@ -219,11 +228,8 @@ def compute_knowledge_diffusion_score(paper: Dict[str, Any], citations: List[Dic
     # Build corpora and embeddings
     texts, emb_all, emb_paper = build_citation_corpus(paper, citations)
 
-    # Topic projection for plotting
-    coords = topic_projection(emb_all)  # N x 2
-
-    # Clustering in topic space (helps breadth measure)
-    labels = cluster_topics(emb_all, k= min(6, max(1, emb_all.shape[0]//3)))
+    # Topic projection for plotting (N x 2) and clustering in topic space (helps breadth measure)
+    coords, labels = project_and_cluster(emb_all)
 
     # Metrics
     breadth = compute_breadth_by_disciplines(citations)
@@ -231,7 +237,12 @@ def compute_knowledge_diffusion_score(paper: Dict[str, Any], citations: List[Dic
     lang = compute_language_spread(citations)
     depth = compute_depth(emb_all, emb_paper)
     temporal = compute_temporal_diffusion(citations, paper.get("year", datetime.datetime.now().year))
+    return compose_diffusion_result(paper, len(citations), breadth, geo, lang, depth, temporal, coords, labels)
 
+def compose_diffusion_result(paper: Dict[str, Any], n_citations: int, breadth: Dict[str, Any], geo: Dict[str, Any],
+                             lang: Dict[str, Any], depth: Dict[str, Any], temporal: Dict[str, Any],
+                             coords: np.ndarray, labels: List[int]) -> Dict[str, Any]:
+    """Weight the component metrics into the 0-100 score and format the result (shared by single and portfolio mode)."""
     # Compose normalized components (all between 0..1)
     comp_breadth = breadth["discipline_entropy_norm"]  # 0..1
     comp_geo = geo["country_entropy_norm"]  # 0..1
@@ -257,7 +268,7 @@ def compute_knowledge_diffusion_score(paper: Dict[str, Any], citations: List[Dic
     # Format output
     result = {
         "paper": {"title": paper.get("title"), "doi": paper.get("doi"), "year": paper.get("year")},
-        "n_citations": len(citations),
+        "n_citations": n_citations,
         "components": {
             "breadth": {"value": comp_breadth, **breadth},
             "geography": {"value": comp_geo, **geo},
@@ -278,3 +289,100 @@ def compute_knowledge_diffusion_score(paper: Dict[str, Any], citations: List[Dic
         }
     }
     return result
+
+# -------------------------
+# Portfolio mode
+# -------------------------
+def build_citation_table(papers: List[Dict[str, Any]], citations: List[List[Dict[str, Any]]]) -> pd.DataFrame:
+    """
+    One row per (paper, citing paper): paper (position in papers), text, year, discipline, language,
+    countries (tuple). Citing papers shared by several portfolio papers appear once per paper.
+    """
+    now = datetime.datetime.now().year
+    rows = []
+    for i, (paper, cites) in enumerate(zip(papers, citations)):
+        paper_year = paper.get("year", now)
+        for c in cites:
+            rows.append((i, paper_year, citation_text(c), c.get("year", paper_year), c.get("venue") or "",
+                         c.get("language","unknown"), tuple(citation_countries(c))))
+    df = pd.DataFrame(rows, columns=["paper", "paper_year", "text", "year", "venue", "language", "countries"])
+    df["paper"] = df["paper"].astype(np.int64)
+    venues, venue_idx = pd.factorize(df["venue"])  # classify each distinct venue once
+    df["discipline"] = np.array([venue_discipline(v) for v in venue_idx], dtype=object)[venues] if len(df) else []
+    return df
+
+def _entropy_by_paper(df: pd.DataFrame, col: str) -> Tuple[Dict[int, Dict[Any, int]], pd.Series, pd.Series]:
+    """Per paper: {value: count}, normalized entropy and number of distinct values (as normalized_entropy)."""
+    counts = df.groupby(["paper", col], sort=False, dropna=False).size()
+    p = counts / counts.groupby(level=0).transform("sum")
+    H = -(p * np.log2(p)).groupby(level=0).sum()
+    n = counts.groupby(level=0).size()
+    maxH = np.log2(n.where(n > 1, 2)).where(n > 1, 1.0)
+    as_dict: Dict[int, Dict[Any, int]] = defaultdict(dict)
+    for (paper, value), count in counts.items():
+        as_dict[paper][value] = int(count)
+    return as_dict, H / maxH, n
+
+def compute_portfolio_diffusion_scores(papers: List[Dict[str, Any]], citations: List[List[Dict[str, Any]]],
+                                       workers: int = None) -> List[Dict[str, Any]]:
+    """
+    compute_knowledge_diffusion_score for many papers at once (citations[i] are the citing papers of papers[i]).
+    Every distinct paper/citation text is embedded once for the whole portfolio, the discipline, geography,
+    language, depth and temporal metrics are group-bys over a single citation table, and the per-paper
+    PCA + KMeans run in a process pool (workers=1 runs them in-process). Results are in input order.
+    """
+    now = datetime.datetime.now().year
+    df = build_citation_table(papers, citations)
+    n_papers = len(papers)
+    paper_texts = [citation_text(p) for p in papers]
+    codes, uniq = pd.factorize(pd.Series(paper_texts + df["text"].tolist(), dtype=object))
+    emb = encode(list(uniq)) if len(uniq) else np.zeros((0, embedding_dim()))
+    paper_rows, cite_rows = codes[:n_papers], codes[n_papers:]
+
+    # depth: cosine distance of each citing paper to its focal paper
+    unit = emb / np.maximum(np.linalg.norm(emb, axis=1, keepdims=True), 1e-8)
+    df["dist"] = 1.0 - np.einsum("ij,ij->i", unit[cite_rows], unit[paper_rows[df["paper"].to_numpy()]])
+    by_paper = df.groupby("paper", sort=False)
+    avg_dist, p90_dist = by_paper["dist"].mean(), by_paper["dist"].quantile(0.9)
+
+    disc_counts, disc_H, n_disc = _entropy_by_paper(df, "discipline")
+    lang_counts, lang_H, n_lang = _entropy_by_paper(df, "language")
+    geo = df[["paper", "countries"]].explode("countries")
+    geo["countries"] = geo["countries"].fillna("Unknown")
+    country_counts, country_H, _ = _entropy_by_paper(geo, "countries")
+    n_countries = geo[geo["countries"] != "Unknown"].groupby("paper")["countries"].nunique()
+    early_share = (df["year"] <= df["paper_year"] + 2).groupby(df["paper"]).mean()
+    median_year = by_paper["year"].median()
+    n_cites = by_paper.size()
+
+    # per-paper embedding matrices (focal paper first), projected and clustered in parallel
+    paper_of = df["paper"].to_numpy()
+    order = np.argsort(paper_of, kind="stable")
+    bounds = np.searchsorted(paper_of[order], np.arange(n_papers + 1))
+    mats = [emb[np.concatenate([paper_rows[i:i+1], cite_rows[order[bounds[i]:bounds[i+1]]]])] for i in range(n_papers)]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and n_papers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            projected = list(pool.map(project_and_cluster, mats, chunksize=max(1, n_papers // (workers * 4))))
+    else:
+        projected = [project_and_cluster(m) for m in mats]
+
+    results = []
+    for i, paper in enumerate(papers):
+        has = i in n_cites.index  # papers without citations keep the single-paper defaults
+        get = lambda per_paper, default: per_paper.get(i, default)
+        nc = get(n_countries, 0)
+        results.append(compose_diffusion_result(
+            paper, int(get(n_cites, 0)),
+            {"discipline_counts": get(disc_counts, {}), "discipline_entropy_norm": float(get(disc_H, 0.0)),
+             "n_disciplines": int(get(n_disc, 0))},
+            {"country_counts": get(country_counts, {}), "country_entropy_norm": float(get(country_H, 0.0)),
+             "n_countries": int(nc), "coverage": nc / (nc + 1)},
+            {"language_counts": get(lang_counts, {}), "language_entropy_norm": float(get(lang_H, 0.0)),
+             "n_languages": int(get(n_lang, 0))},
+            {"avg_distance": min(max(float(avg_dist[i]), 0.0), 1.0) if has else 0.0,
+             "p90_distance": min(max(float(p90_dist[i]), 0.0), 1.0) if has else 0.0},
+            {"early_share": float(early_share[i]), "median_year": int(median_year[i])} if has
+            else {"early_share": 0.0, "median_year": paper.get("year", now)},
+            *projected[i]))
+    return results
@@ -0,0 +1,199 @@
+# diffusion_state.py
+# Incremental knowledge-diffusion metrics: a small persisted state per paper that a citation feed
+# updates in O(new citations), instead of re-running compute_knowledge_diffusion_score from scratch.
+from typing import List, Dict, Any, Optional
+from collections import Counter
+from pathlib import Path
+import datetime
+import hashlib
+import json
+import os
+import numpy as np
+
+from services.diffusion import (citation_countries, citation_text, compose_diffusion_result, normalized_entropy,
+                                venue_discipline)
+from academic_common.embedding_service import encode, encode_one
+
+DEPTH_BINS = 2048  # histogram sketch over cosine distance [0, 2]; p90 is exact to within one bin (~0.001)
+
+def citation_key(c: Dict[str, Any]) -> str:
+    """Stable id for a citing paper, so a feed that re-sends a citation does not count it twice."""
+    ident = c.get("doi") or c.get("id") or citation_text(c)
+    return hashlib.blake2b(str(ident).encode("utf-8"), digest_size=8).hexdigest()
+
+def _key_int(key: str) -> int:
+    return int(key, 16)  # citation_key is a 64-bit digest; stored as uint64
+
+def _hist_quantile(hist: Dict[int, int], q: float) -> float:
+    """Linear-interpolation quantile (as np.percentile) read off the distance histogram."""
+    n = sum(hist.values())
+    if not n:
+        return 0.0
+    bins = sorted(hist)
+    cum = np.cumsum([hist[b] for b in bins])
+    target = q * (n - 1)
+    r0 = int(target)
+    r1 = min(r0 + 1, n - 1)
+    v0, v1 = ((bins[int(np.searchsorted(cum, r + 1))] + 0.5) * 2.0 / DEPTH_BINS for r in (r0, r1))
+    return v0 + (target - r0) * (v1 - v0)
+
+class DiffusionState:
+    """
+    Running diffusion metrics for one paper:
+      - discipline / country / language counters (entropies are read from these)
+      - depth: running sum of cosine distances + a fixed-bin histogram sketch for p90
+      - year histogram (early share, median year)
+      - the exact set of citation keys already counted, a sorted uint64 array (8 bytes per citation)
+    The paper embedding is not stored; the embedding service cache makes re-encoding it free.
+    Keys are kept out of to_dict(): DiffusionStateStore appends new ones to a sidecar file, so the
+    JSON stays constant-size and a save writes O(new citations).
+    """
+    def __init__(self, paper: Dict[str, Any]):
+        self.paper = {k: paper[k] for k in ("title", "abstract", "doi", "id", "year") if k in paper}
+        self.n_citations = 0
+        self.disciplines: Counter = Counter()
+        self.countries: Counter = Counter()
+        self.languages: Counter = Counter()
+        self.years: Counter = Counter()
+        self.depth_sum = 0.0
+        self.depth_hist: Counter = Counter()
+        self.seen = np.empty(0, dtype=np.uint64)
+        self.unsaved: List[int] = []  # keys counted since the last save, in insertion order
+
+    @property
+    def paper_year(self) -> int:
+        return self.paper.get("year") or datetime.datetime.now().year
+
+    def update(self, citations: List[Dict[str, Any]]) -> int:
+        """Fold new citations into the state; returns how many were new."""
+        keys = np.array([_key_int(citation_key(c)) for c in citations], dtype=np.uint64)
+        pos = np.minimum(np.searchsorted(self.seen, keys), max(len(self.seen) - 1, 0))
+        counted = self.seen[pos] == keys if len(self.seen) else np.zeros(len(keys), dtype=bool)
+        fresh, batch = [], {}
+        for c, k, old in zip(citations, keys.tolist(), counted):
+            if not old and k not in batch:
+                batch[k] = None
+                fresh.append(c)
+        if not fresh:
+            return 0
+        paper_vec = encode_one(citation_text(self.paper))
+        cite_vecs = encode([citation_text(c) for c in fresh])
+        norms = np.linalg.norm(cite_vecs, axis=1) * max(float(np.linalg.norm(paper_vec)), 1e-8)
+        dists = 1.0 - (cite_vecs @ paper_vec) / np.maximum(norms, 1e-8)
+        bins = np.clip((dists * DEPTH_BINS / 2.0).astype(int), 0, DEPTH_BINS - 1)
+        self.depth_sum += float(dists.sum())
+        self.depth_hist.update(bins.tolist())
+        for c in fresh:
+            self.disciplines[venue_discipline(c.get("venue"))] += 1
+            countries = citation_countries(c)
+            self.countries.update(countries or ["Unknown"])
+            self.languages[c.get("language", "unknown")] += 1
+            self.years[c.get("year", self.paper_year)] += 1
+        self.n_citations += len(fresh)
+        new = np.fromiter(batch, dtype=np.uint64, count=len(batch))
+        self.seen = np.insert(self.seen, np.searchsorted(self.seen, new), new)  # new keys are distinct from seen
+        self.unsaved.extend(batch)
+        return len(fresh)
+
+    def result(self) -> Dict[str, Any]:
+        """Same shape as compute_knowledge_diffusion_score; coords/labels are empty (they need the full corpus)."""
+        n = self.n_citations
+        n_countries = len([k for k in self.countries if k != "Unknown"])
+        breadth = {"discipline_counts": dict(self.disciplines),
+                   "discipline_entropy_norm": normalized_entropy(self.disciplines),
+                   "n_disciplines": len(self.disciplines)}
+        geo = {"country_counts": dict(self.countries), "country_entropy_norm": normalized_entropy(self.countries),
+               "n_countries": n_countries, "coverage": n_countries / (n_countries + 1)}
+        lang = {"language_counts": dict(self.languages), "language_entropy_norm": normalized_entropy(self.languages),
+                "n_languages": len(self.languages)}
+        depth = {"avg_distance": min(max(self.depth_sum / n, 0.0), 1.0) if n else 0.0,
+                 "p90_distance": min(max(_hist_quantile(self.depth_hist, 0.9), 0.0), 1.0) if n else 0.0}
+        if n:
+            early = sum(v for y, v in self.years.items() if y <= self.paper_year + 2)
+            temporal = {"early_share": early / n, "median_year": self._median_year()}
+        else:
+            temporal = {"early_share": 0.0, "median_year": self.paper_year}
+        return compose_diffusion_result(self.paper, n, breadth, geo, lang, depth, temporal, np.zeros((0, 2)), [])
+
+    def _median_year(self) -> int:
+        years = sorted(self.years)
+        cum = np.cumsum([self.years[y] for y in years])
+        n = int(cum[-1])
+        lo = years[int(np.searchsorted(cum, (n - 1) // 2 + 1))]
+        hi = years[int(np.searchsorted(cum, n // 2 + 1))]
+        return int((lo + hi) / 2)  # np.median of the expanded list, truncated like the full computation
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "paper": self.paper, "n_citations": self.n_citations,
+            "disciplines": self.disciplines, "countries": self.countries, "languages": self.languages,
+            "years": {str(y): v for y, v in self.years.items()},
+            "depth_sum": self.depth_sum, "depth_hist": {str(b): v for b, v in self.depth_hist.items()},
+            "n_seen": len(self.seen),
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any], seen: Optional[np.ndarray] = None) -> "DiffusionState":
+        """`seen`: the counted keys (any order); states written with an inline key list carry their own."""
+        state = cls(d["paper"])
+        state.n_citations = d["n_citations"]
+        state.disciplines, state.countries, state.languages = (Counter(d[k]) for k in ("disciplines", "countries", "languages"))
+        state.years = Counter({int(y): v for y, v in d["years"].items()})
+        state.depth_sum = d["depth_sum"]
+        state.depth_hist = Counter({int(b): v for b, v in d["depth_hist"].items()})
+        if "seen" in d:  # older states listed the keys inline; they move to the sidecar on the next save
+            seen = np.array([_key_int(k) for k in d["seen"]], dtype=np.uint64)
+            state.unsaved = seen.tolist()
+        state.seen = np.sort(np.asarray(seen if seen is not None else [], dtype=np.uint64))
+        return state
+
+class DiffusionStateStore:
+    """
+    Per paper, keyed by doi / id / title: <key>.json (the constant-size state, replaced atomically) and
+    <key>.seen (the counted citation keys, raw little-endian uint64, append-only). The JSON records
+    how many keys it covers, so keys appended by a save that died before its JSON are ignored and
+    overwritten by the next one.
+    """
+    def __init__(self, root: str = "data/diffusion_state"):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, paper: Dict[str, Any]) -> Path:
+        ident = paper.get("doi") or paper.get("id") or paper.get("title") or ""
+        return self.root / (hashlib.sha1(str(ident).encode("utf-8")).hexdigest()[:16] + ".json")
+
+    def load(self, paper: Dict[str, Any]) -> Optional[DiffusionState]:
+        path = self._path(paper)
+        if not path.exists():
+            return None
+        d = json.loads(path.read_text())
+        seen = None
+        if "n_seen" in d:
+            seen = np.fromfile(path.with_suffix(".seen"), dtype="<u8", count=d["n_seen"]) if d["n_seen"] else None
+        return DiffusionState.from_dict(d, seen)
+
+    def save(self, state: DiffusionState):
+        path = self._path(state.paper)
+        committed = len(state.seen) - len(state.unsaved)
+        with open(path.with_suffix(".seen"), "ab") as f:
+            f.truncate(committed * 8)
+            f.write(np.asarray(state.unsaved, dtype="<u8").tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(state.to_dict()))
+        os.replace(tmp, path)
+        state.unsaved = []
+
+    def update(self, paper: Dict[str, Any], new_citations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add a day's citations for one paper and return its refreshed diffusion result."""
+        state = self.load(paper) or DiffusionState(paper)
+        if state.update(new_citations):
+            self.save(state)
+        return state.result()
+
+    def update_many(self, feed: Dict[str, List[Dict[str, Any]]], papers: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """feed: paper key -> new citations, papers: paper key -> paper. Citation texts are embedded in one batch."""
+        encode([citation_text(c) for cites in feed.values() for c in cites]
+               + [citation_text(papers[k]) for k in feed])  # warm the vector cache for the per-paper updates
+        return {k: self.update(papers[k], cites) for k, cites in feed.items()}
@@ -1,5 +1,6 @@
 from services.llm_helpers import call_llm
-from sentence_transformers import SentenceTransformer, util
+from academic_common.embedding_service import encode, encode_one
+from sentence_transformers import util
 import requests
 
 
@@ -24,17 +25,16 @@ def detect_policy_patent_impact_mock():
         "llm_explanation": "The paper has been referenced in a patent filed by XYZ Corp and a U.S. Department of Energy strategic document. This indicates its influence in both commercial innovation and government policy."
     }
 
-model = SentenceTransformer("all-MiniLM-L6-v2")
-
 def embed(text):
-    return model.encode(text, convert_to_tensor=True)
+    return encode_one(text)
 
 def match_sources(paper_text, candidate_sources, threshold=0.75):
     paper_vec = embed(paper_text)
+    source_vecs = encode([source["text"] for source in candidate_sources])
     matches = []
 
-    for source in candidate_sources:
-        score = util.cos_sim(paper_vec, embed(source["text"])).item()
+    for source, source_vec in zip(candidate_sources, source_vecs):
+        score = util.cos_sim(paper_vec, source_vec).item()
         if score > threshold:
             source["score"] = score
             matches.append(source)